@@ -13,7 +13,15 @@ import numpy as np
 st.set_page_config(page_title="Dashboard Home", layout="wide")
 require_login()
 
-from shared import get_file
+from shared import get_file, file_version
+import deadlines
+
+
+@st.cache_data
+def load_task_deadlines(_dfp, data_version):
+    """Tasks sorted by PLAN END, partitioned into 'open' (< 100% complete) and 'done', once per data version"""
+    done = _dfp['% COMPLETE'] >= 100
+    return deadlines.build_index(_dfp['PLAN END'], np.where(done, 'done', 'open'))
 
 project_file = get_file(
     "quicksxope/dashboardapp-proto/contents/data/Data_project_monitoring.xlsx",
@@ -201,10 +209,8 @@ if project_file:
         ].shape[0]
 
         # Task overdue: sudah lewat PLAN END + belum selesai 100%
-        overdue = dfp[
-            (dfp['PLAN END'] < today) &
-            (dfp['% COMPLETE'] < 100)
-        ].shape[0]
+        task_deadlines = load_task_deadlines(dfp, file_version(project_file))
+        overdue = len(deadlines.overdue(task_deadlines, today, 'open'))
 
         completed_tasks = dfp[dfp['STATUS'] == 'SELESAI'].shape[0]
         overdue_rate = (overdue / total_tasks) * 100 if total_tasks else 0
@@ -0,0 +1,127 @@
+// Sub-area bubble chart: draws bubbles at the positions packed server-side
+// (see bubble_chart.py). No layout runs here; clicks on a bubble or on a
+// legend row focus the bubble and show its details. Wheel zooms (1x-4x),
+// dragging pans.
+//
+// payload is column-oriented (one array per field, see
+// bubble_chart.chart_payload()); colors maps a status to its color.
+function drawBubbleChart(payload) {
+    const SVG_NS = "http://www.w3.org/2000/svg";
+    const svg = document.querySelector("svg");
+    const defs = svg.appendChild(document.createElementNS(SVG_NS, "defs"));
+    const zoomLayer = svg.appendChild(document.createElementNS(SVG_NS, "g"));
+    const panel = document.getElementById("info-panel");
+    const FOCUS_MS = 300;
+
+    const data = payload.abbrev.map((abbrev, i) => ({
+        Abbrev: abbrev,
+        SubArea: payload.name[i],
+        Progress: payload.progress[i],
+        Status: payload.status[i],
+        Color: payload.colors[payload.status[i]],
+        X: payload.x[i],
+        Y: payload.y[i],
+        R: payload.r[i],
+    }));
+
+    function element(parent, tag, attrs) {
+        const el = parent.appendChild(document.createElementNS(SVG_NS, tag));
+        Object.entries(attrs).forEach(([name, value]) => el.setAttribute(name, value));
+        return el;
+    }
+
+    const nodes = data.map((d, i) => {
+        const grad = element(defs, "radialGradient", {id: "grad" + i, cx: "50%", cy: "50%", r: "50%"});
+        element(grad, "stop", {offset: "0%", "stop-color": d.Color, "stop-opacity": 0.3});
+        element(grad, "stop", {offset: "100%", "stop-color": d.Color, "stop-opacity": 1});
+
+        const g = element(zoomLayer, "g", {transform: "translate(" + d.X + "," + d.Y + ")"});
+        g.style.cursor = "pointer";
+        const circle = element(g, "circle", {r: d.R, fill: "url(#grad" + i + ")", stroke: "#fff", "stroke-width": 1.5});
+        circle.style.transition = "r " + FOCUS_MS + "ms, opacity " + FOCUS_MS + "ms";
+        [[d.Abbrev, "-0.3em", Math.max(8, d.R / 2.5)], [d.Progress.toFixed(1) + "%", "1em", Math.max(6, d.R / 3.5)]]
+            .forEach(([text, dy, size]) => {
+                const label = element(g, "text", {"text-anchor": "middle", dy: dy, "font-size": size + "px", fill: "#111"});
+                label.style.pointerEvents = "none";
+                label.textContent = text;
+            });
+        g.addEventListener("click", () => (selected === i ? hideInfo() : select(i)));
+        return circle;
+    });
+
+    let selected = null;
+
+    function select(i) {
+        if (selected !== null) nodes[selected].setAttribute("r", data[selected].R);
+        selected = i;
+        nodes[i].setAttribute("r", data[i].R * 1.2);
+        nodes.forEach((circle, j) => (circle.style.opacity = j === i ? 1.0 : 0.1));
+
+        const d = data[i];
+        document.getElementById("info-title").textContent = d.SubArea;
+        document.getElementById("info-body").innerHTML =
+            "<strong>Progress:</strong> " + d.Progress.toFixed(1) + "%<br/><strong>Status:</strong> " + d.Status;
+        panel.style.display = "block";
+    }
+
+    function hideInfo() {
+        panel.style.display = "none";
+        if (selected !== null) nodes[selected].setAttribute("r", data[selected].R);
+        selected = null;
+        nodes.forEach(circle => (circle.style.opacity = 1.0));
+    }
+    window.hideInfo = hideInfo;  // Close button of the info panel
+
+    // Legend rows, sorted by abbreviation
+    const legend = document.getElementById("legend");
+    data.map((d, i) => i)
+        .sort((i, j) => (data[i].Abbrev < data[j].Abbrev ? -1 : data[i].Abbrev > data[j].Abbrev ? 1 : 0))
+        .forEach(i => {
+            const row = legend.appendChild(document.createElement("tr"));
+            row.style.cursor = "pointer";
+            row.addEventListener("click", () => select(i));
+            row.addEventListener("mouseover", () => (row.style.background = "#f0f0f0"));
+            row.addEventListener("mouseout", () => (row.style.background = "none"));
+            [data[i].Abbrev, data[i].SubArea].forEach(text => {
+                const cell = row.appendChild(document.createElement("td"));
+                cell.style.padding = "6px 12px";
+                cell.style.borderBottom = "1px solid #eee";
+                cell.textContent = text;
+            });
+        });
+
+    // Zoom and pan of the bubble layer, in viewBox units
+    let view = {k: 1, x: 0, y: 0};
+    let drag = null;
+
+    function toViewBox(event) {
+        const point = svg.createSVGPoint();
+        point.x = event.clientX;
+        point.y = event.clientY;
+        return point.matrixTransform(svg.getScreenCTM().inverse());
+    }
+
+    function applyView() {
+        zoomLayer.setAttribute("transform", "translate(" + view.x + "," + view.y + ") scale(" + view.k + ")");
+    }
+
+    svg.addEventListener("wheel", event => {
+        event.preventDefault();
+        const p = toViewBox(event);
+        const k = Math.min(4, Math.max(1, view.k * Math.pow(2, -event.deltaY / 500)));
+        view = {k: k, x: p.x - (p.x - view.x) * k / view.k, y: p.y - (p.y - view.y) * k / view.k};
+        applyView();
+    }, {passive: false});
+    svg.addEventListener("mousedown", event => {
+        const p = toViewBox(event);
+        drag = {x: p.x - view.x, y: p.y - view.y};
+    });
+    window.addEventListener("mousemove", event => {
+        if (!drag) return;
+        const p = toViewBox(event);
+        view.x = p.x - drag.x;
+        view.y = p.y - drag.y;
+        applyView();
+    });
+    window.addEventListener("mouseup", () => (drag = null));
+}
@@ -0,0 +1,465 @@
+"""
+Benchmarks for the dashboard's chart builders and computation engines.
+
+Run from the dashboard_modular directory:
+
+    python benchmarks.py                  # all benchmarks
+    python benchmarks.py dependency_arrows
+    python benchmarks.py webgl
+    python benchmarks.py scurve
+    python benchmarks.py history
+    python benchmarks.py evm
+    python benchmarks.py risk
+    python benchmarks.py timeline
+    python benchmarks.py search
+    python benchmarks.py deadlines
+    python benchmarks.py zone_map
+    python benchmarks.py bubbles
+
+Every benchmark uses a synthetic schedule so no workbook is needed.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+import gantt
+import scurve
+import progress_history
+import evm
+import risk
+import search_index
+import deadlines
+import map_zones
+import bubble_chart
+
+STATUSES = ['SELESAI', 'DALAM PROSES', 'TUNDA', 'BELUM MULAI', 'TERLAMBAT']
+COLOR_MAP = {
+    'SELESAI': 'green',
+    'DALAM PROSES': 'blue',
+    'TUNDA': 'orange',
+    'BELUM MULAI': 'yellow',
+    'TERLAMBAT': 'red'
+}
+
+
+def synthetic_schedule(n_tasks, n_projects=4, seed=42):
+    """Timeline dataframe shaped like the one prepared by the monitoring page."""
+    rng = np.random.default_rng(seed)
+    project = rng.integers(0, n_projects, n_tasks)
+    start = pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 700, n_tasks), unit='D')
+    duration = pd.to_timedelta(rng.integers(0, 120, n_tasks), unit='D')
+
+    df = pd.DataFrame({
+        'KONTRAK_CODE': [f"PROJECT {p}" for p in project],
+        'KONTRAK_DISPLAY': [f"PROJECT {p}" for p in project],
+        'JENIS PEKERJAAN': [f"PEKERJAAN {i % 97}" for i in range(n_tasks)],
+        'AREA PEKERJAAN': [f"AREA {i % 13}" for i in range(n_tasks)],
+        'SUB AREA PEKERJAAN': [f"SUB AREA {i % 61}" for i in range(n_tasks)],
+        'START': start,
+        'PLAN END': start + duration,
+        'STATUS': rng.choice(STATUSES, n_tasks),
+        '% COMPLETE': rng.uniform(0, 100, n_tasks).round(1),
+        'BOBOT': rng.uniform(0, 3, n_tasks),
+        'TASK_ID': [f"task_{i}" for i in range(n_tasks)],
+        'TASK_LEVEL': 1,
+    })
+    df['IS_MILESTONE'] = (df['PLAN END'] - df['START']).dt.days <= 1
+
+    # Sequential dependencies per project, as load_data() generates them
+    df = df.sort_values(['KONTRAK_CODE', 'START']).reset_index(drop=True)
+    df['PREDECESSORS'] = df.groupby('KONTRAK_CODE')['TASK_ID'].shift(1).fillna("")
+
+    df['Task'] = df['KONTRAK_DISPLAY'] + " - " + df['JENIS PEKERJAAN'] + " #" + df.index.astype(str)
+    df['Tooltip'] = "<b>" + df['JENIS PEKERJAAN'] + "</b>"
+    return df
+
+
+def timed(fn, repeat=3):
+    """Best wall-clock time of fn() over `repeat` runs, and its last result."""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def report(name, seconds, fig=None):
+    size = f"{len(fig.to_json()) / 1024:>10.1f} KB" if fig is not None else ""
+    print(f"  {name:<32} {seconds * 1000:>10.1f} ms {size}")
+
+
+# ---------------------------------------------------------------------------
+# Dependency arrows: one shape + annotation per link vs two traces
+# ---------------------------------------------------------------------------
+def _legacy_dependency_figure(timeline_df):
+    # Same layout objects the per-link add_shape/add_annotation loop produced.
+    # They are assigned in one update_layout call: calling add_shape once per
+    # link is quadratic and does not finish at 10k links, so this is a lower
+    # bound on the old build time.
+    links = gantt.dependency_links(timeline_df)
+    shapes = []
+    annotations = []
+    for row in links.itertuples(index=False):
+        shapes.append(dict(
+            type="line",
+            x0=row.PRED_END, y0=row.PRED_TASK, x1=row.START, y1=row.Task,
+            line=dict(color=gantt.DEPENDENCY_COLOR, width=1.5, dash="dot"),
+            layer="below"
+        ))
+        annotations.append(dict(
+            x=row.START, y=row.Task, xanchor="right",
+            showarrow=True, arrowhead=2, arrowsize=1, arrowwidth=1.5,
+            arrowcolor=gantt.DEPENDENCY_COLOR, ax=-10, ay=0, text="",
+            hovertext=f"Depends on: {row.PRED_NAME}",
+        ))
+    fig = go.Figure()
+    fig.update_layout(shapes=shapes, annotations=annotations)
+    return fig
+
+
+def _trace_dependency_figure(timeline_df):
+    fig = go.Figure()
+    gantt.add_dependency_traces(fig, timeline_df)
+    return fig
+
+
+def bench_dependency_arrows(sizes=(1000, 10000)):
+    print("dependency_arrows")
+    for n_links in sizes:
+        df = synthetic_schedule(n_links + 1, n_projects=1)
+        print(f" {n_links} links")
+        seconds, fig = timed(lambda: _trace_dependency_figure(df))
+        report("traces (None-separated)", seconds, fig)
+        seconds, fig = timed(lambda: _legacy_dependency_figure(df), repeat=1)
+        report("shapes + annotations", seconds, fig)
+
+
+# ---------------------------------------------------------------------------
+# Gantt rendering: SVG bars vs WebGL segments
+# ---------------------------------------------------------------------------
+def bench_webgl(sizes=(1000, 5000, 10000)):
+    print("webgl")
+    for n_tasks in sizes:
+        df = synthetic_schedule(n_tasks)
+        print(f" {n_tasks} tasks")
+        for label, webgl in (("svg (px.timeline)", False), ("webgl (Scattergl)", True)):
+            seconds, fig = timed(lambda: gantt.build_gantt_figure(df, COLOR_MAP, webgl=webgl), repeat=1)
+            report(label, seconds, fig)
+
+
+# ---------------------------------------------------------------------------
+# S-curve: periods x iterrows double loop vs vectorized engine
+# ---------------------------------------------------------------------------
+def _legacy_scurve(timeline_df, today_date):
+    # The loop the S-Curve tab used before scurve.compute_scurve()
+    timeline_df = timeline_df.copy()
+    if timeline_df['% COMPLETE'].max() > 1.5:
+        timeline_df['% COMPLETE'] = timeline_df['% COMPLETE'] / 100
+
+    min_date = timeline_df['START'].min().date()
+    max_date = timeline_df['PLAN END'].max().date()
+    time_periods = []
+    current = min_date
+    while current <= max_date:
+        time_periods.append(current)
+        current += timedelta(days=7)
+
+    progress_data = []
+    for period in time_periods:
+        planned_progress = 0
+        actual_progress = 0
+        total_weight = 0
+
+        for _, row in timeline_df.iterrows():
+            if row['START'].date() > period:
+                continue
+            weight = row.get('BOBOT', 0)
+            if pd.isna(weight) or weight <= 0:
+                continue
+            total_weight += weight
+
+            if period >= row['PLAN END'].date():
+                task_planned = 1.0
+            elif period < row['START'].date():
+                task_planned = 0.0
+            else:
+                total_days = (row['PLAN END'] - row['START']).days
+                days_passed = (period - row['START'].date()).days
+                task_planned = days_passed / total_days if total_days > 0 else 1.0
+
+            if period >= today_date:
+                task_actual = row['% COMPLETE']
+            elif period < row['START'].date():
+                task_actual = 0.0
+            else:
+                total_days = (today_date - row['START'].date()).days
+                days_passed = (period - row['START'].date()).days
+                task_actual = min(
+                    row['% COMPLETE'],
+                    (days_passed / total_days) * row['% COMPLETE'] if total_days > 0 else 0
+                )
+
+            planned_progress += task_planned * weight
+            actual_progress += task_actual * weight
+
+        if total_weight > 0:
+            planned_progress = (planned_progress / total_weight) * 100
+            actual_progress = (actual_progress / total_weight) * 100
+        else:
+            planned_progress = 0
+            actual_progress = 0
+
+        progress_data.append({'Date': period, 'Type': 'Planned', 'Progress': planned_progress})
+        progress_data.append({'Date': period, 'Type': 'Actual', 'Progress': actual_progress})
+
+    progress_df = pd.DataFrame(progress_data)
+    progress_df['Date'] = pd.to_datetime(progress_df['Date'])
+    progress_df = progress_df.sort_values(by=["Type", "Date"])
+    for t in ['Planned', 'Actual']:
+        mask = progress_df['Type'] == t
+        progress_df.loc[mask, 'Progress'] = progress_df.loc[mask, 'Progress'].cummax()
+    return progress_df
+
+
+def bench_scurve(sizes=(500, 2000, 10000), legacy_max=2000):
+    print("scurve")
+    today_date = date(2025, 1, 1)
+    for n_tasks in sizes:
+        df = synthetic_schedule(n_tasks)
+        print(f" {n_tasks} tasks")
+        seconds, fast = timed(lambda: scurve.compute_scurve(df, today_date))
+        report("vectorized", seconds)
+        seconds, daily = timed(lambda: scurve.daily_curve(df, today_date))
+        report("vectorized daily", seconds)
+        seconds, _ = timed(lambda: scurve.resample_curve(daily, 'Monthly'))
+        report("resample daily -> monthly", seconds)
+        seconds, grouped = timed(lambda: scurve.grouped_daily_sums(df, today_date))
+        report(f"grouped daily ({grouped['weight'].shape[1]} groups)", seconds)
+        seconds, _ = timed(lambda: scurve.group_curve(grouped, 'KONTRAK_CODE', 'PROJECT 1'))
+        report("slice one project", seconds)
+        if n_tasks > legacy_max:
+            continue
+        seconds, slow = timed(lambda: _legacy_scurve(df, today_date), repeat=1)
+        report("periods x iterrows", seconds)
+        same = (
+            fast['Date'].tolist() == slow['Date'].tolist()
+            and fast['Type'].tolist() == slow['Type'].tolist()
+            and np.allclose(fast['Progress'], slow['Progress'])
+        )
+        print(f"  {'same result':<32} {same}")
+
+
+# ---------------------------------------------------------------------------
+# Progress history: snapshot ingest and indexed actual-progress reads
+# ---------------------------------------------------------------------------
+def bench_history(n_tasks=5000, n_snapshots=52):
+    print("history")
+    df = synthetic_schedule(n_tasks)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "history.sqlite")
+        t0 = time.perf_counter()
+        for week in range(n_snapshots):
+            as_of = date(2024, 1, 1) + timedelta(days=7 * week)
+            progress_history.record_snapshot(df, f"v{week}", as_of, path)
+        report(f"ingest {n_snapshots} x {n_tasks} tasks", time.perf_counter() - t0)
+        seconds, _ = timed(lambda: progress_history.actual_history(path=path))
+        report("actual history (all projects)", seconds)
+        seconds, _ = timed(lambda: progress_history.actual_history('PROJECT 1', path=path))
+        report("actual history (one project)", seconds)
+
+
+# ---------------------------------------------------------------------------
+# Earned value: (period x project) metrics from the grouped S-curve sums
+# ---------------------------------------------------------------------------
+def bench_evm(n_tasks=10000, n_payments=500):
+    print("evm")
+    df = synthetic_schedule(n_tasks)
+    today_date = date(2025, 1, 1)
+    grouped = scurve.grouped_daily_sums(df, today_date)
+    codes = sorted(df['KONTRAK_CODE'].unique())
+    rng = np.random.default_rng(0)
+    budgets = pd.DataFrame({'BAC': rng.uniform(1e9, 1e11, len(codes)), 'REALIZED': 0.0}, index=pd.Index(codes, name='KONTRAK_CODE'))
+    payments = pd.DataFrame({
+        'KONTRAK_CODE': rng.choice(codes, n_payments),
+        'DATE': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 700, n_payments), unit='D'),
+        'AMOUNT': rng.uniform(1e7, 1e9, n_payments),
+    })
+    for granularity in scurve.GRANULARITIES:
+        seconds, result = timed(lambda: evm.earned_value(grouped, budgets, payments, granularity, today_date))
+        report(f"{granularity.lower()} ({len(result)} rows)", seconds)
+
+
+# ---------------------------------------------------------------------------
+# Schedule risk: Monte Carlo over the dependency network
+# ---------------------------------------------------------------------------
+def bench_risk(n_tasks=10000, iterations=5000):
+    print("risk")
+    df = synthetic_schedule(n_tasks)
+    today_date = date(2025, 1, 1)
+    seconds, network = timed(lambda: risk.task_network(df, today_date), repeat=1)
+    report(f"network ({len(network['levels'])} levels)", seconds)
+    seconds, first = timed(lambda: risk.simulate(network, iterations), repeat=1)
+    report(f"{iterations} iterations", seconds)
+    _, second = timed(lambda: risk.simulate(network, iterations), repeat=1)
+    print(f"  {'same result':<32} {np.array_equal(first, second)}")
+
+
+# ---------------------------------------------------------------------------
+# Timeline labels: per-row apply vs vectorized string building
+# ---------------------------------------------------------------------------
+def _legacy_tooltip(row):
+    # The per-row builder the timeline used before gantt.task_tooltips()
+    tooltip = (
+        f"<b>{row['JENIS PEKERJAAN']}</b>"
+        f"<br>Project: {row['KONTRAK_DISPLAY']}"
+        f"<br>Status: {row['STATUS']}"
+        f"<br>Area: {row['AREA PEKERJAAN']}"
+        f"<br>Sub Area: {row['SUB AREA PEKERJAAN']}"
+        f"<br>Progress: {row['% COMPLETE']:.1f}%"
+        f"<br>Duration: {row['START'].date()} → {row['PLAN END'].date()}"
+    )
+    if row['IS_MILESTONE']:
+        tooltip += "<br><b>MILESTONE</b>"
+    return tooltip
+
+
+def bench_timeline(sizes=(1000, 10000)):
+    print("timeline")
+    for n_tasks in sizes:
+        df = synthetic_schedule(n_tasks)
+        print(f" {n_tasks} tasks")
+        seconds, slow = timed(lambda: df.apply(_legacy_tooltip, axis=1), repeat=1)
+        report("tooltips: apply per row", seconds)
+        seconds, fast = timed(lambda: gantt.task_tooltips(df))
+        report("tooltips: vectorized", seconds)
+        seconds, _ = timed(lambda: gantt.task_labels(df))
+        report("task labels: vectorized", seconds)
+        print(f"  {'same result':<32} {slow.equals(fast)}")
+
+
+def bench_search(n_tasks=10000, queries=("pek", "pekerjaan 4", "sub area 1", "area 12 pek", "zzz")):
+    print("search")
+    df = synthetic_schedule(n_tasks)
+    print(f" {n_tasks} tasks")
+    seconds, index = timed(lambda: search_index.build_index(df))
+    report("build index", seconds)
+    for query in queries:
+        seconds, slow = timed(lambda: df.index[_legacy_search_mask(df, query)].to_numpy(), repeat=1)
+        report(f"'{query}': str.contains scan", seconds)
+        seconds, fast = timed(lambda: search_index.search_rows(index, query))
+        report(f"'{query}': inverted index", seconds)
+        print(f"  {'matches':<32} {len(fast)}")
+        print(f"  {'same result':<32} {np.array_equal(slow, fast)}")
+
+
+def _legacy_search_mask(df, query):
+    # Per-keystroke scan of every column (word-prefix semantics, like the index)
+    mask = np.ones(len(df), dtype=bool)
+    for word in search_index.tokenize(query):
+        found = np.zeros(len(df), dtype=bool)
+        for col in search_index.SEARCH_COLUMNS:
+            found |= df[col].str.contains(r"\b" + word, case=False, regex=True).to_numpy()
+        mask &= found
+    return mask
+
+
+def bench_deadlines(n_tasks=100000):
+    print("deadlines")
+    df = synthetic_schedule(n_tasks)
+    as_of = pd.Timestamp('2025-06-15')
+    print(f" {n_tasks} tasks")
+    seconds, index = timed(lambda: deadlines.build_index(df['PLAN END'], np.where(df['STATUS'] == 'SELESAI', 'done', 'open')))
+    report("build index", seconds)
+    seconds, slow = timed(lambda: np.flatnonzero(
+        (pd.to_datetime(df['PLAN END'], errors='coerce') < as_of) & (df['STATUS'].str.upper() != 'SELESAI')
+    ))
+    report("overdue: full scan", seconds)
+    seconds, fast = timed(lambda: deadlines.overdue(index, as_of, 'open'))
+    report("overdue: binary search", seconds)
+    print(f"  {'same result':<32} {np.array_equal(slow, np.sort(fast))}")
+    seconds, _ = timed(lambda: deadlines.due_within(index, as_of, 7, 'open'))
+    report("due in 7 days: binary search", seconds)
+    seconds, _ = timed(lambda: deadlines.due_in_month(index, as_of, 'open'))
+    report("due this month: binary search", seconds)
+
+
+def bench_zone_map(sizes=(6, 100, 500)):
+    print("zone_map")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_zones in sizes:
+            # Grid of rectangular blocks, progress keyed by an alias plus extra words
+            path = os.path.join(tmp, f"layout_{n_zones}.json")
+            features = [{
+                'id': f"block-{i}",
+                'geometry': {'type': 'Rect', 'x': (i % 25) * 40, 'y': (i // 25) * 30, 'width': 38, 'height': 28},
+                'properties': {'name': f"BLOCK-{i}", 'aliases': [f"BLOK {i}"]},
+            } for i in range(n_zones)]
+            with open(path, 'w') as f:
+                json.dump({'viewBox': [0, 0, 1000, 30 * (n_zones // 25 + 1)], 'features': features}, f)
+            progress = {f"blok {i} timur": float(i % 100) for i in range(n_zones)}
+
+            print(f" {n_zones} zones")
+            seconds, _ = timed(lambda: map_zones.generate_colored_map(progress, path), repeat=1)
+            report("first render (parse + compile)", seconds)
+            seconds, _ = timed(lambda: map_zones.generate_colored_map(progress, path))
+            report("repeat render", seconds)
+
+
+def bench_bubbles(sizes=(70, 300, 1000)):
+    print("bubbles")
+    rng = np.random.default_rng(0)
+    for n_areas in sizes:
+        sub_areas = pd.DataFrame({
+            'Sub Area': [f"SUB AREA {i}" for i in range(n_areas)],
+            'Progress': rng.uniform(0, 100, n_areas),
+        })
+        print(f" {n_areas} sub-areas")
+        seconds, layout = timed(lambda: bubble_chart.bubble_layout(sub_areas), repeat=1)
+        report("packed layout", seconds)
+
+        x, y, r = layout['X'].to_numpy(), layout['Y'].to_numpy(), layout['R'].to_numpy()
+        gaps = np.hypot(x[:, None] - x, y[:, None] - y) - (r[:, None] + r)
+        np.fill_diagonal(gaps, np.inf)
+        inside = ((x - r >= 0) & (x + r <= bubble_chart.VIEW_WIDTH)
+                  & (y - r >= 0) & (y + r <= bubble_chart.VIEW_HEIGHT)).all()
+        print(f"  no overlaps: {bool(gaps.min() >= 0)}, inside view: {bool(inside)}, "
+              f"same result: {layout.equals(bubble_chart.bubble_layout(sub_areas))}")
+
+        colors = {'Low': '#ef4444', 'Medium': '#facc15', 'High': '#10b981'}
+        bubble_chart._render_chart.cache_clear()
+        seconds, page = timed(lambda: bubble_chart.chart_html(layout, colors), repeat=1)
+        report("component HTML (first)", seconds)
+        seconds, _ = timed(lambda: bubble_chart.chart_html(layout, colors))
+        report("component HTML (unchanged rerun)", seconds)
+        print(f"  component size: {len(page) / 1024:.1f} KB")
+
+
+BENCHMARKS = {
+    'dependency_arrows': bench_dependency_arrows,
+    'webgl': bench_webgl,
+    'scurve': bench_scurve,
+    'history': bench_history,
+    'evm': bench_evm,
+    'risk': bench_risk,
+    'timeline': bench_timeline,
+    'search': bench_search,
+    'deadlines': bench_deadlines,
+    'zone_map': bench_zone_map,
+    'bubbles': bench_bubbles,
+}
+
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        BENCHMARKS[name]()
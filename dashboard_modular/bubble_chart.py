@@ -0,0 +1,276 @@
+"""
+This module lays out the sub-area bubble chart server-side.
+
+Bubbles are packed with the front-chain circle packing algorithm (the one
+behind d3.packSiblings): largest bubble first, each next bubble placed
+tangent to the pair of front-chain bubbles closest to the centre. There is
+no random start and no force simulation, so the same sub-areas always get
+the same picture, and the layout is computed once per data version.
+
+The browser only draws the precomputed positions with the script bundled
+in assets/bubble_chart.js; nothing is fetched from a CDN. The component
+is the assets/bubble_chart.html template filled with that script and a
+compact JSON payload, and is rendered once per distinct payload, so an
+unchanged rerun hands the exact same HTML to the browser.
+"""
+
+import json
+import os
+import re
+from functools import lru_cache
+from string import Template
+
+import numpy as np
+
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets')
+BUBBLE_CHART_SCRIPT_PATH = os.path.join(ASSETS_DIR, 'bubble_chart.js')
+BUBBLE_CHART_TEMPLATE_PATH = os.path.join(ASSETS_DIR, 'bubble_chart.html')
+CHART_RENDER_CACHE_SIZE = 64
+
+# Drawing area of the chart (SVG viewBox units)
+VIEW_WIDTH = 1800
+VIEW_HEIGHT = 1200
+MAX_RADIUS_SHARE = 0.15  # Largest bubble radius, as a share of the shorter side
+BUBBLE_GAP = 12          # Space kept around every bubble
+MIN_BUBBLE_SIZE = 24     # Size of a bubble with (almost) no progress
+
+# Status of a sub-area: (label, minimum progress), best first
+STATUS_THRESHOLDS = [('High', 50), ('Medium', 30)]
+DEFAULT_STATUS = 'Low'
+
+
+def progress_status(progress):
+    """'High' / 'Medium' / 'Low' for every progress value (0-100)."""
+    progress = np.asarray(progress, dtype=float)
+    labels, minimums = zip(*STATUS_THRESHOLDS)
+    return np.select([progress >= m for m in minimums], labels, default=DEFAULT_STATUS)
+
+
+def abbreviations(names):
+    """
+    Short labels for the bubbles.
+
+    Letters only; the initials of the first three words, or the first
+    three letters of a single word. Repeated labels get a counter
+    (e.g. 'PA', 'PA2').
+    """
+    counts = {}
+    labels = []
+    for name in names:
+        cleaned = re.sub(r'[^A-Za-z\s]', '', str(name).upper())
+        words = cleaned.split()
+        base = ''.join(w[0] for w in words[:3]) if len(words) >= 2 else cleaned[:3]
+        counts[base] = counts.get(base, 0) + 1
+        labels.append(base if counts[base] == 1 else f"{base}{counts[base]}")
+    return labels
+
+
+def pack_circles(radii):
+    """
+    Front-chain packing of circles with the given radii, in order.
+
+    Args:
+        radii: Sequence of radii (largest first gives the tightest layout)
+
+    Returns:
+        (x, y) arrays of circle centres, around the origin
+    """
+    r = [float(value) for value in radii]
+    n = len(r)
+    x = [0.0] * n
+    y = [0.0] * n
+    if n < 2:
+        return np.array(x), np.array(y)
+
+    x[0], x[1] = -r[1], r[0]
+    if n == 2:
+        return np.array(x), np.array(y)
+
+    def place(b, a, c):
+        # Centre of c tangent to a and b, on the left of a -> b
+        dx, dy = x[b] - x[a], y[b] - y[a]
+        d2 = dx * dx + dy * dy
+        if not d2:
+            x[c], y[c] = x[a] + r[c], y[a]
+            return
+        a2 = (r[a] + r[c]) ** 2
+        b2 = (r[b] + r[c]) ** 2
+        if a2 > b2:
+            t = (d2 + b2 - a2) / (2 * d2)
+            h = np.sqrt(max(0.0, b2 / d2 - t * t))
+            x[c], y[c] = x[b] - t * dx - h * dy, y[b] - t * dy + h * dx
+        else:
+            t = (d2 + a2 - b2) / (2 * d2)
+            h = np.sqrt(max(0.0, a2 / d2 - t * t))
+            x[c], y[c] = x[a] + t * dx - h * dy, y[a] + t * dy + h * dx
+
+    def intersects(i, j):
+        gap = r[i] + r[j] - 1e-6
+        return gap > 0 and gap * gap > (x[j] - x[i]) ** 2 + (y[j] - y[i]) ** 2
+
+    def score(i):
+        # Distance to the origin of the tangent point of i and its successor
+        j = nxt[i]
+        ab = r[i] + r[j]
+        px = (x[i] * r[j] + x[j] * r[i]) / ab
+        py = (y[i] * r[j] + y[j] * r[i]) / ab
+        return px * px + py * py
+
+    place(1, 0, 2)
+
+    # Front chain as a circular doubly linked list: 0 -> 1 -> 2 -> 0
+    nxt = [0] * n
+    prv = [0] * n
+    nxt[0], nxt[1], nxt[2] = 1, 2, 0
+    prv[0], prv[1], prv[2] = 2, 0, 1
+    a, b = 0, 1
+
+    i = 3
+    while i < n:
+        place(a, b, i)
+
+        # Closest front-chain circle overlapping the candidate, if any
+        j, k = nxt[b], prv[a]
+        sj, sk = r[b], r[a]
+        overlap = False
+        while True:
+            if sj <= sk:
+                if intersects(j, i):
+                    b = j
+                    nxt[a], prv[b] = b, a
+                    overlap = True
+                    break
+                sj += r[j]
+                j = nxt[j]
+            else:
+                if intersects(k, i):
+                    a = k
+                    nxt[a], prv[b] = b, a
+                    overlap = True
+                    break
+                sk += r[k]
+                k = prv[k]
+            if j == nxt[k]:
+                break
+        if overlap:
+            continue  # Retry the same circle against the shortened chain
+
+        # Insert between a and b, then restart from the pair closest to the centre
+        prv[i], nxt[i] = a, b
+        nxt[a] = prv[b] = i
+        b = i
+        best, best_score = a, score(a)
+        c = nxt[i]
+        while c != b:
+            c_score = score(c)
+            if c_score < best_score:
+                best, best_score = c, c_score
+            c = nxt[c]
+        a, b = best, nxt[best]
+        i += 1
+
+    return np.array(x), np.array(y)
+
+
+def bubble_layout(sub_areas, width=VIEW_WIDTH, height=VIEW_HEIGHT):
+    """
+    Packed bubble of every sub-area, in chart coordinates.
+
+    Bubble size follows progress (2 x progress, at least MIN_BUBBLE_SIZE);
+    the largest bubble gets MAX_RADIUS_SHARE of the shorter side and the
+    packing is shrunk if needed to fit the drawing area, then centred.
+
+    Args:
+        sub_areas: DataFrame with 'Sub Area' and 'Progress' (0-100) columns
+        width: Drawing area width
+        height: Drawing area height
+
+    Returns:
+        DataFrame sorted by progress (highest first) with 'Sub Area',
+        'Progress', 'Status', 'Abbrev', 'Size' and the bubble centre
+        ('X', 'Y') and radius ('R')
+    """
+    layout = sub_areas[['Sub Area', 'Progress']].dropna(subset=['Progress'])
+    layout = layout.sort_values('Progress', ascending=False, kind='stable').reset_index(drop=True)
+    layout['Status'] = progress_status(layout['Progress'])
+    layout['Abbrev'] = abbreviations(layout['Sub Area'])
+    layout['Size'] = np.maximum(layout['Progress'].to_numpy(dtype=float) * 2, MIN_BUBBLE_SIZE)
+    if layout.empty:
+        return layout.assign(X=[], Y=[], R=[])
+
+    radius = layout['Size'].to_numpy() * (min(width, height) * MAX_RADIUS_SHARE / layout['Size'].max())
+    x, y = pack_circles(radius + BUBBLE_GAP)
+
+    # Fit the packing (with its gaps) into the drawing area
+    outer = radius + BUBBLE_GAP
+    left, right = (x - outer).min(), (x + outer).max()
+    top, bottom = (y - outer).min(), (y + outer).max()
+    scale = min(1.0, width / (right - left), height / (bottom - top))
+
+    layout['X'] = (x - (left + right) / 2) * scale + width / 2
+    layout['Y'] = (y - (top + bottom) / 2) * scale + height / 2
+    layout['R'] = radius * scale
+    return layout
+
+
+@lru_cache(maxsize=1)
+def bundled_script(path=BUBBLE_CHART_SCRIPT_PATH):
+    """Text of the bundled bubble chart script (read once per process)."""
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+@lru_cache(maxsize=1)
+def _template(path=BUBBLE_CHART_TEMPLATE_PATH):
+    with open(path, encoding='utf-8') as f:
+        return Template(f.read())
+
+
+def chart_payload(layout, colors):
+    """
+    Compact JSON payload of the bubble chart.
+
+    One array per field instead of one object per bubble, with numbers
+    rounded to what the chart shows.
+
+    Args:
+        layout: Result of bubble_layout()
+        colors: Dictionary mapping a status to its color
+
+    Returns:
+        JSON string, safe to embed in a <script> element
+    """
+    return json.dumps({
+        'abbrev': layout['Abbrev'].tolist(),
+        'name': layout['Sub Area'].astype(str).tolist(),
+        'progress': np.round(layout['Progress'].to_numpy(dtype=float), 1).tolist(),
+        'status': layout['Status'].tolist(),
+        'x': np.round(layout['X'].to_numpy(dtype=float), 1).tolist(),
+        'y': np.round(layout['Y'].to_numpy(dtype=float), 1).tolist(),
+        'r': np.round(layout['R'].to_numpy(dtype=float), 1).tolist(),
+        'colors': colors,
+    }, separators=(',', ':')).replace("</", "<\\/")
+
+
+def chart_html(layout, colors, width=VIEW_WIDTH, height=VIEW_HEIGHT):
+    """
+    HTML of the bubble chart component (chart, info panel and legend).
+
+    Memoized per payload: the same bubbles give back the same string
+    without filling the template again.
+
+    Args:
+        layout: Result of bubble_layout() (laid out for width x height)
+        colors: Dictionary mapping a status to its color
+        width: Drawing area width
+        height: Drawing area height
+
+    Returns:
+        HTML string for streamlit.components.v1.html
+    """
+    return _render_chart(chart_payload(layout, colors), width, height)
+
+
+@lru_cache(maxsize=CHART_RENDER_CACHE_SIZE)
+def _render_chart(payload, width, height):
+    return _template().substitute(width=width, height=height, payload=payload, script=bundled_script())
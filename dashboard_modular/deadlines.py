@@ -0,0 +1,79 @@
+"""
+This module keeps a sorted deadline index for due-date queries.
+
+Rows with a due date are sorted by it once, globally and within each
+partition (for example task status or payment status). A question like
+"overdue as of D" or "due in the next N days" is then a binary search for
+the range bounds plus a slice of the matching rows, instead of a scan of
+the whole table with a fresh date conversion.
+
+The index stores row positions, so results are read with df.iloc[rows]
+on the frame the index was built from; rows come ordered by due date.
+"""
+
+import numpy as np
+import pandas as pd
+
+ALL = None  # Partition key of the full index
+
+
+def build_index(due, partition=None):
+    """
+    Deadline index of a table.
+
+    Args:
+        due: Series of due dates (parsed with pd.to_datetime; missing dates
+            are left out of the index)
+        partition: Optional Series of labels aligned with due (e.g. a
+            status); each label gets its own sorted range
+
+    Returns:
+        Dictionary mapping ALL and every partition label to a
+        (sorted due dates, row positions) tuple
+    """
+    due = pd.to_datetime(due, errors='coerce').to_numpy(dtype='datetime64[ns]')
+    rows = np.flatnonzero(~np.isnat(due))
+    rows = rows[np.argsort(due[rows], kind='stable')]
+
+    index = {ALL: (due[rows], rows)}
+    if partition is not None:
+        codes, labels = pd.factorize(np.asarray(partition, dtype=object)[rows])
+        for code, label in enumerate(labels):
+            part = rows[codes == code]  # Still sorted by due date
+            index[label] = (due[part], part)
+    return index
+
+
+def due_between(index, start=None, end=None, partition=ALL):
+    """
+    Row positions due in [start, end), ordered by due date.
+
+    A missing bound is open; an unknown partition has no rows.
+    """
+    if partition not in index:
+        return np.array([], dtype=int)
+    dates, rows = index[partition]
+    lo = 0 if start is None else np.searchsorted(dates, _datetime64(start), side='left')
+    hi = len(dates) if end is None else np.searchsorted(dates, _datetime64(end), side='left')
+    return rows[lo:max(lo, hi)]
+
+
+def overdue(index, as_of, partition=ALL):
+    """Row positions due before as_of, most overdue first."""
+    return due_between(index, end=as_of, partition=partition)
+
+
+def due_within(index, as_of, days, partition=ALL):
+    """Row positions due from as_of's day through the next `days` days."""
+    day = pd.Timestamp(as_of).normalize()
+    return due_between(index, start=day, end=day + pd.Timedelta(days=days + 1), partition=partition)
+
+
+def due_in_month(index, as_of, partition=ALL):
+    """Row positions due in the calendar month of as_of."""
+    month = pd.Timestamp(as_of).normalize().replace(day=1)
+    return due_between(index, start=month, end=month + pd.offsets.MonthBegin(1), partition=partition)
+
+
+def _datetime64(value):
+    return pd.Timestamp(value).to_datetime64().astype('datetime64[ns]')
@@ -0,0 +1,255 @@
+"""
+This module computes earned-value metrics (PV, EV, AC, SPI, CPI, EAC, ETC)
+per project and per S-curve period.
+
+Schedule progress comes from the grouped S-curve sums (see
+scurve.grouped_daily_sums()), so no task is evaluated again. Budgets
+(BAC) come from the contract sheet, or from the payment-terms ledger
+when the contract sheet has no value. Actual cost (AC) is the
+cumulative amount of paid ledger terms. A contract shared by several
+projects (one joint-venture vendor for two project codes) is split
+between them with per-project shares.
+
+Every metric is a (period x project) array computed in one pass; the
+result is a long table with one row per period and project, plus an
+'All' row per period for the portfolio.
+"""
+
+import re
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+import scurve
+
+TOTAL_LABEL = 'All'
+METRICS = ['BAC', 'PV', 'EV', 'AC', 'SPI', 'CPI', 'EAC', 'ETC']
+
+# Contract sheet columns (whitespace-normalized)
+CONTRACT_VALUE_COLUMN = 'Nilai Kontrak 2023-2024'
+REALIZATION_COLUMNS = ['Realisasi On 2023-2024', 'Realisasi On 2025']
+
+
+def _normalize_columns(df):
+    df = df.copy()
+    df.columns = [" ".join(str(col).split()) for col in df.columns]
+    return df
+
+
+def _amount(series):
+    # Amounts may come as text with thousands separators
+    return pd.to_numeric(series.astype(str).str.replace(',', '', regex=False), errors='coerce').fillna(0)
+
+
+def _text(df, columns):
+    parts = [df[col].fillna("").astype(str) for col in columns if col in df.columns]
+    if not parts:
+        return pd.Series("", index=df.index)
+    return parts[0].str.cat(parts[1:], sep=" ")
+
+
+def _matcher(keywords):
+    return re.compile("|".join(re.escape(k) for k in keywords), re.IGNORECASE)
+
+
+def project_budgets(contract_df, payment_df, project_keywords, shares=None):
+    """
+    Budget at completion and realization per project.
+
+    A project owns the contract-sheet rows (KONTRAK + Ket.) and ledger
+    contracts (VENDOR + CONTRACT_STATUS) matching any of its keywords.
+    BAC is the contract-sheet value of its rows, or the ledger contract
+    value when the contract sheet has none, times the project's share.
+
+    Args:
+        contract_df: 'Data Kontrak' sheet of data_kontrak_new.xlsx
+        payment_df: Payment-terms ledger
+        project_keywords: Dictionary of KONTRAK_CODE -> list of keywords
+        shares: Dictionary of KONTRAK_CODE -> share (0-1) of the matched
+            contracts, for contracts split between projects (default 1)
+
+    Returns:
+        DataFrame indexed by KONTRAK_CODE with BAC and REALIZED
+    """
+    contracts = _normalize_columns(contract_df)
+    contract_text = _text(contracts, ['KONTRAK', 'Ket.'])
+    contract_value = _amount(contracts[CONTRACT_VALUE_COLUMN]) if CONTRACT_VALUE_COLUMN in contracts.columns else 0
+    realized = sum(
+        (_amount(contracts[col]) for col in REALIZATION_COLUMNS if col in contracts.columns),
+        pd.Series(0.0, index=contracts.index)
+    )
+
+    # One value per ledger contract (the ledger repeats it on every term)
+    ledger = payment_df.drop_duplicates(['VENDOR', 'CONTRACT_STATUS'])
+    ledger_text = _text(ledger, ['VENDOR', 'CONTRACT_STATUS'])
+    ledger_value = _amount(ledger['TOTAL_CONTRACT_VALUE'])
+
+    shares = shares or {}
+    rows = []
+    for project, keywords in project_keywords.items():
+        pattern = _matcher(keywords)
+        share = shares.get(project, 1.0)
+        in_contracts = contract_text.str.contains(pattern)
+        bac = float(contract_value[in_contracts].sum()) if in_contracts.any() else 0.0
+        if bac <= 0:
+            bac = float(ledger_value[ledger_text.str.contains(pattern)].sum())
+        rows.append({
+            'KONTRAK_CODE': project,
+            'BAC': bac * share,
+            'REALIZED': float(realized[in_contracts].sum()) * share,
+        })
+    return pd.DataFrame(rows, columns=['KONTRAK_CODE', 'BAC', 'REALIZED']).set_index('KONTRAK_CODE')
+
+
+def paid_terms(payment_df, project_keywords, shares=None):
+    """
+    Paid ledger terms with a payment date, tagged with their project.
+
+    Amounts are scaled by the project's share (see project_budgets()).
+
+    Returns:
+        DataFrame with KONTRAK_CODE, DATE and AMOUNT
+    """
+    paid = payment_df[payment_df['STATUS'].astype(str).str.upper() == 'PAID']
+    paid = pd.DataFrame({
+        'TEXT': _text(paid, ['VENDOR', 'CONTRACT_STATUS']),
+        'DATE': pd.to_datetime(paid['DATE'], errors='coerce'),
+        'AMOUNT': _amount(paid['AMOUNT']),
+    }).dropna(subset=['DATE'])
+
+    shares = shares or {}
+    frames = []
+    for project, keywords in project_keywords.items():
+        terms = paid.loc[paid['TEXT'].str.contains(_matcher(keywords)), ['DATE', 'AMOUNT']]
+        frames.append(terms.assign(AMOUNT=terms['AMOUNT'] * shares.get(project, 1.0), KONTRAK_CODE=project))
+    if not frames:
+        return pd.DataFrame(columns=['KONTRAK_CODE', 'DATE', 'AMOUNT'])
+    return pd.concat(frames, ignore_index=True)[['KONTRAK_CODE', 'DATE', 'AMOUNT']]
+
+
+def unmatched_keywords(contract_df, payment_df, project_keywords):
+    """
+    Configured keywords that match neither the contract sheet nor the ledger.
+
+    Returns:
+        Dictionary of KONTRAK_CODE -> list of its unmatched keywords
+        (projects whose keywords all match are left out)
+    """
+    text = pd.concat([
+        _text(_normalize_columns(contract_df), ['KONTRAK', 'Ket.']),
+        _text(payment_df, ['VENDOR', 'CONTRACT_STATUS']),
+    ], ignore_index=True)
+    unmatched = {}
+    for project, keywords in project_keywords.items():
+        missing = [k for k in keywords if not text.str.contains(_matcher([k])).any()]
+        if missing:
+            unmatched[project] = missing
+    return unmatched
+
+
+def earned_value(grouped, budgets, payments, granularity='Weekly', today=None):
+    """
+    Earned-value metrics per period for every budgeted project and the portfolio.
+
+    PV = BAC x planned %, EV = BAC x actual %, AC = paid to date,
+    SPI = EV / PV, CPI = EV / AC, EAC = BAC / CPI and ETC = EAC - AC.
+    Ratios are NaN when their denominator is zero. Projects without
+    paid terms take their contract-sheet realization as AC from today on.
+
+    Periods are the S-curve periods at the given granularity; when today
+    is past the end of the schedule it is added as a last period, so the
+    latest row carries the payments made since.
+
+    Args:
+        grouped: Result of scurve.grouped_daily_sums()
+        budgets: Result of project_budgets()
+        payments: Result of paid_terms()
+        granularity: Key of scurve.GRANULARITIES
+        today: As-of date (defaults to date.today())
+
+    Returns:
+        DataFrame with Date, KONTRAK_CODE and METRICS, sorted by Date then project
+    """
+    today = date.today() if today is None else today
+    today = np.datetime64(pd.Timestamp(today).date(), 'D')
+
+    table = grouped['groups']
+    projects = table[table['GROUP_COLUMN'] == 'KONTRAK_CODE']
+    projects = projects[projects['GROUP'].isin(budgets.index) & projects['FIRST'].notna()]
+    codes = projects['GROUP'].tolist()
+    columns = projects.index.to_numpy()
+
+    periods = scurve.sample_periods(grouped['periods'], granularity)
+    rows = np.searchsorted(grouped['periods'], periods)
+    if len(periods) and today > periods[-1]:
+        periods = np.append(periods, today)
+        rows = np.append(rows, rows[-1])
+
+    # (period x project) schedule progress, made monotonic like the S-curve
+    weight = grouped['weight'][rows][:, columns]
+    planned_pct = np.nan_to_num(_ratio(grouped['planned'][rows][:, columns], weight)) * 100
+    actual_pct = np.nan_to_num(_ratio(grouped['actual'][rows][:, columns], weight)) * 100
+    planned_pct = np.maximum.accumulate(planned_pct, axis=0) if len(periods) else planned_pct
+    actual_pct = np.maximum.accumulate(actual_pct, axis=0) if len(periods) else actual_pct
+
+    bac = budgets.loc[codes, 'BAC'].to_numpy(dtype=float)
+    ac = _cumulative_cost(periods, codes, payments, budgets, today)
+
+    # Portfolio totals as an extra column
+    bac = np.append(bac, bac.sum())
+    pv = planned_pct / 100 * bac[:-1]
+    ev = actual_pct / 100 * bac[:-1]
+    pv, ev, ac = (np.column_stack([m, m.sum(axis=1)]) for m in (pv, ev, ac))
+    codes = codes + [TOTAL_LABEL]
+
+    bac = np.broadcast_to(bac, pv.shape)
+    spi = _ratio(ev, pv)
+    cpi = _ratio(ev, ac)
+    eac = _ratio(bac, cpi)
+    etc = eac - ac
+
+    n_periods, n_projects = pv.shape
+    metrics = {name: values.ravel() for name, values in zip(METRICS, (bac, pv, ev, ac, spi, cpi, eac, etc))}
+    return pd.DataFrame({
+        'Date': np.repeat(pd.to_datetime(periods), n_projects),
+        'KONTRAK_CODE': np.tile(codes, n_periods),
+        **metrics,
+    })
+
+
+def latest(evm_df, today=None):
+    """
+    Metrics of the last period on or before today, one row per project.
+
+    Returns:
+        DataFrame indexed by KONTRAK_CODE (empty if no period has passed)
+    """
+    today = pd.Timestamp(date.today() if today is None else today)
+    passed = evm_df[evm_df['Date'] <= today]
+    if passed.empty:
+        return passed.set_index('KONTRAK_CODE')
+    return passed[passed['Date'] == passed['Date'].max()].set_index('KONTRAK_CODE')
+
+
+def _cumulative_cost(periods, codes, payments, budgets, today):
+    # Paid amount per (period x project): bin each payment into the first
+    # period on or after its date, then cumulate over periods
+    paid = np.zeros((len(periods) + 1, len(codes)))
+    project = pd.Index(codes).get_indexer(payments['KONTRAK_CODE'])
+    known = project >= 0
+    when = payments['DATE'].to_numpy(dtype='datetime64[D]')[known]
+    np.add.at(paid, (np.searchsorted(periods, when), project[known]), payments['AMOUNT'].to_numpy(dtype=float)[known])
+    ac = np.cumsum(paid[:-1], axis=0)
+
+    # No dated payments: book the contract-sheet realization at today
+    unpaid = ~np.isin(codes, payments['KONTRAK_CODE'].unique())
+    if unpaid.any() and len(periods):
+        realized = budgets.loc[codes, 'REALIZED'].to_numpy(dtype=float)
+        ac[periods >= today] += np.where(unpaid, realized, 0.0)
+    return ac
+
+
+def _ratio(numerator, denominator):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(denominator != 0, numerator / denominator, np.nan)
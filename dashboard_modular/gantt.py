@@ -0,0 +1,639 @@
+"""
+This module builds the project Gantt chart shown in the Project Monitoring page.
+
+Task overlays (milestones, progress bars and percentage labels) are emitted
+as one trace each instead of one trace or annotation per task, so the number
+of traces stays constant no matter how many tasks the schedule has.
+
+Above WEBGL_THRESHOLD bars, timelines are drawn as WebGL (Scattergl) line
+segments instead of SVG bars so hovering and panning stay responsive.
+
+For coarse views, build_rollups() summarizes tasks into one bar per
+KONTRAK, AREA PEKERJAAN or SUB AREA PEKERJAAN group, so the chart cost
+depends on the number of groups instead of the number of tasks.
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+PROGRESS_COLOR = "rgba(0, 255, 0, 0.5)"
+DEPENDENCY_COLOR = "rgba(0,0,0,0.5)"
+TODAY_COLOR = "red"
+GANTT_HEIGHT = 600
+
+# Windowed mode: only a slice of the sorted rows is built and sent
+WINDOW_SIZES = [25, 50, 100, 200]
+WINDOW_THRESHOLD = 200  # Row count above which the windowed view is the default
+ROW_HEIGHT = 28
+SORT_COLUMNS = ['KONTRAK_CODE', 'TASK_LEVEL', 'START']
+
+# WebGL mode: bars are drawn as thick Scattergl segments
+WEBGL_THRESHOLD = 1000  # Bar count above which timelines switch to WebGL
+BAR_FILL = 0.6  # Share of a row's pitch covered by a segment bar
+
+# Level of detail: grouping columns of each roll-up level, coarse to fine
+ROLLUP_LEVELS = {
+    'Project': ['KONTRAK_CODE'],
+    'Area': ['KONTRAK_CODE', 'AREA PEKERJAAN'],
+    'Sub Area': ['KONTRAK_CODE', 'AREA PEKERJAAN', 'SUB AREA PEKERJAAN'],
+}
+TASK_LEVEL = 'Tasks'
+DETAIL_LEVELS = list(ROLLUP_LEVELS) + [TASK_LEVEL]
+
+
+def use_webgl(n_elements, threshold=WEBGL_THRESHOLD):
+    """Whether a chart with n_elements bars should be drawn with WebGL traces."""
+    return threshold is not None and n_elements > threshold
+
+
+def segment_arrays(x0, x1, y0, y1=None):
+    """
+    Interleave segment endpoints into x/y arrays with None separators,
+    so any number of segments can share one line trace.
+
+    Dates are passed as ISO strings: plotly deep-copies trace data, and
+    copying strings is much cheaper than copying Timestamp objects.
+    """
+    y1 = y0 if y1 is None else y1
+    n = len(x0)
+    x = np.empty(n * 3, dtype=object)
+    y = np.empty(n * 3, dtype=object)
+    x[0::3] = _as_plot_values(x0)
+    x[1::3] = _as_plot_values(x1)
+    x[2::3] = None
+    y[0::3] = list(y0)
+    y[1::3] = list(y1)
+    y[2::3] = None
+    return x, y
+
+
+def _as_plot_values(values):
+    values = pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return np.datetime_as_string(values.to_numpy(dtype='datetime64[s]'), unit='s')
+    return values.tolist()
+
+
+def segment_width(height, n_rows):
+    """Line width (px) that makes a segment look like a bar of its row."""
+    if not n_rows:
+        return 10
+    return float(min(20, max(1, (height - 120) / n_rows * BAR_FILL)))
+
+
+def segment_timeline(df, x_start, x_end, y, color, color_map=None, hovertext=None,
+                     line_width=10, category_order=None):
+    """
+    WebGL counterpart of px.timeline: one Scattergl trace per color group,
+    each bar drawn as a thick horizontal line segment.
+
+    Args:
+        df: DataFrame with one row per bar
+        x_start: Column holding bar start dates
+        x_end: Column holding bar end dates
+        y: Column holding the row (category) label
+        color: Column the bars are grouped and colored by
+        color_map: Dictionary mapping color values to colors, "identity" to
+            use the values themselves as colors, or None for the default palette
+        hovertext: Optional Series of hover text per bar
+        line_width: Segment thickness in pixels
+        category_order: Optional list fixing the row order
+
+    Returns:
+        Plotly figure with reversed category y axis, like px.timeline
+    """
+    fig = go.Figure()
+    palette = px.colors.qualitative.Plotly
+    for i, (value, group) in enumerate(df.groupby(color, sort=False)):
+        if color_map == "identity":
+            line_color = value
+        elif color_map and value in color_map:
+            line_color = color_map[value]
+        else:
+            line_color = palette[i % len(palette)]
+        x, y_values = segment_arrays(group[x_start], group[x_end], group[y])
+        text = None
+        if hovertext is not None:
+            text, _ = segment_arrays(hovertext.loc[group.index], hovertext.loc[group.index], group[y])
+        fig.add_trace(go.Scattergl(
+            x=x,
+            y=y_values,
+            mode='lines',
+            line=dict(color=line_color, width=line_width),
+            name=str(value),
+            legendgroup=str(value),
+            hoverinfo='text' if text is not None else 'x+y',
+            hovertext=text,
+        ))
+
+    fig.update_xaxes(type='date')
+    fig.update_yaxes(
+        autorange="reversed",
+        type='category',
+        categoryorder="array" if category_order is not None else "trace",
+        categoryarray=category_order
+    )
+    fig.update_layout(legend_title_text=color)
+    return fig
+
+
+def build_gantt_figure(timeline_df, color_map, view_start=None, view_end=None, today=None,
+                       show_dependencies=True, height=GANTT_HEIGHT, webgl=None,
+                       webgl_threshold=WEBGL_THRESHOLD):
+    """
+    Build the Gantt chart for a prepared timeline dataframe.
+
+    Args:
+        timeline_df: DataFrame with 'Task', 'START', 'PLAN END', 'STATUS' and
+            'Tooltip' columns, plus optional '% COMPLETE' and 'IS_MILESTONE'
+        color_map: Dictionary mapping STATUS values to bar colors
+        view_start: Optional start of the visible date range
+        view_end: Optional end of the visible date range
+        today: Date of the "Today" reference line (defaults to now)
+        show_dependencies: Draw predecessor -> task connectors
+        height: Figure height in pixels
+        webgl: Force (True) or disable (False) WebGL traces; None switches
+            automatically above webgl_threshold tasks
+        webgl_threshold: Task count above which WebGL traces are used
+
+    Returns:
+        Plotly figure with the task bars and one trace per overlay type
+    """
+    has_progress = '% COMPLETE' in timeline_df.columns
+    if webgl is None:
+        webgl = use_webgl(len(timeline_df), webgl_threshold)
+
+    if webgl:
+        fig = segment_timeline(
+            timeline_df,
+            x_start='START',
+            x_end='PLAN END',
+            y='Task',
+            color='STATUS',
+            color_map=color_map,
+            hovertext=timeline_df['Tooltip'] if 'Tooltip' in timeline_df.columns else None,
+            line_width=segment_width(height, timeline_df['Task'].nunique()),
+            category_order=timeline_df['Task'].tolist()
+        )
+    else:
+        fig = px.timeline(
+            timeline_df,
+            x_start='START',
+            x_end='PLAN END',
+            y='Task',
+            color='STATUS',
+            color_discrete_map=color_map,
+            hover_name='Tooltip',
+            custom_data=['% COMPLETE', 'TASK_ID'] if has_progress else None
+        )
+        fig.update_yaxes(
+            autorange="reversed",
+            categoryorder="array",
+            categoryarray=timeline_df['Task'].tolist()
+        )
+
+    if show_dependencies:
+        add_dependency_traces(fig, timeline_df, webgl=webgl)
+    add_milestone_trace(fig, timeline_df, color_map, webgl=webgl)
+    if has_progress:
+        add_progress_traces(fig, timeline_df, webgl=webgl, height=height)
+
+    if view_start and view_end:
+        fig.update_layout(
+            height=height,
+            margin=dict(l=10, r=10, t=10, b=10),
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+            xaxis=dict(
+                range=[view_start, view_end],
+                rangeslider=dict(visible=True)  # Add range slider for easy navigation
+            )
+        )
+    else:
+        # Default layout without date range filter - with responsive settings for mobile
+        fig.update_layout(
+            height=height,
+            margin=dict(l=10, r=10, t=10, b=10),
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+            autosize=True,
+            modebar=dict(orientation='v'),
+            hovermode='closest'
+        )
+
+    add_today_line(fig, today or datetime.today())
+    return fig
+
+
+def _as_text(series):
+    # Values as text, missing ones as 'nan' like an f-string
+    return series.astype(str).fillna("nan")
+
+
+def task_tooltips(timeline_df):
+    """
+    Hover text of every task bar, built with vectorized string operations.
+
+    Optional parts (area, sub area, progress, milestone flag) are only
+    added where the value is present.
+    """
+    df = timeline_df
+    project_col = 'KONTRAK_DISPLAY' if 'KONTRAK_DISPLAY' in df.columns else 'KONTRAK_CODE'
+    project = _as_text(df[project_col]) if project_col in df.columns else ""
+
+    tooltip = (
+        "<b>" + _as_text(df['JENIS PEKERJAAN']) + "</b>"
+        + "<br>Project: " + project
+        + "<br>Status: " + _as_text(df['STATUS'])
+    )
+    for col, label in (('AREA PEKERJAAN', 'Area'), ('SUB AREA PEKERJAAN', 'Sub Area')):
+        if col in df.columns:
+            tooltip += ("<br>" + label + ": " + _as_text(df[col])).where(df[col].notna(), "")
+    if '% COMPLETE' in df.columns:
+        complete = pd.to_numeric(df['% COMPLETE'], errors='coerce')
+        tooltip += ("<br>Progress: " + complete.map("{:.1f}%".format)).where(complete.notna(), "")
+    if 'START' in df.columns and 'PLAN END' in df.columns:
+        tooltip += (
+            "<br>Duration: " + df['START'].dt.strftime('%Y-%m-%d')
+            + " → " + df['PLAN END'].dt.strftime('%Y-%m-%d')
+        )
+    if 'IS_MILESTONE' in df.columns:
+        tooltip += np.where(df['IS_MILESTONE'].fillna(False).astype(bool), "<br><b>MILESTONE</b>", "")
+    return tooltip
+
+
+def task_labels(timeline_df):
+    """
+    Y-axis label of every task: "<project> - <JENIS PEKERJAAN>", indented
+    by two spaces per TASK_LEVEL below 1.
+    """
+    df = timeline_df
+    label = _as_text(df['KONTRAK_DISPLAY']) + " - " + _as_text(df['JENIS PEKERJAAN'])
+    if 'TASK_LEVEL' not in df.columns:
+        return label
+    depth = (pd.to_numeric(df['TASK_LEVEL'], errors='coerce').fillna(1).astype(int) - 1).clip(lower=0)
+    return pd.Series("  ", index=df.index).str.repeat(depth) + label
+
+
+def sorted_row_index(timeline_df, sort_columns=SORT_COLUMNS):
+    """
+    Positional row order of the Gantt (project, level, start).
+
+    Computed once per timeline so paging only slices it.
+    """
+    columns = [col for col in sort_columns if col in timeline_df.columns]
+    if not columns:
+        return np.arange(len(timeline_df))
+    order = timeline_df.reset_index(drop=True).sort_values(columns, kind='stable')
+    return order.index.to_numpy()
+
+
+def window_rows(timeline_df, row_index, offset, size):
+    """Rows offset .. offset + size of the sorted Gantt."""
+    offset = max(0, min(int(offset), max(0, len(row_index) - 1)))
+    return timeline_df.iloc[row_index[offset:offset + size]]
+
+
+def window_date_range(window_df):
+    """Date range covered by the rows of a window (None if it has no dates)."""
+    dates = pd.concat([window_df['START'], window_df['PLAN END']]).dropna()
+    if dates.empty:
+        return None, None
+    return dates.min(), dates.max()
+
+
+def window_height(window_df):
+    """Figure height that gives every task row of the window a fixed pitch."""
+    rows = window_df['Task'].nunique() if 'Task' in window_df.columns else len(window_df)
+    return max(300, rows * ROW_HEIGHT + 120)
+
+
+def build_rollups(timeline_df):
+    """
+    Summarize the timeline at every roll-up level.
+
+    Each group becomes one Gantt row spanning its earliest START to its
+    latest PLAN END, with BOBOT-weighted % COMPLETE (plain mean when the
+    group has no BOBOT) and a status derived from its tasks.
+
+    Args:
+        timeline_df: Timeline DataFrame prepared by the monitoring page
+
+    Returns:
+        Dictionary mapping each ROLLUP_LEVELS name to a DataFrame that has
+        the columns build_gantt_figure() expects, plus TASKS (task count)
+    """
+    df = _rollup_frame(timeline_df)
+
+    status = df['STATUS'] if 'STATUS' in df.columns else pd.Series("", index=df.index)
+    complete = pd.to_numeric(df['% COMPLETE'], errors='coerce').fillna(0) if '% COMPLETE' in df.columns else 0.0
+    bobot = pd.to_numeric(df['BOBOT'], errors='coerce').fillna(0) if 'BOBOT' in df.columns else 0.0
+    bobot = np.maximum(bobot, 0)
+
+    # Per-task terms, summed per group below
+    df['_BOBOT'] = bobot
+    df['_WEIGHTED'] = bobot * complete
+    df['_COMPLETE'] = complete
+    df['_DONE'] = status.eq('SELESAI')
+    df['_LATE'] = status.eq('TERLAMBAT')
+    df['_ACTIVE'] = status.eq('DALAM PROSES')
+    df['_ON_HOLD'] = status.eq('TUNDA')
+
+    rollups = {}
+    for depth, (level, keys) in enumerate(ROLLUP_LEVELS.items(), start=1):
+        grouped = df.groupby(keys, sort=True, dropna=False).agg(
+            KONTRAK_DISPLAY=('KONTRAK_DISPLAY', 'first'),
+            START=('START', 'min'),
+            PLAN_END=('PLAN END', 'max'),
+            TASKS=('START', 'size'),
+            BOBOT=('_BOBOT', 'sum'),
+            WEIGHTED=('_WEIGHTED', 'sum'),
+            MEAN_COMPLETE=('_COMPLETE', 'mean'),
+            ALL_DONE=('_DONE', 'all'),
+            ANY_DONE=('_DONE', 'any'),
+            ANY_LATE=('_LATE', 'any'),
+            ANY_ACTIVE=('_ACTIVE', 'any'),
+            ANY_ON_HOLD=('_ON_HOLD', 'any'),
+        ).reset_index()
+
+        grouped['% COMPLETE'] = np.where(
+            grouped['BOBOT'] > 0,
+            grouped['WEIGHTED'] / grouped['BOBOT'].where(grouped['BOBOT'] > 0, 1),
+            grouped['MEAN_COMPLETE']
+        ).round(1)
+        grouped['STATUS'] = np.select(
+            [grouped['ALL_DONE'], grouped['ANY_LATE'],
+             grouped['ANY_ACTIVE'] | grouped['ANY_DONE'], grouped['ANY_ON_HOLD']],
+            ['SELESAI', 'TERLAMBAT', 'DALAM PROSES', 'TUNDA'],
+            default='BELUM MULAI'
+        )
+
+        label = _group_label(grouped, keys)
+        grouped['Task'] = label
+        grouped['TASK_ID'] = label
+        grouped['JENIS PEKERJAAN'] = label
+        grouped['TASK_LEVEL'] = depth
+        grouped['IS_MILESTONE'] = False
+        grouped['PREDECESSORS'] = ""
+        grouped['Tooltip'] = (
+            "<b>" + label + "</b><br>"
+            + "Tasks: " + grouped['TASKS'].astype(str) + "<br>"
+            + "Start: " + grouped['START'].dt.strftime('%d %b %Y') + "<br>"
+            + "End: " + grouped['PLAN_END'].dt.strftime('%d %b %Y') + "<br>"
+            + "Weighted progress: " + grouped['% COMPLETE'].map("{:.1f}%".format)
+        )
+
+        grouped = grouped.rename(columns={'PLAN_END': 'PLAN END'})
+        rollups[level] = grouped.drop(columns=[
+            'WEIGHTED', 'MEAN_COMPLETE', 'ALL_DONE', 'ANY_DONE',
+            'ANY_LATE', 'ANY_ACTIVE', 'ANY_ON_HOLD'
+        ]).sort_values(['KONTRAK_CODE', 'START'], kind='stable').reset_index(drop=True)
+
+    return rollups
+
+
+def group_rows(timeline_df):
+    """
+    Positional rows of the tasks in every roll-up group, for drill-down.
+
+    The group keys are normalized once here (as in build_rollups()), so a
+    drill-down is a plain row lookup.
+
+    Args:
+        timeline_df: Timeline DataFrame the roll-ups were built from
+
+    Returns:
+        Dictionary mapping each ROLLUP_LEVELS name to a dictionary of group
+        TASK_ID -> sorted row positions in timeline_df
+    """
+    df = _rollup_frame(timeline_df)
+    rows = {}
+    for level, keys in ROLLUP_LEVELS.items():
+        codes, labels = pd.factorize(_group_label(df, keys))
+        order = np.argsort(codes, kind='stable')
+        bounds = np.cumsum(np.bincount(codes, minlength=len(labels)))[:-1]
+        rows[level] = dict(zip(labels, np.split(order, bounds)))
+    return rows
+
+
+def drill_down(timeline_df, rows, level, group_id):
+    """
+    Tasks belonging to one roll-up group.
+
+    Args:
+        timeline_df: Timeline DataFrame the roll-ups were built from
+        rows: Result of group_rows() for timeline_df
+        level: ROLLUP_LEVELS name of the group
+        group_id: TASK_ID of the group row
+
+    Returns:
+        Subset of timeline_df (empty if the group is unknown)
+    """
+    positions = rows.get(level, {}).get(group_id)
+    if positions is None:
+        return timeline_df.iloc[0:0]
+    return timeline_df.iloc[positions]
+
+
+def _rollup_frame(timeline_df):
+    # Copy with the grouping columns as the roll-ups see them ("-" for blanks)
+    df = timeline_df.copy()
+    for col in ('AREA PEKERJAAN', 'SUB AREA PEKERJAAN'):
+        if col not in df.columns:
+            df[col] = ""
+        df[col] = df[col].fillna("").astype(str).str.strip().replace("", "-")
+    if 'KONTRAK_DISPLAY' not in df.columns:
+        df['KONTRAK_DISPLAY'] = df['KONTRAK_CODE']
+    return df
+
+
+def _group_label(frame, keys):
+    # Group row label: project › area › sub area, down to the level's keys
+    label = frame['KONTRAK_DISPLAY'].astype(str)
+    for col in keys[1:]:
+        label = label + " › " + frame[col].astype(str)
+    return label
+
+
+def dependency_links(timeline_df):
+    """
+    Resolve PREDECESSORS into predecessor -> task links.
+
+    Returns:
+        DataFrame with one row per link: predecessor end/task/name and
+        successor start/task
+    """
+    if 'PREDECESSORS' not in timeline_df.columns:
+        return pd.DataFrame(columns=['PRED_END', 'PRED_TASK', 'PRED_NAME', 'START', 'Task'])
+
+    preds = (
+        timeline_df[['TASK_ID', 'PLAN END', 'Task', 'JENIS PEKERJAAN']]
+        .drop_duplicates('TASK_ID')
+        .rename(columns={
+            'TASK_ID': 'PREDECESSORS',
+            'PLAN END': 'PRED_END',
+            'Task': 'PRED_TASK',
+            'JENIS PEKERJAAN': 'PRED_NAME',
+        })
+    )
+    succ = timeline_df.loc[
+        timeline_df['PREDECESSORS'].notna() & (timeline_df['PREDECESSORS'] != ""),
+        ['PREDECESSORS', 'START', 'Task']
+    ]
+    links = succ.merge(preds, on='PREDECESSORS', how='inner')
+    return links[['PRED_END', 'PRED_TASK', 'PRED_NAME', 'START', 'Task']]
+
+
+def add_dependency_traces(fig, timeline_df, webgl=False):
+    """
+    Add all dependency connectors as one line trace plus one arrowhead trace.
+
+    Segments are separated by None so every link shares the same trace.
+    """
+    links = dependency_links(timeline_df)
+    if links.empty:
+        return
+
+    scatter = go.Scattergl if webgl else go.Scatter
+    x, y = segment_arrays(links['PRED_END'], links['START'], links['PRED_TASK'], links['Task'])
+
+    fig.add_trace(scatter(
+        x=x,
+        y=y,
+        mode='lines',
+        line=dict(color=DEPENDENCY_COLOR, width=1.5, dash="dot"),
+        name="Dependencies",
+        hoverinfo="skip",
+        showlegend=False
+    ))
+    fig.add_trace(scatter(
+        x=links['START'],
+        y=links['Task'],
+        mode='markers',
+        marker=dict(symbol='triangle-right', size=8, color=DEPENDENCY_COLOR),
+        name="Dependency Arrows",
+        hoverinfo='text',
+        hovertext=("Depends on: " + links['PRED_NAME'].astype(str)).tolist(),
+        hoverlabel=dict(bgcolor="white"),
+        showlegend=False
+    ))
+
+
+def add_milestone_trace(fig, timeline_df, color_map, webgl=False):
+    """Add all milestones as a single diamond marker trace."""
+    if 'IS_MILESTONE' not in timeline_df.columns:
+        return
+
+    milestones = timeline_df[timeline_df['IS_MILESTONE'].fillna(False).astype(bool)]
+    if milestones.empty:
+        return
+
+    midpoint = milestones['START'] + (milestones['PLAN END'] - milestones['START']) / 2
+    hovertext = (
+        "<b>MILESTONE:</b> " + milestones['JENIS PEKERJAAN'].astype(str)
+        + "<br>Date: " + midpoint.dt.strftime('%Y-%m-%d')
+    )
+
+    scatter = go.Scattergl if webgl else go.Scatter
+    fig.add_trace(scatter(
+        x=midpoint,
+        y=milestones['Task'],
+        mode='markers',
+        marker=dict(
+            symbol='diamond',
+            size=16,
+            color=milestones['STATUS'].map(color_map).fillna('blue').tolist(),
+            line=dict(color='black', width=1)
+        ),
+        name="Milestones",
+        showlegend=False,
+        hoverinfo='text',
+        hovertext=hovertext.tolist()
+    ))
+
+
+def add_progress_traces(fig, timeline_df, webgl=False, height=GANTT_HEIGHT):
+    """
+    Add the progress overlay and percentage labels for all non-milestone tasks.
+
+    The overlay is one horizontal bar trace (based at START, as wide as the
+    completed share of the task) and the labels are one text trace. In WebGL
+    mode the overlay is one Scattergl segment trace instead.
+    """
+    tasks = timeline_df
+    if 'IS_MILESTONE' in tasks.columns:
+        tasks = tasks[~tasks['IS_MILESTONE'].fillna(False).astype(bool)]
+
+    duration = tasks['PLAN END'] - tasks['START']
+    tasks = tasks[duration > pd.Timedelta(0)]
+    if tasks.empty:
+        return
+    duration = tasks['PLAN END'] - tasks['START']
+    complete = pd.to_numeric(tasks['% COMPLETE'], errors='coerce').fillna(0)
+
+    # Progress overlay only for non-completed tasks with progress
+    in_progress = (tasks['STATUS'] != 'SELESAI') & (complete > 0)
+    if in_progress.any():
+        progress_ms = duration[in_progress].dt.total_seconds() * 1000 * (complete[in_progress] / 100)
+        if webgl:
+            progress_end = tasks.loc[in_progress, 'START'] + pd.to_timedelta(progress_ms, unit='ms')
+            x, y = segment_arrays(tasks.loc[in_progress, 'START'], progress_end, tasks.loc[in_progress, 'Task'])
+            fig.add_trace(go.Scattergl(
+                x=x,
+                y=y,
+                mode='lines',
+                line=dict(color=PROGRESS_COLOR, width=segment_width(height, timeline_df['Task'].nunique()) / 2),
+                name="Progress",
+                hoverinfo="skip",
+                showlegend=False
+            ))
+        else:
+            fig.add_trace(go.Bar(
+                base=tasks.loc[in_progress, 'START'],
+                x=progress_ms,
+                y=tasks.loc[in_progress, 'Task'],
+                orientation='h',
+                width=0.4,
+                marker=dict(color=PROGRESS_COLOR, line=dict(width=0)),
+                name="Progress",
+                hoverinfo="skip",
+                showlegend=False
+            ))
+
+    # Percentage text in the middle of each bar
+    scatter = go.Scattergl if webgl else go.Scatter
+    fig.add_trace(scatter(
+        x=tasks['START'] + duration / 2,
+        y=tasks['Task'],
+        mode='text',
+        text=complete.round(0).astype(int).astype(str) + '%',
+        textfont=dict(size=12, color="black", family="Arial, sans-serif"),
+        name="Progress Labels",
+        hoverinfo="skip",
+        showlegend=False
+    ))
+
+
+def add_today_line(fig, today):
+    """Add the dashed vertical "Today" reference line with its label."""
+    fig.add_shape(
+        type="line",
+        xref="x",
+        yref="paper",
+        x0=today,
+        y0=0,
+        x1=today,
+        y1=1,
+        line=dict(color=TODAY_COLOR, width=2, dash="dash")
+    )
+    fig.add_annotation(
+        x=today,
+        y=1.05,
+        xref="x",
+        yref="paper",
+        text="Today",
+        showarrow=False,
+        font=dict(color=TODAY_COLOR, size=12),
+    )
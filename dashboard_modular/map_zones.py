@@ -1,54 +1,37 @@
 """
 This module provides SVG map data and functions for creating
 an interactive zone-based project progress visualization.
+
+Zone geometry, ids and name aliases come from a GeoJSON-like site layout
+file (data/site_layout.json by default), parsed once per path. Progress
+keys are matched to zones through an alias index, so rendering a map with
+hundreds of zones costs a few dictionary lookups per progress key.
 """
 
-# Define a simplified SVG representation of the site layout
-# The zones correspond to the blocks in the layout diagram
-SITE_MAP_SVG = """
-<svg viewBox="0 0 1000 600" xmlns="http://www.w3.org/2000/svg">
-    <!-- Border -->
-    <rect x="10" y="10" width="980" height="580" fill="none" stroke="black" stroke-width="2"/>
-    
-    <!-- Block 1C area -->
-    <path id="block-1c" d="M 180,350 L 80,450 L 180,500 L 320,500 L 400,400 L 300,330 Z" 
-          fill="#e6f7ff" stroke="black" stroke-width="2" 
-          data-name="BLOCK-1C" data-zone="production"/>
-    
-    <!-- Block 2C area -->
-    <path id="block-2c" d="M 400,400 L 320,500 L 500,550 L 650,450 L 550,350 L 450,380 Z" 
-          fill="#e6f7ff" stroke="black" stroke-width="2" 
-          data-name="BLOCK-2C" data-zone="production"/>
-    
-    <!-- Main facility area -->
-    <path id="facility-area" d="M 300,330 L 400,400 L 450,380 L 550,350 L 500,250 L 350,200 L 250,250 Z" 
-          fill="#fff0e6" stroke="black" stroke-width="2" 
-          data-name="Facility Area" data-zone="facility"/>
-    
-    <!-- Green area -->
-    <path id="green-area" d="M 350,200 L 500,250 L 600,200 L 700,220 L 750,170 L 550,100 L 350,120 Z" 
-          fill="#e6ffe6" stroke="black" stroke-width="2" 
-          data-name="Green Area" data-zone="green"/>
-    
-    <!-- Pond area -->
-    <rect id="pond-area" x="150" y="190" width="150" height="110" 
-          fill="#e6f9ff" stroke="black" stroke-width="2" 
-          data-name="Pond Area" data-zone="pond"/>
-    
-    <!-- Private area -->
-    <rect id="private-area" x="700" y="300" width="150" height="100" rx="10" ry="10" 
-          fill="#ffe6e6" stroke="black" stroke-width="2" 
-          data-name="Private Area" data-zone="private"/>
-    
-    <!-- Labels -->
-    <text x="150" y="440" font-family="Arial" font-size="20" fill="black">BLOCK-1C</text>
-    <text x="470" y="470" font-family="Arial" font-size="20" fill="black">BLOCK-2C</text>
-    <text x="370" y="310" font-family="Arial" font-size="16" fill="black">Facility Area</text>
-    <text x="500" y="170" font-family="Arial" font-size="16" fill="black">Green Area</text>
-    <text x="180" y="250" font-family="Arial" font-size="16" fill="black">Pond</text>
-    <text x="730" y="350" font-family="Arial" font-size="16" fill="black">Private</text>
-    
-    <!-- Compass -->
+import html
+import json
+import os
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+SITE_LAYOUT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'site_layout.json')
+
+# Hover highlight added to the rendered map
+MAP_HOVER_STYLE = """
+    <style>
+        path:hover, rect:hover {
+            stroke-width: 3;
+            stroke: #333;
+            cursor: pointer;
+            filter: brightness(1.1);
+        }
+    </style>"""
+
+# Compass drawn in the top-left corner of every map
+MAP_COMPASS = """
     <circle cx="80" cy="80" r="30" fill="white" stroke="black" stroke-width="1"/>
     <path d="M 80,50 L 80,110" stroke="black" stroke-width="1"/>
     <path d="M 50,80 L 110,80" stroke="black" stroke-width="1"/>
@@ -56,197 +39,367 @@ SITE_MAP_SVG = """
     <text x="80" y="105" font-family="Arial" font-size="14" text-anchor="middle" fill="black">S</text>
     <text x="55" y="85" font-family="Arial" font-size="14" text-anchor="middle" fill="black">W</text>
     <text x="105" y="85" font-family="Arial" font-size="14" text-anchor="middle" fill="black">E</text>
-</svg>
 """
 
-# Map for zone names to the corresponding SVG element IDs
-ZONE_TO_ID_MAP = {
-    "BLOCK-1C": "block-1c",
-    "BLOCK-2C": "block-2c",
-    "FACILITY AREA": "facility-area",
-    "GREEN AREA": "green-area", 
-    "POND AREA": "pond-area",
-    "PRIVATE AREA": "private-area"
+ALIAS_TOKEN_PATTERN = re.compile(r"[A-Z0-9]+")
+MAP_RENDER_CACHE_SIZE = 256
+
+# Keywords that map a task description (JENIS PEKERJAAN) to a zone when
+# there is no AREA PEKERJAAN column; earlier zones win when several match
+ZONE_TASK_KEYWORDS = {
+    'BLOCK-1C': ['block 1c', 'block-1c', 'block1c', 'blok 1c'],
+    'BLOCK-2C': ['block 2c', 'block-2c', 'block2c', 'blok 2c'],
+    'FACILITY AREA': ['facility', 'fasilitas', 'kantor', 'office'],
+    'GREEN AREA': ['green', 'taman', 'garden', 'landscape'],
+    'POND AREA': ['pond', 'kolam', 'water', 'air'],
+    'PRIVATE AREA': ['private', 'pribadi', 'housing', 'perumahan']
 }
+KEYWORD_MATCH_CACHE_SIZE = 65536
 
-# Function to generate HTML with colored zones based on progress data
-def generate_colored_map(progress_data):
+
+def alias_tokens(name):
+    """Upper-case alphanumeric words of a zone name or alias ('Block-1C' -> ('BLOCK', '1C'))."""
+    return tuple(ALIAS_TOKEN_PATTERN.findall(str(name).upper()))
+
+
+@lru_cache(maxsize=None)
+def load_site_layout(path=SITE_LAYOUT_PATH):
     """
-    Generate an HTML representation of the site map with zones colored by progress.
-    
+    Parse a site layout file (cached per path).
+
+    The file is GeoJSON-like: a "viewBox" [x, y, width, height] and a list
+    of "features", each with an "id", a "geometry" (a "Polygon" with
+    "coordinates", or a "Rect" with x, y, width, height and optional rx)
+    and "properties": "name" (the progress key, e.g. "POND AREA"),
+    "display_name", "category", "aliases" and an optional "label"
+    {text, x, y, size}.
+
+    A zone matches a progress key containing its name or one of its
+    aliases as whole words (case and punctuation are ignored). A key that
+    matches no zone this way falls back to plain substring matching of the
+    same words, so "GREENHOUSE" still matches the "GREEN" alias and "PONDS"
+    the "POND" one (see zone_slots()).
+
     Args:
-        progress_data: Dictionary mapping zone names to progress percentages (0-100)
-        
+        path: Layout file path
+
     Returns:
-        HTML string with the SVG map and interactive elements
-    """
-    # We'll manually build a new SVG from scratch to avoid any HTML parsing issues
-    svg_open = """<svg viewBox="0 0 1000 600" xmlns="http://www.w3.org/2000/svg">
-    <style>
-        path:hover, rect:hover {
-            stroke-width: 3;
-            stroke: #333;
-            cursor: pointer;
-            filter: brightness(1.1);
-        }
-    </style>
-    <rect x="10" y="10" width="980" height="580" fill="none" stroke="black" stroke-width="2"/>
-    """
-    
-    svg_close = """</svg>"""
-    
-    # Color logic - from red (0%) to green (100%)
-    def get_color_for_progress(progress):
-        # Red to yellow to green gradient
-        if progress < 50:
-            # Red to yellow (map 0-50 to 0-100)
-            mapped = progress * 2
-            r = 255
-            g = int(255 * (mapped / 100))
-            b = 0
-        else:
-            # Yellow to green (map 50-100 to 0-100)
-            mapped = (progress - 50) * 2
-            r = int(255 * (1 - mapped / 100))
-            g = 255
-            b = 0
-        
-        # Return with opacity for better visualization
-        return f"rgba({r}, {g}, {b}, 0.7)"
-    
-    # Build the SVG content with each zone and its colors
-    svg_content = ""
-    
-    # Block 1C area
-    block_1c_progress = 0
-    for zone_name, progress in progress_data.items():
-        if "BLOCK-1C" in zone_name.upper():
-            block_1c_progress = progress
-            break
-    
-    svg_content += f"""
-    <path id="block-1c" d="M 180,350 L 80,450 L 180,500 L 320,500 L 400,400 L 300,330 Z" 
-          fill="{get_color_for_progress(block_1c_progress)}" stroke="black" stroke-width="2" 
-          data-name="BLOCK-1C" data-zone="production">
-          <title>BLOCK-1C: {block_1c_progress:.1f}% complete</title>
-    </path>
+        Dictionary with:
+            'view_box': (x, y, width, height)
+            'zones': list of zone dictionaries (id, name, display_name,
+                category, geometry, label)
+            'aliases': alias word tuple -> tuple of zone positions
+            'max_alias_words': longest alias, in words
+
+    Raises:
+        ValueError: if a feature has an unsupported geometry
     """
-    
-    # Block 2C area
-    block_2c_progress = 0
-    for zone_name, progress in progress_data.items():
-        if "BLOCK-2C" in zone_name.upper():
-            block_2c_progress = progress
-            break
-    
-    svg_content += f"""
-    <path id="block-2c" d="M 400,400 L 320,500 L 500,550 L 650,450 L 550,350 L 450,380 Z" 
-          fill="{get_color_for_progress(block_2c_progress)}" stroke="black" stroke-width="2" 
-          data-name="BLOCK-2C" data-zone="production">
-          <title>BLOCK-2C: {block_2c_progress:.1f}% complete</title>
-    </path>
+    with open(path, encoding='utf-8') as f:
+        layout = json.load(f)
+
+    zones = []
+    aliases = {}
+    for feature in layout['features']:
+        props = feature.get('properties', {})
+        geometry = feature['geometry']
+        if geometry.get('type') not in ('Polygon', 'Rect'):
+            raise ValueError(f"Zone {feature.get('id')!r}: unsupported geometry {geometry.get('type')!r}")
+        name = props.get('name', feature['id'])
+        zones.append({
+            'id': feature['id'],
+            'name': name,
+            'display_name': props.get('display_name', name),
+            'category': props.get('category', ''),
+            'geometry': geometry,
+            'label': props.get('label'),
+        })
+        for alias in {alias_tokens(a) for a in [name, *props.get('aliases', [])]}:
+            if alias:
+                aliases[alias] = aliases.get(alias, ()) + (len(zones) - 1,)
+
+    return {
+        'view_box': tuple(layout.get('viewBox', (0, 0, 1000, 600))),
+        'zones': zones,
+        'aliases': aliases,
+        'max_alias_words': max((len(alias) for alias in aliases), default=0),
+    }
+
+
+def zone_names(layout_path=SITE_LAYOUT_PATH):
+    """Progress keys of the layout's zones, in layout order."""
+    return [zone['name'] for zone in load_site_layout(layout_path)['zones']]
+
+
+def progress_color(progress):
+    """Fill color for a progress percentage: red (0%) to yellow (50%) to green (100%), 70% opaque."""
+    if progress < 50:
+        # Red to yellow (map 0-50 to 0-100)
+        mapped = progress * 2
+        r = 255
+        g = int(255 * (mapped / 100))
+        b = 0
+    else:
+        # Yellow to green (map 50-100 to 0-100)
+        mapped = (progress - 50) * 2
+        r = int(255 * (1 - mapped / 100))
+        g = 255
+        b = 0
+    return f"rgba({r}, {g}, {b}, 0.7)"
+
+
+def _number(value):
+    return f"{value:g}"
+
+
+def _zone_element(zone, slot):
+    # Zone shape with str.format fields {2*slot} (fill) and {2*slot+1} (title)
+    geometry = zone['geometry']
+    attrs = (
+        f'fill="{{{2 * slot}}}" stroke="black" stroke-width="2" '
+        f'data-name="{_escape(zone["display_name"])}" data-zone="{_escape(zone["category"])}"'
+    )
+    if geometry['type'] == 'Polygon':
+        ring = geometry['coordinates'][0]
+        d = "M " + " L ".join(f"{_number(x)},{_number(y)}" for x, y in ring) + " Z"
+        open_tag, tag = f'<path id="{_escape(zone["id"])}" d="{d}"', 'path'
+    else:
+        corners = ""
+        if geometry.get('rx'):
+            corners = f' rx="{_number(geometry["rx"])}" ry="{_number(geometry.get("ry", geometry["rx"]))}"'
+        open_tag, tag = (
+            f'<rect id="{_escape(zone["id"])}" x="{_number(geometry["x"])}" y="{_number(geometry["y"])}" '
+            f'width="{_number(geometry["width"])}" height="{_number(geometry["height"])}"{corners}'
+        ), 'rect'
+    return f"""
+    {open_tag}
+          {attrs}>
+          <title>{{{2 * slot + 1}}}</title>
+    </{tag}>"""
+
+
+def _escape(text):
+    # Escaping for text compiled into the template (braces survive str.format)
+    return html.escape(str(text)).replace("{", "{{").replace("}", "}}")
+
+
+@lru_cache(maxsize=None)
+def _map_template(layout_path):
+    # The layout compiled once into a str.format template: zone i has its
+    # fill in field 2i and its title in field 2i+1; the last field is the
+    # hidden debug text
+    layout = load_site_layout(layout_path)
+    x, y, width, height = layout['view_box']
+    zones = "".join(_zone_element(zone, slot) for slot, zone in enumerate(layout['zones']))
+    labels = "".join(
+        f"""
+    <text x="{_number(zone['label']['x'])}" y="{_number(zone['label']['y'])}" font-family="Arial" """
+        f"""font-size="{_number(zone['label'].get('size', 16))}" fill="black">{_escape(zone['label']['text'])}</text>"""
+        for zone in layout['zones'] if zone['label']
+    )
+    style = MAP_HOVER_STYLE.replace("{", "{{").replace("}", "}}")
+    debug_field = "{%d}" % (2 * len(layout['zones']))
+    return f"""
+    <div style="width:100%; overflow-x:auto; max-width:100%; margin:0 auto; min-height:300px; border:1px solid #eee;">
+        <svg viewBox="{_number(x)} {_number(y)} {_number(width)} {_number(height)}" xmlns="http://www.w3.org/2000/svg">{style}
+    <rect x="{_number(x + 10)}" y="{_number(y + 10)}" width="{_number(width - 20)}" height="{_number(height - 20)}" fill="none" stroke="black" stroke-width="2"/>
+    {zones}
+    {labels}
+    {MAP_COMPASS}</svg>
+        <div style="display:none">
+            <p>Progress data: {debug_field}</p>
+        </div>
+    </div>
     """
-    
-    # Facility area
-    facility_progress = 0
-    for zone_name, progress in progress_data.items():
-        if "FACILITY" in zone_name.upper():
-            facility_progress = progress
-            break
-    
-    svg_content += f"""
-    <path id="facility-area" d="M 300,330 L 400,400 L 450,380 L 550,350 L 500,250 L 350,200 L 250,250 Z" 
-          fill="{get_color_for_progress(facility_progress)}" stroke="black" stroke-width="2" 
-          data-name="Facility Area" data-zone="facility">
-          <title>FACILITY AREA: {facility_progress:.1f}% complete</title>
-    </path>
+
+
+@lru_cache(maxsize=None)
+def zone_slots(name, layout_path=SITE_LAYOUT_PATH):
     """
-    
-    # Green area
-    green_progress = 0
-    for zone_name, progress in progress_data.items():
-        if "GREEN" in zone_name.upper():
-            green_progress = progress
-            break
-    
-    svg_content += f"""
-    <path id="green-area" d="M 350,200 L 500,250 L 600,200 L 700,220 L 750,170 L 550,100 L 350,120 Z" 
-          fill="{get_color_for_progress(green_progress)}" stroke="black" stroke-width="2" 
-          data-name="Green Area" data-zone="green">
-          <title>GREEN AREA: {green_progress:.1f}% complete</title>
-    </path>
+    Positions (in the layout's zone list) of the zones whose name or alias
+    appears as whole words in name; memoized per name.
+
+    Every run of up to max_alias_words words of name is one alias-index
+    lookup, so the cost does not grow with the number of zones. Only when
+    no alias matches as whole words does name fall back to substring
+    matching ('GREENHOUSE' -> GREEN AREA, 'PONDS' -> POND AREA), like the
+    original keyword maps; the fallback scans every alias once per name.
     """
-    
-    # Pond area
-    pond_progress = 0
-    for zone_name, progress in progress_data.items():
-        if "POND" in zone_name.upper():
-            pond_progress = progress
-            break
-    
-    svg_content += f"""
-    <rect id="pond-area" x="150" y="190" width="150" height="110" 
-          fill="{get_color_for_progress(pond_progress)}" stroke="black" stroke-width="2" 
-          data-name="Pond Area" data-zone="pond">
-          <title>POND AREA: {pond_progress:.1f}% complete</title>
-    </rect>
+    layout = load_site_layout(layout_path)
+    aliases = layout['aliases']
+    words = alias_tokens(name)
+    slots = set()
+    for start in range(len(words)):
+        for end in range(start + 1, min(len(words), start + layout['max_alias_words']) + 1):
+            slots.update(aliases.get(words[start:end], ()))
+    if not slots and words:
+        text = " ".join(words)
+        for alias, alias_slots in aliases.items():
+            if " ".join(alias) in text:
+                slots.update(alias_slots)
+    return tuple(sorted(slots))
+
+
+@lru_cache(maxsize=MAP_RENDER_CACHE_SIZE)
+def _render_map(progress, layout_path):
+    zones = load_site_layout(layout_path)['zones']
+    fields = []
+    for zone, value in zip(zones, progress):
+        fields += [progress_color(value), html.escape(f"{zone['name']}: {value:.1f}% complete")]
+    debug = html.escape(str({zone['name']: value for zone, value in zip(zones, progress)}))
+    return _map_template(layout_path).format(*fields, debug)
+
+
+# Function to generate HTML with colored zones based on progress data
+def generate_colored_map(progress_data, layout_path=SITE_LAYOUT_PATH):
     """
-    
-    # Private area
-    private_progress = 0
-    for zone_name, progress in progress_data.items():
-        if "PRIVATE" in zone_name.upper():
-            private_progress = progress
-            break
-    
-    svg_content += f"""
-    <rect id="private-area" x="700" y="300" width="150" height="100" rx="10" ry="10" 
-          fill="{get_color_for_progress(private_progress)}" stroke="black" stroke-width="2" 
-          data-name="Private Area" data-zone="private">
-          <title>PRIVATE AREA: {private_progress:.1f}% complete</title>
-    </rect>
+    Generate an HTML representation of the site map with zones colored by progress.
+
+    Each zone takes the first progress entry whose name contains the zone
+    name or one of its aliases (0 if none). The layout is compiled into a
+    template once, and renders are memoized by the resulting progress
+    vector, so repeated calls with the same progress are a cache lookup.
+
+    Args:
+        progress_data: Dictionary mapping zone names to progress percentages (0-100)
+        layout_path: Site layout file (see load_site_layout())
+
+    Returns:
+        HTML string with the SVG map and interactive elements
     """
-    
-    # Add labels
-    svg_content += """
-    <text x="150" y="440" font-family="Arial" font-size="20" fill="black">BLOCK-1C</text>
-    <text x="470" y="470" font-family="Arial" font-size="20" fill="black">BLOCK-2C</text>
-    <text x="370" y="310" font-family="Arial" font-size="16" fill="black">Facility Area</text>
-    <text x="500" y="170" font-family="Arial" font-size="16" fill="black">Green Area</text>
-    <text x="180" y="250" font-family="Arial" font-size="16" fill="black">Pond</text>
-    <text x="730" y="350" font-family="Arial" font-size="16" fill="black">Private</text>
+    progress = [None] * len(load_site_layout(layout_path)['zones'])
+    for name, value in progress_data.items():
+        for slot in zone_slots(name, layout_path):
+            if progress[slot] is None:
+                progress[slot] = value
+    return _render_map(tuple(0.0 if value is None else float(value) for value in progress), layout_path)
+
+# Script of the animated map: slider and play button swap the zone fills
+# and titles of the precomputed frames (colors as in progress_color())
+ANIMATED_MAP_SCRIPT = """
+(function () {
+    const data = JSON.parse(document.getElementById("zone-frames").textContent);
+    const shapes = data.ids.map(id => document.getElementById(id));
+    const slider = document.getElementById("zone-frame");
+    const label = document.getElementById("zone-date");
+    const play = document.getElementById("zone-play");
+    let timer = null;
+
+    function color(p) {
+        const mapped = p < 50 ? p * 2 : (p - 50) * 2;
+        const r = p < 50 ? 255 : Math.trunc(255 * (1 - mapped / 100));
+        const g = p < 50 ? Math.trunc(255 * (mapped / 100)) : 255;
+        return "rgba(" + r + ", " + g + ", 0, 0.7)";
+    }
+
+    function show(i) {
+        label.textContent = data.labels[i];
+        data.values[i].forEach((value, z) => {
+            const shape = shapes[z];
+            if (!shape) return;
+            shape.setAttribute("fill", color(value));
+            shape.querySelector("title").textContent = data.names[z] + ": " + value.toFixed(1) + "% complete";
+        });
+    }
+
+    function stop() {
+        clearInterval(timer);
+        timer = null;
+        play.textContent = "\u25B6 Play";
+    }
+
+    slider.addEventListener("input", () => show(Number(slider.value)));
+    play.addEventListener("click", () => {
+        if (timer) return stop();
+        if (Number(slider.value) >= data.labels.length - 1) slider.value = 0;
+        play.textContent = "\u23F8 Pause";
+        show(Number(slider.value));
+        timer = setInterval(() => {
+            const next = Number(slider.value) + 1;
+            if (next >= data.labels.length) return stop();
+            slider.value = next;
+            show(next);
+        }, data.frame_ms);
+    });
+    show(Number(slider.value));
+})();
+"""
+ANIMATION_FRAME_MS = 400
+
+
+def animated_map_html(timeline, labels=None, start=None, layout_path=SITE_LAYOUT_PATH):
     """
-    
-    # Add compass
-    svg_content += """
-    <circle cx="80" cy="80" r="30" fill="white" stroke="black" stroke-width="1"/>
-    <path d="M 80,50 L 80,110" stroke="black" stroke-width="1"/>
-    <path d="M 50,80 L 110,80" stroke="black" stroke-width="1"/>
-    <text x="80" y="60" font-family="Arial" font-size="14" text-anchor="middle" fill="black">N</text>
-    <text x="80" y="105" font-family="Arial" font-size="14" text-anchor="middle" fill="black">S</text>
-    <text x="55" y="85" font-family="Arial" font-size="14" text-anchor="middle" fill="black">W</text>
-    <text x="105" y="85" font-family="Arial" font-size="14" text-anchor="middle" fill="black">E</text>
+    Site map with a slider (and play button) over precomputed progress frames.
+
+    The map is rendered once for the start frame; the other frames travel
+    as a compact JSON array of zone values, and the slider only swaps fills
+    and titles in the browser, so scrubbing never reruns the app.
+
+    Args:
+        timeline: Dictionary with 'periods' and 'progress' ((period x zone)
+            array in layout zone order), e.g. from zone_timeline
+        labels: Frame labels (defaults to the periods as dates)
+        start: Frame shown first (defaults to the last one)
+        layout_path: Site layout file
+
+    Returns:
+        HTML string, or None when the timeline has no frames
     """
-    
-    # Complete SVG
-    svg_complete = svg_open + svg_content + svg_close
-    
-    # Add debug info for troubleshooting
-    debug_info = f"""
-    <div style="display:none">
-        <p>Progress data: {progress_data}</p>
+    progress = np.asarray(timeline['progress'], dtype=float)
+    if not len(progress):
+        return None
+    if labels is None:
+        labels = [pd.Timestamp(period).strftime('%d %b %Y') for period in timeline['periods']]
+    start = len(progress) - 1 if start is None else start
+
+    zones = load_site_layout(layout_path)['zones']
+    payload = json.dumps({
+        'ids': [zone['id'] for zone in zones],
+        'names': [zone['name'] for zone in zones],
+        'labels': list(labels),
+        'values': np.round(progress, 1).tolist(),
+        'frame_ms': ANIMATION_FRAME_MS,
+    }, separators=(',', ':')).replace("</", "<\\/")
+
+    return f"""
+    {_render_map(tuple(progress[start]), layout_path)}
+    <div style="display:flex; align-items:center; gap:10px; margin-top:8px; font-family:Arial; font-size:13px;">
+        <button id="zone-play" type="button">&#9654; Play</button>
+        <input id="zone-frame" type="range" min="0" max="{len(progress) - 1}" value="{start}" style="flex:1;">
+        <span id="zone-date" style="min-width:90px;"></span>
     </div>
+    <script type="application/json" id="zone-frames">{payload}</script>
+    <script>{ANIMATED_MAP_SCRIPT}</script>
     """
-    
-    # Wrap in a div with styling for better mobile display and add fallback content
-    html = f"""
-    <div style="width:100%; overflow-x:auto; max-width:100%; margin:0 auto; min-height:300px; border:1px solid #eee;">
-        {svg_complete}
-        {debug_info}
-    </div>
+
+
+def weighted_rollup(df, keys, value='% COMPLETE', weight='BOBOT'):
     """
-    
-    return html
+    Weighted average of a column per group.
+
+    Each group gets sum(weight x value) / sum(weight), or the plain mean of
+    value when its total weight is not positive or df has no weight
+    column. Missing values are skipped like pandas sums and means skip
+    them. Sums are taken with one grouped aggregation, not per group.
+
+    Args:
+        df: DataFrame with the key, value and weight columns
+        keys: Group column name(s), or arrays aligned with df (as in DataFrame.groupby)
+        value: Column to average
+        weight: Weight column
+
+    Returns:
+        Series indexed by the group keys (a MultiIndex for several keys)
+    """
+    if weight not in df.columns:
+        return df.groupby(keys)[value].mean()
+
+    sums = df.assign(_WEIGHTED=df[value] * df[weight]).groupby(keys).agg(
+        WEIGHTED=('_WEIGHTED', 'sum'),
+        WEIGHT=(weight, 'sum'),
+        MEAN=(value, 'mean'),
+    )
+    weighted = sums['WEIGHT'] > 0
+    return (sums['WEIGHTED'] / sums['WEIGHT'].where(weighted)).where(weighted, sums['MEAN']).rename(value)
 
 # Function to extract zone progress from project data
 def extract_zone_progress(df):
@@ -263,81 +416,82 @@ def extract_zone_progress(df):
         # If no area column exists, try to map using task descriptions
         return extract_zone_progress_from_tasks(df)
     
-    # Group by area and calculate weighted average progress
-    if 'BOBOT' in df.columns:
-        # Use weighted average if weights are available
-        grouped = df.groupby('AREA PEKERJAAN').apply(
-            lambda x: (x['% COMPLETE'] * x['BOBOT']).sum() / x['BOBOT'].sum() 
-            if x['BOBOT'].sum() > 0 else x['% COMPLETE'].mean()
-        )
-    else:
-        # Otherwise use simple average
-        grouped = df.groupby('AREA PEKERJAAN')['% COMPLETE'].mean()
-    
-    return grouped.to_dict()
+    # BOBOT-weighted average progress per area (simple average without BOBOT)
+    return weighted_rollup(df, 'AREA PEKERJAAN').to_dict()
+
+def keyword_matcher(zone_keywords=ZONE_TASK_KEYWORDS):
+    """
+    Compiled zone matcher for a keyword table (compiled once per table).
+
+    All keywords are compiled into one regex alternation, searched with a
+    lookahead so overlapping keywords are all found in a single pass. The
+    matcher returns the first zone (in table order) with a keyword in the
+    lower-cased text, or None; results are memoized per text.
+
+    Args:
+        zone_keywords: Dictionary of zone name -> list of keywords
+
+    Returns:
+        Function text -> zone name or None
+    """
+    return _keyword_matcher(tuple((zone, tuple(keywords)) for zone, keywords in zone_keywords.items()))
+
+
+@lru_cache(maxsize=16)
+def _keyword_matcher(table):
+    zones = [zone for zone, _ in table]
+    rank = {}
+    for position, (_, keywords) in enumerate(table):
+        for keyword in keywords:
+            rank.setdefault(keyword.lower(), position)
+    # Alternatives in zone order: where keywords start at the same position,
+    # the one of the earliest zone is reported
+    alternatives = sorted(rank, key=rank.get)
+    pattern = re.compile("(?=(" + "|".join(map(re.escape, alternatives)) + "))") if alternatives else None
+
+    @lru_cache(maxsize=KEYWORD_MATCH_CACHE_SIZE)
+    def match(text):
+        if pattern is None:
+            return None
+        found = [rank[keyword] for keyword in pattern.findall(text.lower())]
+        return zones[min(found)] if found else None
 
-def extract_zone_progress_from_tasks(df):
+    return match
+
+
+def extract_zone_progress_from_tasks(df, zone_keywords=ZONE_TASK_KEYWORDS):
     """
     Attempt to extract zone information from task descriptions when no area column exists.
-    
+
+    Each distinct JENIS PEKERJAAN is matched once against the compiled
+    keyword table (see keyword_matcher()); the zones are mapped back to
+    the rows by their factorized codes, without copying the frame.
+
     Args:
         df: DataFrame containing project data with 'JENIS PEKERJAAN' and '% COMPLETE' columns
-        
+        zone_keywords: Dictionary of zone name -> list of keywords
+
     Returns:
         Dictionary mapping zone names to average progress percentages
     """
-    import pandas as pd
-    import re
-    
-    # Keywords to look for in task descriptions
-    zone_keywords = {
-        'BLOCK-1C': ['block 1c', 'block-1c', 'block1c', 'blok 1c'],
-        'BLOCK-2C': ['block 2c', 'block-2c', 'block2c', 'blok 2c'],
-        'FACILITY AREA': ['facility', 'fasilitas', 'kantor', 'office'],
-        'GREEN AREA': ['green', 'taman', 'garden', 'landscape'],
-        'POND AREA': ['pond', 'kolam', 'water', 'air'],
-        'PRIVATE AREA': ['private', 'pribadi', 'housing', 'perumahan']
-    }
-    
-    # Create a new column for the mapped zone
-    df = df.copy()
-    df['MAPPED_ZONE'] = 'UNKNOWN'
-    
-    # Function to determine zone from task description
-    def map_to_zone(task_desc):
-        if not isinstance(task_desc, str):
-            return 'UNKNOWN'
-            
-        task_lower = task_desc.lower()
-        for zone, keywords in zone_keywords.items():
-            if any(keyword in task_lower for keyword in keywords):
-                return zone
-        return 'UNKNOWN'
-    
-    # Apply the mapping function
-    df['MAPPED_ZONE'] = df['JENIS PEKERJAAN'].apply(map_to_zone)
-    
-    # Calculate progress by mapped zone
-    if 'BOBOT' in df.columns:
-        # Use weighted average if weights are available
-        grouped = df.groupby('MAPPED_ZONE').apply(
-            lambda x: (x['% COMPLETE'] * x['BOBOT']).sum() / x['BOBOT'].sum() 
-            if x['BOBOT'].sum() > 0 else x['% COMPLETE'].mean()
-        )
-    else:
-        # Otherwise use simple average
-        grouped = df.groupby('MAPPED_ZONE')['% COMPLETE'].mean()
-    
-    # Remove UNKNOWN zone if present
-    if 'UNKNOWN' in grouped:
-        grouped = grouped.drop('UNKNOWN')
-        
-    # Assign some default values if no data available for some zones
-    result = grouped.to_dict()
-    
+    match = keyword_matcher(zone_keywords)
+
+    # Zone of every distinct description; the extra last entry serves the
+    # missing descriptions (code -1)
+    codes, descriptions = pd.factorize(df['JENIS PEKERJAAN'])
+    zones = np.array(
+        [match(desc) if isinstance(desc, str) else None for desc in descriptions] + [None],
+        dtype=object
+    )
+    mapped_zone = pd.Series(zones[codes], index=df.index, name='MAPPED_ZONE')
+
+    # BOBOT-weighted average progress per mapped zone (simple average without
+    # BOBOT); tasks without a zone are left out of the grouping
+    result = weighted_rollup(df, mapped_zone).to_dict()
+
     # Ensure all zones have some value
-    for zone in ZONE_TO_ID_MAP.keys():
+    for zone in zone_names():
         if zone not in result:
             result[zone] = 0
-            
-    return result
\ No newline at end of file
+
+    return result
@@ -1,7 +1,7 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from datetime import datetime, timedelta, date
+from datetime import datetime, date
 import unicodedata
 import re
 import base64
@@ -12,13 +12,27 @@ import plotly.graph_objects as go
 import hashlib
 from datetime import datetime
 import requests
+import sqlite3
 
 
 import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from shared import get_file
+from shared import get_file, read_github_file, file_version, cached_figure
+import project_aggregates
+import gantt
+import scurve
+import progress_history
+import evm
+import risk
+import priority
+import search_index
+import deadlines
+import map_zones
+import zone_timeline
+import bubble_chart
+import streamlit.components.v1 as components
 
 
 
@@ -31,6 +45,40 @@ PROJECT_MAP = {
 
 REVERSE_PROJECT_MAP = {v: k for k, v in PROJECT_MAP.items()}
 
+# Keywords linking each project to its rows in the contract sheet and payment ledger
+EVM_CONTRACT_KEYWORDS = {
+    "PROJECT 1 A": ["KSO SPLIT LDS-MAA"],
+    "PROJECT 1 B": ["KSO SPLIT LDS-MAA"],
+    "PROJECT PARAHITA": ["PARAHITA"],
+}
+# Share of the matched contracts per project: 1 A and 1 B are one joint
+# contract ("KSO SPLIT LDS-MAA") in the ledgers, with no recorded split,
+# so each takes half of its value and payments (other projects: 1)
+EVM_CONTRACT_SHARES = {
+    "PROJECT 1 A": 0.5,
+    "PROJECT 1 B": 0.5,
+}
+# Cost workbooks for the EVM metrics (read-only here)
+CONTRACT_FILE_PATH = "quicksxope/dashboardapp-proto/contents/data/data_kontrak_new.xlsx"
+PAYMENT_TERMS_FILE_PATH = "quicksxope/dashboardapp-proto/contents/data/Long_Format_Payment_Terms.xlsx"
+
+# Task Details tab: page sizes and table columns; columns indexed for the task search box
+TASK_PAGE_SIZES = [10, 25, 50, 100]
+TASK_PAGE_COLUMNS = ['KONTRAK_DISPLAY', 'JENIS PEKERJAAN', 'AREA PEKERJAAN', 'SUB AREA PEKERJAAN', 'STATUS', 'START', 'PLAN END', '% COMPLETE']
+TASK_SEARCH_COLUMNS = ['KONTRAK_DISPLAY', 'JENIS PEKERJAAN', 'AREA PEKERJAAN', 'SUB AREA PEKERJAAN', 'STATUS']
+GANTT_CACHE_ENTRIES = 32  # Gantt roll-ups / row orders kept per (filter, search match, level)
+
+# Zone timeline map: source label -> S-curve ('Planned' / 'Actual') or recorded snapshots ('History')
+ZONE_TIMELINE_SOURCES = {
+    "Actual (schedule)": "Actual",
+    "Planned (schedule)": "Planned",
+    "Recorded snapshots": "History",
+}
+ZONE_TIMELINE_HEIGHT = 720
+
+# Columns offered by the sidebar "Filter Column" selectbox
+FILTER_COLUMNS = ['JENIS PEKERJAAN', 'AREA PEKERJAAN', 'SUB AREA PEKERJAAN']
+
 
 def clean_text(x):
     if pd.isna(x):
@@ -203,6 +251,145 @@ def load_data(file):
     
     return df
 
+@st.cache_data
+def load_timeline(_df, data_version, timeline_columns):
+    """Timeline frame of all projects with Tooltip and Task labels, built once per data version"""
+    # Only include columns that exist in the data
+    available_columns = [col for col in timeline_columns if col in _df.columns]
+    timeline_df = _df[available_columns].dropna(subset=['START', 'PLAN END'])
+
+    # Convert dates to datetime format
+    timeline_df['START'] = pd.to_datetime(timeline_df['START'])
+    timeline_df['PLAN END'] = pd.to_datetime(timeline_df['PLAN END'])
+
+    # Format and ensure consistent data types
+    if '% COMPLETE' in timeline_df.columns:
+        timeline_df['% COMPLETE'] = pd.to_numeric(timeline_df['% COMPLETE'], errors='coerce').fillna(0)
+        timeline_df['% COMPLETE'] = timeline_df['% COMPLETE'].where(timeline_df['% COMPLETE'] > 1, timeline_df['% COMPLETE'] * 100)
+
+    # Add task IDs if not present
+    if 'TASK_ID' not in timeline_df.columns:
+        timeline_df['TASK_ID'] = [f"task_{i}" for i in range(len(timeline_df))]
+
+    # Add milestones if not present
+    if 'IS_MILESTONE' not in timeline_df.columns:
+        # Calculate duration in days
+        timeline_df['DURATION'] = (timeline_df['PLAN END'] - timeline_df['START']).dt.days
+        # Consider tasks with 0-1 day duration as milestones
+        timeline_df['IS_MILESTONE'] = timeline_df['DURATION'] <= 1
+
+    # Format tooltips with enhanced information
+    if 'AREA PEKERJAAN' not in timeline_df.columns:
+        timeline_df['AREA PEKERJAAN'] = ""
+    if 'SUB AREA PEKERJAAN' not in timeline_df.columns:
+        timeline_df['SUB AREA PEKERJAAN'] = ""
+
+    timeline_df['Tooltip'] = gantt.task_tooltips(timeline_df)
+
+    # Task labels, indented by TASK_LEVEL for hierarchy visualization
+    timeline_df['Task'] = gantt.task_labels(timeline_df)
+    if 'TASK_LEVEL' in timeline_df.columns:
+        # Sort by level and task order for hierarchical display
+        timeline_df = timeline_df.sort_values(['KONTRAK_CODE', 'TASK_LEVEL', 'START'])
+    return timeline_df
+
+@st.cache_data
+def load_project_aggregates(_df, data_version, as_of):
+    """Per-project aggregate table for the KPI cards, built once per data version and day"""
+    return project_aggregates.build_project_aggregates(_df, FILTER_COLUMNS, as_of)
+
+@st.cache_data
+def load_grouped_scurve(_df, data_version, as_of):
+    """Daily S-curve sums for every project and area, computed once per data version and day"""
+    return scurve.grouped_daily_sums(_df, as_of)
+
+@st.cache_data
+def load_scurve(_df, data_version, as_of, group_column, groups, granularity):
+    """S-curve of a group selection (None = all) at the selected granularity, sliced from the grouped sums"""
+    grouped = load_grouped_scurve(_df, data_version, as_of)
+    return scurve.resample_curve(scurve.group_curve(grouped, group_column, groups), granularity)
+
+@st.cache_data
+def load_earned_value(_df, _contract_file, _payment_file, data_version, contract_version, payment_version, as_of, granularity):
+    """Earned-value metrics per project and period, from the cached S-curve sums and the cost files, and the EVM_CONTRACT_KEYWORDS that matched nothing"""
+    contract_df = pd.read_excel(_contract_file)
+    payment_df = pd.read_excel(_payment_file)
+    budgets = evm.project_budgets(contract_df, payment_df, EVM_CONTRACT_KEYWORDS, EVM_CONTRACT_SHARES)
+    payments = evm.paid_terms(payment_df, EVM_CONTRACT_KEYWORDS, EVM_CONTRACT_SHARES)
+    grouped = load_grouped_scurve(_df, data_version, as_of)
+    unmatched = evm.unmatched_keywords(contract_df, payment_df, EVM_CONTRACT_KEYWORDS)
+    return evm.earned_value(grouped, budgets, payments, granularity, as_of), unmatched
+
+@st.cache_data
+def load_schedule_risk(_df, data_version, as_of, iterations, duration_range):
+    """Monte Carlo completion-date percentiles and samples per project, and the PREDECESSORS links dropped to break cycles, once per data version and parameter set"""
+    network = risk.task_network(_df, as_of)
+    finish = risk.simulate(network, iterations, duration_range)
+    return risk.completion_summary(network, finish), risk.completion_dates(network, finish), network['cycle_links']
+
+@st.cache_data
+def load_zone_timeline_map(_df, data_version, project, source, granularity, as_of):
+    """Site map animated over zone progress per period; every frame is computed once per data version and option set"""
+    if source == 'History':
+        try:
+            history = progress_history.area_history(None if project == 'All Projects' else project)
+        except sqlite3.Error:
+            return None
+        timeline = zone_timeline.history_progress(history)
+    else:
+        grouped = scurve.grouped_daily_sums(_df, as_of, [zone_timeline.AREA_COLUMN])
+        current = map_zones.weighted_rollup(_df, zone_timeline.AREA_COLUMN) if zone_timeline.AREA_COLUMN in _df.columns else None
+        timeline = zone_timeline.schedule_progress(grouped, granularity, source, today=as_of, current=current)
+
+    # Open on the last period on or before today
+    passed = np.searchsorted(timeline['periods'], np.datetime64(as_of, 'D'), side='right')
+    return map_zones.animated_map_html(timeline, start=max(0, passed - 1))
+
+@st.cache_data
+def load_bubble_chart(_sub_area_df, data_version, project, sub_area_column, colors):
+    """Packed sub-area bubble chart component, laid out and rendered once per data version and project"""
+    layout = bubble_chart.bubble_layout(_sub_area_df)
+    if layout.empty:
+        return None
+    return bubble_chart.chart_html(layout, colors)
+
+@st.cache_data
+def load_task_deadlines(_df, data_version):
+    """Tasks sorted by PLAN END, partitioned into 'open' and 'done' (SELESAI), once per data version"""
+    done = _df['STATUS'].str.upper().eq('SELESAI')
+    return deadlines.build_index(_df['PLAN END'], np.where(done, 'done', 'open'))
+
+def record_progress_history(df, data_version):
+    """Append this workbook version to the local progress history (a no-op for versions already recorded)"""
+    try:
+        return progress_history.record_snapshot(df, data_version)
+    except sqlite3.Error:
+        # Read-only or locked storage: the dashboard works without history
+        return False
+
+@st.cache_data
+def load_progress_history(data_version, kontrak_code):
+    """Recorded actual progress per snapshot date (None = all projects)"""
+    try:
+        return progress_history.actual_history(kontrak_code)
+    except sqlite3.Error:
+        return pd.DataFrame({'Date': pd.to_datetime([]), 'Actual': []})
+
+@st.cache_data
+def load_search_index(_timeline_df, data_version):
+    """Inverted index of the task search columns, built once per data version"""
+    return search_index.build_index(_timeline_df, TASK_SEARCH_COLUMNS)
+
+@st.cache_data(max_entries=GANTT_CACHE_ENTRIES)
+def load_gantt_rollups(_timeline_df, data_version, project_filter, search_match):
+    """Gantt roll-ups (Project / Area / Sub Area) and their task rows, built once per data version, project filter and matched task set"""
+    return gantt.build_rollups(_timeline_df), gantt.group_rows(_timeline_df)
+
+@st.cache_data(max_entries=GANTT_CACHE_ENTRIES)
+def load_gantt_row_order(_gantt_df, data_version, project_filter, search_match, detail_level, drill_group):
+    """Sorted Gantt row order of the rows shown, computed once per data version, filter, search and detail level"""
+    return gantt.sorted_row_index(_gantt_df)
+
 def calculate_planned_progress(row, today):
     """Calculate what the planned progress should be based on dates"""
     try:
@@ -228,72 +415,59 @@ def calculate_planned_progress(row, today):
     except:
         return 0
 
-@st.cache_data
-def calculate_priority_score(row):
-    """Calculate priority score based on deadline, weight, and status"""
-    today = datetime.today()
-    
-    try:
-        deadline = pd.to_datetime(row['PLAN END'], errors='coerce')
-        if pd.isna(deadline):
-            days_left = 100  # Default high value for missing deadlines
-        else:
-            days_left = max(1, (deadline - today).days)  # At least 1 day to avoid division by zero
-            
-        # Overdue tasks get higher priority
-        if days_left < 0:
-            deadline_factor = 100
-        else:
-            deadline_factor = min(100, 100 / days_left)
-            
-        # Weight factor - higher weight means higher priority
-        weight_factor = row['BOBOT'] * 10
-        
-        # Status factor - different statuses have different priorities
-        status_mapping = {
-            'TUNDA': 80,
-            'DALAM PROSES': 60,
-            'BELUM MULAI': 40,
-            'SELESAI': 0
-        }
-        status_factor = status_mapping.get(row['STATUS'], 30)
-        
-        # Incomplete factor - tasks with lower completion percentage get higher priority
-        incomplete_factor = 100 - row['% COMPLETE']
-        
-        # Calculate final score (0-100 range)
-        score = (deadline_factor * 0.4) + (weight_factor * 0.3) + (status_factor * 0.2) + (incomplete_factor * 0.1)
-        return min(100, score)
-    
-    except Exception:
-        return 50  # Default for any errors
-        
-@st.cache_data
-def create_enhanced_tooltip(row):
-    project_name = row.get('KONTRAK_DISPLAY', row.get('KONTRAK_CODE', ''))
-
-    tooltip = (
-        f"<b>{row['JENIS PEKERJAAN']}</b>"
-        f"<br>Project: {project_name}"
-        f"<br>Status: {row['STATUS']}"
-    )
-
-    if 'AREA PEKERJAAN' in row and pd.notna(row['AREA PEKERJAAN']):
-        tooltip += f"<br>Area: {row['AREA PEKERJAAN']}"
-    if 'SUB AREA PEKERJAAN' in row and pd.notna(row['SUB AREA PEKERJAAN']):
-        tooltip += f"<br>Sub Area: {row['SUB AREA PEKERJAAN']}"
-    if '% COMPLETE' in row and pd.notna(row['% COMPLETE']):
-        tooltip += f"<br>Progress: {row['% COMPLETE']:.1f}%"
-
-    if 'START' in row and 'PLAN END' in row:
-        tooltip += f"<br>Duration: {row['START'].date()} → {row['PLAN END'].date()}"
-
-    if 'IS_MILESTONE' in row and row['IS_MILESTONE']:
-        tooltip += "<br><b>MILESTONE</b>"
+def apply_sidebar_filters(frame, kontrak, filter_col, filter_val):
+    """Rows of the selected KONTRAK and filter value ('All' keeps every row)"""
+    if kontrak != 'All':
+        frame = frame[frame['KONTRAK_CODE'] == kontrak]
+    if filter_val != 'All':
+        frame = frame[frame[filter_col] == filter_val]
+    return frame
 
-    return tooltip
+def render_task_detail(row, task_lookup, today):
+    """Full detail of one task: fields, progress, dependency and deadline status"""
+    col1, col2 = st.columns(2)
 
+    with col1:
+        st.markdown(f"**Project:** {row['KONTRAK_DISPLAY']}")
+        st.markdown(f"**Task:** {row['JENIS PEKERJAAN']}")
+        if 'AREA PEKERJAAN' in row and not pd.isna(row['AREA PEKERJAAN']):
+            st.markdown(f"**Area Pekerjaan:** {row['AREA PEKERJAAN']}")
+        if 'SUB AREA PEKERJAAN' in row and not pd.isna(row['SUB AREA PEKERJAAN']):
+            st.markdown(f"**Sub Area Pekerjaan:** {row['SUB AREA PEKERJAAN']}")
+        st.markdown(f"**Status:** {row['STATUS']}")
+        if 'RESOURCE' in row and not pd.isna(row['RESOURCE']):
+            st.markdown(f"**Resource:** {row['RESOURCE']}")
+        if 'BOBOT' in row and not pd.isna(row['BOBOT']):
+            st.markdown(f"**Weight:** {row['BOBOT']}")
 
+    with col2:
+        st.markdown(f"**Start Date:** {row['START'].strftime('%Y-%m-%d')}")
+        st.markdown(f"**End Date:** {row['PLAN END'].strftime('%Y-%m-%d')}")
+        if '% COMPLETE' in row and not pd.isna(row['% COMPLETE']):
+            st.markdown(f"**Progress:** {row['% COMPLETE']:.1f}%")
+            st.progress(int(row['% COMPLETE']))
+
+        if 'IS_MILESTONE' in row and row['IS_MILESTONE']:
+            st.markdown("**Type:** 🎯 Milestone")
+
+    # Show dependencies if available
+    if 'PREDECESSORS' in row and row['PREDECESSORS']:
+        if row['PREDECESSORS'] in task_lookup.index:
+            pred = task_lookup.loc[row['PREDECESSORS']]
+            st.markdown(f"**Depends on:** {pred['JENIS PEKERJAAN']} (must finish before this task can start)")
+
+            # Calculate critical dependency status
+            if pd.to_datetime(pred['PLAN END']) > pd.to_datetime(row['START']):
+                st.warning("⚠️ Dependency conflict: Predecessor end date is after this task's start date!")
+
+    # Show days left until deadline
+    days_left = (row['PLAN END'].date() - today.date()).days
+    if days_left < 0:
+        st.error(f"⚠️ **Overdue by {abs(days_left)} days**")
+    elif days_left == 0:
+        st.warning("⏰ **Due today!**")
+    else:
+        st.info(f"⏳ **Days remaining: {days_left}**")
 
 # Critical path functions removed - not being used anymore
         
@@ -536,28 +710,34 @@ def main():
 )
 
     original_df = load_data(project_file)
+    data_version = file_version(project_file)
     df = original_df.copy()
 
+    # Snapshot per-task progress of every new workbook version
+    record_progress_history(original_df, data_version)
+
+    # Aggregates per KONTRAK_CODE x filter value (cached per data version)
+    aggregates = load_project_aggregates(original_df, data_version, date.today())
+
     # Example continuation: safe to access original_df now
-    kontrak_opts = ['All'] + sorted(original_df['KONTRAK_CODE'].dropna().unique())
+    kontrak_opts = ['All'] + sorted(aggregates['KONTRAK_CODE'].dropna().unique())
     selected_kontrak = st.sidebar.selectbox("Filter by KONTRAK", kontrak_opts)
 
-    filter_columns = ['JENIS PEKERJAAN', 'AREA PEKERJAAN', 'SUB AREA PEKERJAAN']
+    filter_columns = [col for col in FILTER_COLUMNS if col in original_df.columns]
     selected_filter_col = st.sidebar.selectbox("Filter Column", filter_columns)
-    filter_values = ['All'] + sorted(original_df[selected_filter_col].dropna().unique())
+    filter_values = ['All'] + project_aggregates.filter_values(aggregates, selected_filter_col)
     selected_filter_val = st.sidebar.selectbox("Select Value", filter_values)
 
-    if selected_kontrak != 'All':
-        df = df[df['KONTRAK_CODE'] == selected_kontrak]
+    df = apply_sidebar_filters(df, selected_kontrak, selected_filter_col, selected_filter_val)
 
-    if selected_filter_val != 'All':
-        df = df[df[selected_filter_col] == selected_filter_val]
-
-    total_tasks = len(df)
-    completed = (df['STATUS'] == 'SELESAI').sum()
-    upcoming = (pd.to_datetime(df['PLAN END'], errors='coerce') - datetime.today()).dt.days.between(0, 7).sum()
-    ongoing = (df['STATUS'] == 'DALAM PROSES').sum()
-    pending = df[df['STATUS'].isin(['TUNDA', 'BELUM MULAI'])].shape[0]
+    selection = project_aggregates.lookup_aggregates(
+        aggregates, selected_filter_col, selected_kontrak, selected_filter_val
+    )
+    total_tasks = selection['TASKS']
+    completed = selection['COMPLETED']
+    upcoming = selection['DUE_7D']
+    ongoing = selection['ONGOING']
+    pending = selection['PENDING']
 
     # Add some space at the top
     st.markdown("<div style='height: 10px'></div>", unsafe_allow_html=True)
@@ -599,17 +779,15 @@ def main():
         ]
     
         for project_code, display_name, col in projects:
-            proj_df = original_df[
-                original_df['KONTRAK_CODE'] == project_code
-            ]
+            proj_agg = project_aggregates.lookup_aggregates(
+                aggregates, selected_filter_col, kontrak=project_code
+            )
     
             with col:
                 st.markdown(f"**📌 {display_name}**")
     
-                if not proj_df.empty:
-                    weighted = (proj_df['BOBOT'] * proj_df['% COMPLETE']).sum()
-                    total_bobot = proj_df['BOBOT'].sum()
-                    progress = (weighted / total_bobot) if total_bobot else 0
+                if proj_agg['TASKS']:
+                    progress = proj_agg['WEIGHTED_PROGRESS']
     
                     st.progress(int(progress))
                     st.caption(f"Progress: **{progress:.2f}%**")
@@ -695,6 +873,15 @@ def main():
        
 
         
+        # Task search (token prefixes, typeahead on the last word) above the
+        # tabs; the matches narrow the Gantt chart and the Task Details table
+        task_query = st.text_input(
+            "🔎 Search tasks",
+            placeholder="Task, area, sub area, project or status",
+            key="task_search"
+        ).strip()
+        search_notes = st.container()
+
         # Initialize view tabs for timeline features
         timeline_tabs = st.tabs(["🗓️ Gantt Chart", "📊 S-Curve", "📝 Task Details"])
     
@@ -722,10 +909,27 @@ def main():
 
 
         
-        # Only include columns that exist in the data
-        available_columns = [col for col in timeline_columns if col in original_df.columns]
-        timeline_df = original_df[available_columns].dropna(subset=['START', 'PLAN END'])
-        
+        # Prepared timeline of all projects (labels and tooltips built once per data version);
+        # the S-curve sums are sliced per project from it
+        timeline_df = load_timeline(original_df, data_version, tuple(timeline_columns))
+        schedule_df = timeline_df
+
+        # Apply the task search; derived caches are keyed by the matched
+        # rows (search_match), so queries with the same matches share entries
+        search_match = None
+        if task_query:
+            task_index = load_search_index(schedule_df, data_version)
+            suggestions = search_index.suggest(task_index, task_query)
+            if suggestions:
+                search_notes.caption("Suggestions: " + ", ".join(suggestions))
+            rows = search_index.search_rows(task_index, task_query)
+            if len(rows):
+                timeline_df = timeline_df.iloc[rows]
+                search_match = hashlib.md5(rows.astype(np.int64).tobytes()).hexdigest()
+                search_notes.caption(f"{len(rows)} of {len(schedule_df)} tasks match the search.")
+            else:
+                search_notes.warning(f"No tasks match \"{task_query}\"; showing all tasks.")
+
         # Filter based on session state active filter
         if st.session_state.active_project_filter == 'p1a':
             timeline_df = timeline_df[
@@ -757,256 +961,107 @@ def main():
             view_start, view_end = None, None
             st.warning("No valid dates found in the dataset")
             
-        # Convert dates to datetime format
-        timeline_df['START'] = pd.to_datetime(timeline_df['START'])
-        timeline_df['PLAN END'] = pd.to_datetime(timeline_df['PLAN END'])
-        
-        # Format and ensure consistent data types
-        if '% COMPLETE' in timeline_df.columns:
-            timeline_df['% COMPLETE'] = pd.to_numeric(timeline_df['% COMPLETE'], errors='coerce').fillna(0)
-            timeline_df['% COMPLETE'] = timeline_df['% COMPLETE'].apply(lambda x: x * 100 if x <= 1 else x)
-        
-        # Add task IDs if not present
-        if 'TASK_ID' not in timeline_df.columns:
-            timeline_df['TASK_ID'] = [f"task_{i}" for i in range(len(timeline_df))]
-            
-        # Add milestones if not present
-        if 'IS_MILESTONE' not in timeline_df.columns:
-            # Calculate duration in days
-            timeline_df['DURATION'] = (timeline_df['PLAN END'] - timeline_df['START']).dt.days
-            # Consider tasks with 0-1 day duration as milestones
-            timeline_df['IS_MILESTONE'] = timeline_df['DURATION'] <= 1
-        
-        # Format tooltips with enhanced information
-        if 'AREA PEKERJAAN' not in timeline_df.columns:
-            timeline_df['AREA PEKERJAAN'] = ""
-        if 'SUB AREA PEKERJAAN' not in timeline_df.columns:
-            timeline_df['SUB AREA PEKERJAAN'] = ""
 
-        timeline_df['Tooltip'] = timeline_df.apply(create_enhanced_tooltip, axis=1)
-        
-        # Hierarchical view setup
-        if 'TASK_LEVEL' in timeline_df.columns:
-            # Create indented task names for hierarchy visualization
-            timeline_df['Task'] = timeline_df.apply(
-                lambda row: ("  " * (max(0, row['TASK_LEVEL'] - 1)))
-                + f"{row['KONTRAK_DISPLAY']} - {row['JENIS PEKERJAAN']}",
-                axis=1
-            )
-
-            # Sort by level and task order for hierarchical display
-            timeline_df = timeline_df.sort_values(['KONTRAK_CODE', 'TASK_LEVEL', 'START'])
-        else:
-            # Simple task format without hierarchy
-            timeline_df['Task'] = timeline_df.apply(
-                lambda row: f"{row['KONTRAK_DISPLAY']} - {row['JENIS PEKERJAAN']}",
-                axis=1
-            )
-
-        
         # ===== GANTT CHART TAB =====
         with timeline_tabs[0]:
             st.markdown("### 🔄 Enhanced Timeline View")
             # No show_critical_path toggle needed anymore
             
-            # Create dictionary to map tasks by ID (for dependencies)
-            task_dict = {}
-            for _, row in timeline_df.iterrows():
-                task_dict[row['TASK_ID']] = row
+            # Index tasks by ID (for dependencies)
+            task_lookup = timeline_df.drop_duplicates('TASK_ID').set_index('TASK_ID', drop=False)
 
-        
+            opt_col1, opt_col2 = st.columns(2)
+            with opt_col1:
+                show_dependencies = st.checkbox(
+                    "Show dependency arrows", value=True, key="gantt_show_dependencies"
+                )
+            with opt_col2:
+                windowed = st.checkbox(
+                    "Windowed view (page through rows)",
+                    value=len(timeline_df) > gantt.WINDOW_THRESHOLD,
+                    key="gantt_windowed"
+                )
 
-            # Create Gantt chart with custom hover info
-            fig = px.timeline(
-                timeline_df, 
-                x_start='START', 
-                x_end='PLAN END', 
-                y='Task', 
-                color='STATUS', 
-                color_discrete_map=color_map,
-                hover_name='Tooltip',
-                custom_data=['% COMPLETE', 'TASK_ID'] if '% COMPLETE' in timeline_df.columns else None
-            )
-            fig.update_yaxes(
-                autorange="reversed",
-                categoryorder="array",
-                categoryarray=timeline_df['Task'].tolist()
-            )
-            
-            
-            # Customize task bar appearance (diamond shapes for milestones)
-            for i, row in timeline_df.iterrows():
-                # Check if it's a milestone
-                if 'IS_MILESTONE' in timeline_df.columns and row['IS_MILESTONE']:
-                    # Add diamond marker for milestone
-                    midpoint = row['START'] + (row['PLAN END'] - row['START'])/2
-                    fig.add_trace(go.Scatter(
-                        x=[midpoint],
-                        y=[row['Task']],
-                        mode='markers',
-                        marker=dict(
-                            symbol='diamond',
-                            size=16,
-                            color=color_map.get(row['STATUS'], 'blue'),
-                            line=dict(color='black', width=1)
-                        ),
-                        name=f"Milestone: {row['JENIS PEKERJAAN']}",
-                        showlegend=False,
-                        hoverinfo='text',
-                        hovertext=f"<b>MILESTONE:</b> {row['JENIS PEKERJAAN']}<br>Date: {midpoint.strftime('%Y-%m-%d')}"
-                    ))
-            
-            # Add dependency arrows if predecessors exist
-            if 'PREDECESSORS' in timeline_df.columns:
-                for _, row in timeline_df.iterrows():
-                    if pd.notna(row['PREDECESSORS']) and row['PREDECESSORS'] and row['PREDECESSORS'] in task_dict:
-                        # Get predecessor task
-                        pred = task_dict[row['PREDECESSORS']]
-                        
-                        # Add arrow connecting tasks
-                        fig.add_shape(
-                            type="line",
-                            x0=pred['PLAN END'],  # End of predecessor
-                            y0=pred['Task'],
-                            x1=row['START'],     # Start of current task
-                            y1=row['Task'],
-                            line=dict(
-                                color="rgba(0,0,0,0.5)",
-                                width=1.5,
-                                dash="dot"
-                            ),
-                            layer="below"
-                        )
-                        
-                        # Add arrowhead
-                        fig.add_annotation(
-                            x=row['START'],
-                            y=row['Task'],
-                            xanchor="right",
-                            showarrow=True,
-                            arrowhead=2,
-                            arrowsize=1,
-                            arrowwidth=1.5,
-                            arrowcolor="rgba(0,0,0,0.5)",
-                            ax=-10,
-                            ay=0,
-                            text="",
-                            hovertext=f"Depends on: {pred['JENIS PEKERJAAN']}",
-                            hoverlabel=dict(bgcolor="white")
-                        )
-            
-            # Set the x-axis range based on slider selection
-            if 'view_start' in locals() and 'view_end' in locals() and view_start and view_end:
-                fig.update_layout(
-                    height=600,
-                    margin=dict(l=10, r=10, t=10, b=10),
-                    legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-                    xaxis=dict(
-                        range=[view_start, view_end],
-                        rangeslider=dict(visible=True)  # Add range slider for easy navigation
-                    )
+            # Level of detail: one bar per group when zoomed out, tasks on drill-down
+            rollups, group_rows = load_gantt_rollups(timeline_df, data_version, st.session_state.active_project_filter, search_match)
+            lod_col1, lod_col2 = st.columns(2)
+            with lod_col1:
+                # One widget per project filter, so each filter keeps its own default
+                default_level = 'Sub Area' if st.session_state.active_project_filter == 'all' else gantt.TASK_LEVEL
+                detail_level = st.selectbox(
+                    "Detail level",
+                    gantt.DETAIL_LEVELS,
+                    index=gantt.DETAIL_LEVELS.index(default_level),
+                    key=f"gantt_detail_level_{st.session_state.active_project_filter}"
                 )
-            else:
-                # Default layout without date range filter - with responsive settings for mobile
-                fig.update_layout(
-                    height=600,
-                    margin=dict(l=10, r=10, t=10, b=10),
-                    legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-                    autosize=True,
-                    # Make the chart mobile-friendly
-                    modebar=dict(orientation='v'),
-                    hovermode='closest'
+            drill_group = None
+            if detail_level != gantt.TASK_LEVEL:
+                with lod_col2:
+                    drill_choice = st.selectbox(
+                        "Drill into group",
+                        ["(none)"] + rollups[detail_level]['TASK_ID'].tolist(),
+                        key="gantt_drill_group"
+                    )
+                if drill_choice != "(none)":
+                    drill_group = drill_choice
+
+            gantt_df = timeline_df
+            gantt_start, gantt_end = view_start, view_end
+            gantt_height = gantt.GANTT_HEIGHT
+            window_key = None
+
+            if drill_group is not None:
+                gantt_df = gantt.drill_down(timeline_df, group_rows, detail_level, drill_group)
+                gantt_start, gantt_end = gantt.window_date_range(gantt_df)
+                gantt_height = gantt.window_height(gantt_df)
+                st.caption(f"{len(gantt_df)} tasks in {drill_group}")
+            elif detail_level != gantt.TASK_LEVEL:
+                gantt_df = rollups[detail_level]
+                gantt_height = gantt.window_height(gantt_df)
+                st.caption(f"{len(gantt_df)} {detail_level.lower()} groups · {len(timeline_df)} tasks")
+
+            # Windowed mode: only the rows (and their date range) in view are built
+            if windowed and not gantt_df.empty:
+                row_index = load_gantt_row_order(
+                    gantt_df, data_version, st.session_state.active_project_filter, search_match, detail_level, drill_group
                 )
-            
-            # Add progress indicators and text inside the timeline bars if % COMPLETE is available
-            if '% COMPLETE' in timeline_df.columns:
-                for i, row in timeline_df.iterrows():
-                    # Skip milestones for progress indicators (they're just points in time)
-                    if 'IS_MILESTONE' in timeline_df.columns and row['IS_MILESTONE']:
-                        continue
-                        
-                    # Calculate positions for all tasks
-                    start_date = row['START']
-                    end_date = row['PLAN END']
-                    total_days = (end_date - start_date).total_seconds()
-                    
-                    if total_days > 0:
-                        # Middle position for text label
-                        middle_date = start_date + (end_date - start_date) / 2
-                        
-                        # Add percentage text in the middle of each bar
-                        percentage_text = f"{row['% COMPLETE']:.0f}%"
-                        
-                        # Add text annotation for percentage
-                        fig.add_annotation(
-                            x=middle_date,
-                            y=row['Task'],
-                            text=percentage_text,
-                            showarrow=False,
-                            font=dict(
-                                size=12,
-                                color="black",
-                                family="Arial, sans-serif bold"
-                            ),
-                            bgcolor="rgba(255, 255, 255, 0.7)",  # Semi-transparent white background
-                            bordercolor="rgba(0, 0, 0, 0.5)",
-                            borderwidth=1,
-                            borderpad=2,
-                            opacity=0.9
-                        )
-                        
-                        # Only add progress bar for non-completed tasks with progress
-                        if row['STATUS'] != 'SELESAI' and row['% COMPLETE'] > 0:
-                            # Calculate the progress end date based on % completion
-                            progress_seconds = total_days * (row['% COMPLETE'] / 100)
-                            progress_end = start_date + timedelta(seconds=progress_seconds)
-                            
-                            # Add a colored overlay to show progress
-                            fig.add_trace(go.Scatter(
-                                x=[start_date, progress_end, progress_end, start_date, start_date],
-                                y=[row['Task'], row['Task'], row['Task'], row['Task'], row['Task']],
-                                fill="toself",
-                                mode="lines",
-                                line=dict(width=0),
-                                fillcolor="rgba(0, 255, 0, 0.5)",  # Green with 50% opacity
-                                hoverinfo="skip",
-                                showlegend=False
-                            ))
-            
-            # Add today's date line as a reference using a custom shape
-            today = datetime.today()
-            
-            # Add a vertical line for today using shapes
-            fig.update_layout(
-                shapes=[
-                    # Vertical line for today
-                    dict(
-                        type="line",
-                        xref="x",
-                        yref="paper",
-                        x0=today,
-                        y0=0,
-                        x1=today,
-                        y1=1,
-                        line=dict(
-                            color="red",
-                            width=2,
-                            dash="dash",
-                        )
+                win_col1, win_col2 = st.columns([3, 1])
+                with win_col2:
+                    window_size = st.selectbox(
+                        "Rows per window", gantt.WINDOW_SIZES, index=1, key="gantt_window_size"
                     )
-                ],
-                annotations=[
-                    # Today label
-                    dict(
-                        x=today,
-                        y=1.05,
-                        xref="x",
-                        yref="paper",
-                        text="Today",
-                        showarrow=False,
-                        font=dict(color="red", size=12),
+                with win_col1:
+                    row_offset = st.number_input(
+                        "Row offset",
+                        min_value=0,
+                        max_value=max(0, len(row_index) - 1),
+                        step=window_size,
+                        key="gantt_row_offset"
                     )
-                ]
+
+                gantt_df = gantt.window_rows(gantt_df, row_index, row_offset, window_size)
+                gantt_start, gantt_end = gantt.window_date_range(gantt_df)
+                gantt_height = gantt.window_height(gantt_df)
+                st.caption(f"Rows {row_offset + 1}–{row_offset + len(gantt_df)} of {len(row_index)}")
+                window_key = (row_offset, window_size)
+
+            # Create Gantt chart: bars plus one trace each for dependencies,
+            # milestones, progress overlays and percentage labels.
+            # Rebuilt only when the data, project filter, options or date change.
+            today = datetime.today()
+            fig = cached_figure(
+                "gantt",
+                (data_version, st.session_state.active_project_filter, search_match, detail_level, drill_group,
+                 show_dependencies, window_key, today.date()),
+                lambda: gantt.build_gantt_figure(
+                    gantt_df,
+                    color_map,
+                    view_start=gantt_start,
+                    view_end=gantt_end,
+                    today=today,
+                    show_dependencies=show_dependencies,
+                    height=gantt_height
+                )
             )
             
             # Display the chart with full width
@@ -1019,129 +1074,95 @@ def main():
                 if '% COMPLETE' in timeline_df.columns:
                     st.markdown("### 📊 S-Curve Progress Tracking")
 
-                    # ✅ Normalize % COMPLETE to 0–1 scale if needed
-                    if timeline_df['% COMPLETE'].max() > 1.5:
-                        timeline_df['% COMPLETE'] = timeline_df['% COMPLETE'] / 100
-
-                    # Generate weekly intervals
-                    min_date = timeline_df['START'].min().date()
-                    max_date = timeline_df['PLAN END'].max().date()
-                    time_periods = []
-                    current = min_date
-                    while current <= max_date:
-                        time_periods.append(current)
-                        current += timedelta(days=7)
-
-                    # Calculate progress
-                    progress_data = []
+                    granularity = st.radio(
+                        "Granularity",
+                        list(scurve.GRANULARITIES),
+                        index=list(scurve.GRANULARITIES).index('Weekly'),
+                        horizontal=True,
+                        key="scurve_granularity"
+                    )
+
+                    # Planned / actual curves: the project filter selects a slice of the
+                    # per-project sums, computed once per data version and day
                     today_date = date.today()
+                    scurve_project = {'p1a': 'PROJECT 1 A', 'p1b': 'PROJECT 1 B'}.get(
+                        st.session_state.active_project_filter
+                    )
+                    progress_df = load_scurve(
+                        schedule_df, data_version, today_date, 'KONTRAK_CODE', scurve_project, granularity
+                    )
 
-                    for period in time_periods:
-                        planned_progress = 0
-                        actual_progress = 0
-                        total_weight = 0
-
-                        for _, row in timeline_df.iterrows():
-                            if row['START'].date() > period:
-                                continue
-
-                            weight = row.get('BOBOT', 0)
-
-                            # ❗️ SKIP rows with 0 or invalid weight
-                            if pd.isna(weight) or weight <= 0:
-                                continue
-
-                            total_weight += weight
-
-                            # Planned progress (0–1)
-                            if period >= row['PLAN END'].date():
-                                task_planned = 1.0
-                            elif period < row['START'].date():
-                                task_planned = 0.0
-                            else:
-                                total_days = (row['PLAN END'] - row['START']).days
-                                days_passed = (period - row['START'].date()).days
-                                task_planned = days_passed / total_days if total_days > 0 else 1.0
-
-                            # Actual progress
-                            if period >= today_date:
-                                task_actual = row['% COMPLETE']
-                            elif period < row['START'].date():
-                                task_actual = 0.0
-                            else:
-                                total_days = (today_date - row['START'].date()).days
-                                days_passed = (period - row['START'].date()).days
-                                task_actual = min(
-                                    row['% COMPLETE'],
-                                    (days_passed / total_days) * row['% COMPLETE'] if total_days > 0 else 0
-                                )
+                    # Actual curve follows recorded snapshots where history exists
+                    actual_history = load_progress_history(data_version, scurve_project)
+                    progress_df = progress_history.apply_recorded_actuals(progress_df, actual_history)
+                    if not actual_history.empty:
+                        st.caption(
+                            f"Actual curve uses {len(actual_history)} recorded snapshot(s) since "
+                            f"{actual_history['Date'].min():%d %b %Y}."
+                        )
 
-                            planned_progress += task_planned * weight
-                            actual_progress += task_actual * weight
+                    # Plot S-Curve (rebuilt only when the data, project filter or date change)
+                    def build_scurve():
+                        fig = px.line(
+                            progress_df,
+                            x='Date',
+                            y='Progress',
+                            color='Type',
+                            title="Project Progress S-Curve",
+                            labels={'Progress': 'Cumulative Progress (%)', 'Date': 'Date'},
+                            color_discrete_map={'Planned': 'blue', 'Actual': 'green'}
+                        )
 
-                        if total_weight > 0:
-                            planned_progress = (planned_progress / total_weight) * 100
-                            actual_progress = (actual_progress / total_weight) * 100
-                        else:
-                            planned_progress = 0
-                            actual_progress = 0
-
-                        progress_data.append({'Date': period, 'Type': 'Planned', 'Progress': planned_progress})
-                        progress_data.append({'Date': period, 'Type': 'Actual', 'Progress': actual_progress})
-
-                    # Convert to DataFrame
-                    progress_df = pd.DataFrame(progress_data)
-                    progress_df['Date'] = pd.to_datetime(progress_df['Date'])
-                    progress_df = progress_df.sort_values(by=["Type", "Date"])
-
-                    # Ensure cumulative max
-                    for t in ['Planned', 'Actual']:
-                        mask = progress_df['Type'] == t
-                        progress_df.loc[mask, 'Progress'] = progress_df.loc[mask, 'Progress'].cummax()
-
-                    # Plot S-Curve
-                    fig_scurve = px.line(
-                        progress_df,
-                        x='Date',
-                        y='Progress',
-                        color='Type',
-                        title="Project Progress S-Curve",
-                        labels={'Progress': 'Cumulative Progress (%)', 'Date': 'Date'},
-                        color_discrete_map={'Planned': 'blue', 'Actual': 'green'}
-                    )
+                        fig.update_layout(
+                            xaxis_title="Date",
+                            yaxis_title="Cumulative Progress (%)",
+                            yaxis=dict(range=[0, 100]),
+                            legend_title="Progress Type",
+                            hovermode="x unified",
+                            autosize=True,
+                            modebar=dict(orientation='v'),
+                            margin=dict(l=10, r=10, t=30, b=10),
+                            shapes=[
+                                dict(
+                                    type="line",
+                                    xref="x",
+                                    yref="paper",
+                                    x0=today_date,
+                                    y0=0,
+                                    x1=today_date,
+                                    y1=1,
+                                    line=dict(color="red", width=2, dash="dash")
+                                )
+                            ],
+                            annotations=[
+                                dict(
+                                    x=today_date,
+                                    y=1.05,
+                                    xref="x",
+                                    yref="paper",
+                                    text="Today",
+                                    showarrow=False,
+                                    font=dict(color="red", size=12),
+                                )
+                            ]
+                        )
 
-                    fig_scurve.update_layout(
-                        xaxis_title="Date",
-                        yaxis_title="Cumulative Progress (%)",
-                        yaxis=dict(range=[0, 100]),
-                        legend_title="Progress Type",
-                        hovermode="x unified",
-                        autosize=True,
-                        modebar=dict(orientation='v'),
-                        margin=dict(l=10, r=10, t=30, b=10),
-                        shapes=[
-                            dict(
-                                type="line",
-                                xref="x",
-                                yref="paper",
-                                x0=today_date,
-                                y0=0,
-                                x1=today_date,
-                                y1=1,
-                                line=dict(color="red", width=2, dash="dash")
-                            )
-                        ],
-                        annotations=[
-                            dict(
-                                x=today_date,
-                                y=1.05,
-                                xref="x",
-                                yref="paper",
-                                text="Today",
-                                showarrow=False,
-                                font=dict(color="red", size=12),
-                            )
-                        ]
+                        # Recorded snapshots, also those past the last period
+                        if not actual_history.empty:
+                            fig.add_trace(go.Scatter(
+                                x=actual_history['Date'],
+                                y=actual_history['Actual'],
+                                mode='lines+markers',
+                                name='Recorded',
+                                line=dict(color='green', dash='dot'),
+                                marker=dict(size=7)
+                            ))
+                        return fig
+
+                    fig_scurve = cached_figure(
+                        "scurve",
+                        (data_version, st.session_state.active_project_filter, today_date, granularity),
+                        build_scurve
                     )
 
                     st.plotly_chart(fig_scurve, use_container_width=True)
@@ -1185,11 +1206,69 @@ def main():
                     with col1:
                         st.metric("Planned Progress", f"{current_planned:.1f}%")
                     with col2:
-                        st.metric("Actual Progress", f"{current_actual:.1f}%")
+                        # Trend since the previous recorded snapshot
+                        actual_delta = None
+                        if len(actual_history) >= 2:
+                            previous = actual_history.iloc[-2]
+                            change = actual_history['Actual'].iloc[-1] - previous['Actual']
+                            actual_delta = f"{change:+.1f} pts since {previous['Date']:%d %b}"
+                        st.metric("Actual Progress", f"{current_actual:.1f}%", delta=actual_delta)
                     with col3:
                         delta_color = "normal" if spi >= 1 else "inverse"
                         st.metric("SPI", f"{spi:.2f}", delta=f"{(spi-1)*100:.1f}%", delta_color=delta_color)
 
+                    # Cost side: budget, earned value and paid amounts per project
+                    # Cost files are only read here (uploads happen on the Home page)
+                    contract_file, contract_version = read_github_file(CONTRACT_FILE_PATH)
+                    payment_term_file, payment_version = read_github_file(PAYMENT_TERMS_FILE_PATH)
+                    if contract_file is not None and payment_term_file is not None:
+                        evm_df, unmatched_keywords = load_earned_value(
+                            schedule_df, contract_file, payment_term_file, data_version,
+                            contract_version, payment_version, today_date, granularity
+                        )
+                        if unmatched_keywords:
+                            st.warning(
+                                "Contract keywords matching nothing in the contract data or payment ledger: "
+                                + "; ".join(f"{project}: {', '.join(keywords)}" for project, keywords in unmatched_keywords.items())
+                            )
+                        evm_project = scurve_project or evm.TOTAL_LABEL
+                        evm_now = evm.latest(evm_df, today_date)
+                        if evm_project in evm_now.index and evm_now.loc[evm_project, 'BAC'] > 0:
+                            current = evm_now.loc[evm_project]
+
+                            def money(x):
+                                return f"Rp {x / 1e9:,.2f} M" if pd.notna(x) else "–"
+
+                            def ratio(x):
+                                return f"{x:.2f}" if pd.notna(x) else "–"
+
+                            cols = st.columns(6)
+                            cols[0].metric("Budget (BAC)", money(current['BAC']))
+                            cols[1].metric("Earned Value (EV)", money(current['EV']))
+                            cols[2].metric("Actual Cost (AC)", money(current['AC']))
+                            cols[3].metric("CPI", ratio(current['CPI']))
+                            cols[4].metric("EAC", money(current['EAC']))
+                            cols[5].metric("ETC", money(current['ETC']))
+                            if evm_project in EVM_CONTRACT_SHARES:
+                                st.caption(
+                                    f"Cost figures take {EVM_CONTRACT_SHARES[evm_project]:.0%} of the contract "
+                                    "this project shares with another project."
+                                )
+
+                            with st.expander("💰 Earned value per period"):
+                                evm_table = evm_df[evm_df['KONTRAK_CODE'] == evm_project].drop(columns='KONTRAK_CODE')
+                                st.dataframe(
+                                    evm_table.style.format(
+                                        {col: money for col in ['BAC', 'PV', 'EV', 'AC', 'EAC', 'ETC']}
+                                        | {col: ratio for col in ['SPI', 'CPI']}
+                                        | {'Date': lambda d: f"{d:%d %b %Y}"}
+                                    ),
+                                    use_container_width=True,
+                                    hide_index=True
+                                )
+                        else:
+                            st.caption("No contract value matched this project in the contract data or payment ledger.")
+
                     if spi >= 1.1:
                         st.success("🎯 Project is ahead of schedule!")
                     elif spi >= 0.9:
@@ -1197,58 +1276,196 @@ def main():
                     else:
                         st.error("⚠️ Project is behind schedule! Action needed.")
 
+                    # Small multiples: one curve per project / area, sliced from the same sums
+                    with st.expander("📐 Compare S-curves by project / area"):
+                        compare_by = st.radio(
+                            "Compare by",
+                            scurve.GROUP_COLUMNS,
+                            format_func=lambda col: 'Project' if col == 'KONTRAK_CODE' else 'Area',
+                            horizontal=True,
+                            key="scurve_compare_by"
+                        )
+                        scurve_groups = load_grouped_scurve(schedule_df, data_version, today_date)['groups']
+                        compare_options = scurve_groups.loc[
+                            (scurve_groups['GROUP_COLUMN'] == compare_by) & scurve_groups['FIRST'].notna(),
+                            'GROUP'
+                        ].tolist()
+                        compare_groups = st.multiselect(
+                            "Groups",
+                            compare_options,
+                            default=compare_options[:6],
+                            key=f"scurve_compare_{compare_by}"
+                        )
+
+                        if compare_groups:
+                            def build_scurve_compare():
+                                curves = pd.concat([
+                                    load_scurve(
+                                        schedule_df, data_version, today_date, compare_by, group, granularity
+                                    ).assign(Group=group)
+                                    for group in compare_groups
+                                ])
+                                fig = px.line(
+                                    curves,
+                                    x='Date',
+                                    y='Progress',
+                                    color='Type',
+                                    facet_col='Group',
+                                    facet_col_wrap=3,
+                                    color_discrete_map={'Planned': 'blue', 'Actual': 'green'},
+                                    height=260 * ((len(compare_groups) + 2) // 3) + 60
+                                )
+                                fig.update_yaxes(range=[0, 100], title_text="")
+                                fig.update_xaxes(title_text="")
+                                fig.for_each_annotation(lambda a: a.update(text=a.text.split("=", 1)[-1]))
+                                fig.update_layout(legend_title="Progress Type", margin=dict(l=10, r=10, t=40, b=10))
+                                return fig
+
+                            fig_compare = cached_figure(
+                                "scurve_compare",
+                                (data_version, today_date, granularity, compare_by, tuple(compare_groups)),
+                                build_scurve_compare
+                            )
+                            st.plotly_chart(fig_compare, use_container_width=True)
+                        else:
+                            st.info("Select at least one group to compare.")
+
+                    # Completion-date distribution per project from the task network
+                    with st.expander("🎲 Schedule risk (Monte Carlo)"):
+                        risk_col1, risk_col2 = st.columns(2)
+                        with risk_col1:
+                            iterations = st.select_slider(
+                                "Iterations",
+                                options=[1000, 2000, 5000, 10000],
+                                value=risk.ITERATIONS,
+                                key="risk_iterations"
+                            )
+                        with risk_col2:
+                            duration_range = st.slider(
+                                "Remaining duration range (x planned)",
+                                min_value=0.5,
+                                max_value=3.0,
+                                value=risk.DURATION_RANGE,
+                                step=0.05,
+                                key="risk_duration_range"
+                            )
+
+                        if duration_range[0] > 1 or duration_range[1] < 1:
+                            st.warning("The range must include 1.0 (the planned duration).")
+                        else:
+                            risk_summary, risk_samples, cycle_links = load_schedule_risk(
+                                schedule_df, data_version, today_date, iterations, tuple(duration_range)
+                            )
+                            if cycle_links:
+                                st.warning(
+                                    "PREDECESSORS contain cycles; these links were ignored in the simulation: "
+                                    + ", ".join(f"{successor} ← {predecessor}" for successor, predecessor in cycle_links)
+                                )
+                            if scurve_project:
+                                risk_summary = risk_summary[risk_summary['KONTRAK_CODE'] == scurve_project]
+                                risk_samples = risk_samples[risk_samples['KONTRAK_CODE'] == scurve_project]
+
+                            st.dataframe(
+                                risk_summary.style.format(
+                                    {col: lambda d: f"{d:%d %b %Y}" for col in risk_summary.columns if col.startswith('P')}
+                                    | {'ON_TIME': "{:.0%}"}
+                                ),
+                                use_container_width=True,
+                                hide_index=True
+                            )
+
+                            def build_risk_histogram():
+                                fig = px.histogram(
+                                    risk_samples,
+                                    x='FINISH',
+                                    color='KONTRAK_CODE',
+                                    barmode='overlay',
+                                    opacity=0.6,
+                                    labels={'FINISH': 'Simulated completion date', 'KONTRAK_CODE': 'Project'}
+                                )
+                                for row in risk_summary.itertuples(index=False):
+                                    fig.add_vline(x=row.P80, line=dict(color="red", width=1, dash="dash"))
+                                fig.update_layout(
+                                    yaxis_title="Iterations",
+                                    margin=dict(l=10, r=10, t=30, b=10),
+                                    modebar=dict(orientation='v')
+                                )
+                                return fig
+
+                            fig_risk = cached_figure(
+                                "schedule_risk",
+                                (data_version, st.session_state.active_project_filter, today_date, iterations, tuple(duration_range)),
+                                build_risk_histogram
+                            )
+                            st.plotly_chart(fig_risk, use_container_width=True)
+                            st.caption("Dashed lines: P80 completion date per project.")
+
             
             # Task Details Panel Tab
             with timeline_tabs[2]:
                 st.markdown("### 📝 Task Details")
                 
-                # Create an expander for each task with details
-                for _, row in timeline_df.iterrows():
-                    with st.expander(f"{row['KONTRAK_DISPLAY']} - {row['JENIS PEKERJAAN']}"):
-                        col1, col2 = st.columns(2)
-                        
-                        with col1:
-                            st.markdown(f"**Project:** {row['KONTRAK_DISPLAY']}")
-                            st.markdown(f"**Task:** {row['JENIS PEKERJAAN']}")
-                            if 'AREA PEKERJAAN' in row and not pd.isna(row['AREA PEKERJAAN']):
-                                st.markdown(f"**Area Pekerjaan:** {row['AREA PEKERJAAN']}")
-                            if 'SUB AREA PEKERJAAN' in row and not pd.isna(row['SUB AREA PEKERJAAN']):
-                                st.markdown(f"**Sub Area Pekerjaan:** {row['SUB AREA PEKERJAAN']}")
-                            st.markdown(f"**Status:** {row['STATUS']}")
-                            if 'RESOURCE' in row and not pd.isna(row['RESOURCE']):
-                                st.markdown(f"**Resource:** {row['RESOURCE']}")
-                            if 'BOBOT' in row and not pd.isna(row['BOBOT']):
-                                st.markdown(f"**Weight:** {row['BOBOT']}")
-                        
-                        with col2:
-                            st.markdown(f"**Start Date:** {row['START'].strftime('%Y-%m-%d')}")
-                            st.markdown(f"**End Date:** {row['PLAN END'].strftime('%Y-%m-%d')}")
-                            if '% COMPLETE' in row and not pd.isna(row['% COMPLETE']):
-                                st.markdown(f"**Progress:** {row['% COMPLETE']:.1f}%")
-                                st.progress(int(row['% COMPLETE']))
-                            
-                            if 'IS_MILESTONE' in row and row['IS_MILESTONE']:
-                                st.markdown("**Type:** 🎯 Milestone")
-                        
-                        # Show dependencies if available
-                        if 'PREDECESSORS' in row and row['PREDECESSORS']:
-                            if row['PREDECESSORS'] in task_dict:
-                                pred = task_dict[row['PREDECESSORS']]
-                                st.markdown(f"**Depends on:** {pred['JENIS PEKERJAAN']} (must finish before this task can start)")
-                                
-                                # Calculate critical dependency status
-                                if pd.to_datetime(pred['PLAN END']) > pd.to_datetime(row['START']):
-                                    st.warning("⚠️ Dependency conflict: Predecessor end date is after this task's start date!")
-                        
-                        # Show days left until deadline
-                        days_left = (row['PLAN END'].date() - today.date()).days
-                        if days_left < 0:
-                            st.error(f"⚠️ **Overdue by {abs(days_left)} days**")
-                        elif days_left == 0:
-                            st.warning("⏰ **Due today!**")
-                        else:
-                            st.info(f"⏳ **Days remaining: {days_left}**")
-    
+                # Tasks matching the search box; render only the current page,
+                # and the full detail for the selected task only
+                page_size = st.selectbox(
+                    "Tasks per page", TASK_PAGE_SIZES, index=1, key="task_details_page_size"
+                )
+
+                details_df = timeline_df
+
+                if details_df.empty:
+                    st.info("No tasks to show.")
+                else:
+                    n_pages = (len(details_df) - 1) // page_size + 1
+                    # A narrower search or bigger pages can leave the stored page out of range
+                    if st.session_state.get("task_details_page", 1) > n_pages:
+                        st.session_state["task_details_page"] = n_pages
+                    page = st.number_input(
+                        f"Page (of {n_pages})",
+                        min_value=1,
+                        max_value=n_pages,
+                        step=1,
+                        key="task_details_page"
+                    )
+                    page_df = details_df.iloc[(page - 1) * page_size:page * page_size]
+                    st.caption(
+                        f"Tasks {(page - 1) * page_size + 1}–{(page - 1) * page_size + len(page_df)} "
+                        f"of {len(details_df)}"
+                    )
+
+                    st.dataframe(
+                        page_df[[col for col in TASK_PAGE_COLUMNS if col in page_df.columns]].rename(
+                            columns={
+                                'KONTRAK_DISPLAY': 'Project',
+                                'JENIS PEKERJAAN': 'Task',
+                                'AREA PEKERJAAN': 'Area',
+                                'SUB AREA PEKERJAAN': 'Sub Area',
+                                'STATUS': 'Status',
+                                'START': 'Start',
+                                'PLAN END': 'End',
+                                '% COMPLETE': 'Progress',
+                            }
+                        ),
+                        column_config={
+                            'Start': st.column_config.DateColumn(format="YYYY-MM-DD"),
+                            'End': st.column_config.DateColumn(format="YYYY-MM-DD"),
+                            'Progress': st.column_config.ProgressColumn(format="%.1f%%", min_value=0, max_value=100),
+                        },
+                        use_container_width=True,
+                        hide_index=True
+                    )
+
+                    # Keep the selection only while its task is on the page
+                    if st.session_state.get("task_details_selected") not in page_df.index:
+                        st.session_state.pop("task_details_selected", None)
+                    selected_task = st.selectbox(
+                        "Task detail",
+                        page_df.index,
+                        format_func=lambda i: f"{page_df.at[i, 'KONTRAK_DISPLAY']} - {page_df.at[i, 'JENIS PEKERJAAN']}",
+                        key="task_details_selected"
+                    )
+                    render_task_detail(page_df.loc[selected_task], task_lookup, today)
+
     # Task details are now in the interactive task details tab
 
   # --- Status Pie & Pending Chart ---
@@ -1263,50 +1480,33 @@ def main():
         else:
             filtered_df = df.copy()
     
+        # Sidebar filters + project filter decide what these charts show
+        distribution_key = (data_version, selected_kontrak, selected_filter_col,
+                            selected_filter_val, active_filter)
+
         c1, c2 = st.columns(2)
     
         with c1:
             if not filtered_df.empty:
-                status_counts = filtered_df['STATUS'].value_counts().reset_index()
-                status_counts.columns = ['Status', 'Count']
-                fig_status = px.pie(
-                    status_counts,
-                    names='Status',
-                    values='Count',
-                    hole=0.4,
-                    title=f"Status Breakdown ({active_filter.upper() if active_filter != 'all' else 'ALL PROJECTS'})",
-                    color='Status',
-                    color_discrete_map=color_map
-                )
+                def build_status_pie():
+                    status_counts = filtered_df['STATUS'].value_counts().reset_index()
+                    status_counts.columns = ['Status', 'Count']
+                    return px.pie(
+                        status_counts,
+                        names='Status',
+                        values='Count',
+                        hole=0.4,
+                        title=f"Status Breakdown ({active_filter.upper() if active_filter != 'all' else 'ALL PROJECTS'})",
+                        color='Status',
+                        color_discrete_map=color_map
+                    )
+
+                fig_status = cached_figure("status_pie", distribution_key, build_status_pie)
                 st.plotly_chart(fig_status, use_container_width=True)
             else:
                 st.info("No data available for selected project.")
     
         with c2:
-            pending_df = filtered_df[filtered_df['STATUS'].isin(['TUNDA', 'BELUM MULAI'])]
-
-            # Hitung pending per project (AMAN)
-            pending_count = (
-                pending_df
-                .groupby('KONTRAK_CODE')
-                .size()
-                .reset_index(name='Pending Count')
-            )
-            
-            # Pastikan semua project muncul
-            pending_count = (
-                pd.DataFrame({'KONTRAK_CODE': ['PROJECT 1 A', 'PROJECT 1 B']})
-                .merge(pending_count, on='KONTRAK_CODE', how='left')
-                .fillna({'Pending Count': 0})
-            )
-            
-            # Mapping ke nama dashboard (KSO)
-            pending_count['Project Display'] = pending_count['KONTRAK_CODE'].map(PROJECT_MAP)
-            
-            
-
-            active_filter = st.session_state.get("active_project_filter", "all")
-
             if active_filter == "p1a":
                 title_project = PROJECT_MAP['PROJECT 1 A']
             elif active_filter == "p1b":
@@ -1314,35 +1514,53 @@ def main():
             else:
                 title_project = "ALL PROJECTS"
 
+            def build_pending_bar():
+                pending_df = filtered_df[filtered_df['STATUS'].isin(['TUNDA', 'BELUM MULAI'])]
 
-    
-            fig_pending = px.bar(
-                pending_count,
-                x='Pending Count',
-                y='Project Display',
-                orientation='h',
-                text='Pending Count',
-                title=f"Projects with Pending Tasks ({title_project})",
-                color='Pending Count',
-                color_continuous_scale='Oranges'
-            )
+                # Hitung pending per project (AMAN)
+                pending_count = (
+                    pending_df
+                    .groupby('KONTRAK_CODE')
+                    .size()
+                    .reset_index(name='Pending Count')
+                )
 
+                # Pastikan semua project muncul
+                pending_count = (
+                    pd.DataFrame({'KONTRAK_CODE': ['PROJECT 1 A', 'PROJECT 1 B']})
+                    .merge(pending_count, on='KONTRAK_CODE', how='left')
+                    .fillna({'Pending Count': 0})
+                )
 
+                # Mapping ke nama dashboard (KSO)
+                pending_count['Project Display'] = pending_count['KONTRAK_CODE'].map(PROJECT_MAP)
 
-    
-            fig_pending.update_traces(
-                texttemplate='%{text}', 
-                textposition='outside',
-                hovertemplate='Project: %{y}<br>Pending: %{x}<extra></extra>'
-            )
-    
-            fig_pending.update_layout(
-                yaxis_title="Project",
-                xaxis_title="Pending Tasks",
-                height=400,
-                margin=dict(l=40, r=10, t=40, b=40)
-            )
-    
+                fig = px.bar(
+                    pending_count,
+                    x='Pending Count',
+                    y='Project Display',
+                    orientation='h',
+                    text='Pending Count',
+                    title=f"Projects with Pending Tasks ({title_project})",
+                    color='Pending Count',
+                    color_continuous_scale='Oranges'
+                )
+
+                fig.update_traces(
+                    texttemplate='%{text}', 
+                    textposition='outside',
+                    hovertemplate='Project: %{y}<br>Pending: %{x}<extra></extra>'
+                )
+
+                fig.update_layout(
+                    yaxis_title="Project",
+                    xaxis_title="Pending Tasks",
+                    height=400,
+                    margin=dict(l=40, r=10, t=40, b=40)
+                )
+                return fig
+
+            fig_pending = cached_figure("pending_bar", distribution_key, build_pending_bar)
             st.plotly_chart(fig_pending, use_container_width=True)
 
 
@@ -1350,8 +1568,13 @@ def main():
 
     # --- Late Tasks Section ---
     with section_card("🕰 Overdue Tasks"):
-        late_df = df[(pd.to_datetime(df['PLAN END'], errors='coerce') < datetime.today()) & (df['STATUS'].str.upper() != 'SELESAI')]
-        late_df['LATE DAYS'] = (datetime.today() - pd.to_datetime(late_df['PLAN END'], errors='coerce')).dt.days
+        # Open tasks due before now, from the deadline index (most overdue first)
+        now = datetime.today()
+        late_rows = deadlines.overdue(load_task_deadlines(original_df, data_version), now, 'open')
+        late_df = apply_sidebar_filters(
+            original_df.iloc[late_rows], selected_kontrak, selected_filter_col, selected_filter_val
+        ).copy()
+        late_df['LATE DAYS'] = (now - pd.to_datetime(late_df['PLAN END'])).dt.days
 
         if not late_df.empty:
             total_late_tasks = len(late_df)
@@ -1386,9 +1609,9 @@ def main():
         # Only show recommendations for non-completed tasks
         active_tasks = df[df['STATUS'] != 'SELESAI'].copy()
         if not active_tasks.empty:
-            # Calculate priority scores
-            active_tasks['PRIORITY_SCORE'] = active_tasks.apply(calculate_priority_score, axis=1)
-            active_tasks = active_tasks.sort_values('PRIORITY_SCORE', ascending=False)
+            # Calculate priority scores (vectorized) and keep the top 5
+            active_tasks['PRIORITY_SCORE'] = priority.priority_scores(active_tasks)
+            active_tasks = active_tasks.loc[priority.top_k(active_tasks['PRIORITY_SCORE'], 5)]
             
             # Color coding for priority with better dark mode contrast
             def color_priority(val):
@@ -1473,8 +1696,6 @@ def main():
         # --- Project Zone Map ---
     with section_card("🗺️ Zone-Based Project Progress Map"):
         try:
-            import map_zones
-            import numpy as np
 
 
             if 'selected_project' not in st.session_state:
@@ -1511,46 +1732,50 @@ def main():
                 st.info("No 'AREA PEKERJAAN' column found. Using task descriptions to map work areas.")
 
             progress_by_zone = map_zones.extract_zone_progress(original_df)
-            colored_map_html = map_zones.generate_colored_map(progress_by_zone)
 
             map_col, legend_col = st.columns([2, 1])
 
             with map_col:
                 st.markdown("<h4>Project Site Map</h4>", unsafe_allow_html=True)
-                zone_data = []
-                for zone, progress in progress_by_zone.items():
-                    zone_data.append({
-                        'Zone': zone,
-                        'Progress': progress,
-                        'Status': 'High' if progress >= 50 else ('Medium' if progress >= 30 else 'Low'),
-                        'Display': f"{zone}: {progress:.1f}%"
-                    })
-                zone_df = pd.DataFrame(zone_data)
                 color_scale = {
                     'Low': '#ef4444',    # Red-500
                     'Medium': '#facc15', # Yellow-400
                     'High': '#10b981',   # Emerald-500
                 }
-                fig = px.bar(
-                    zone_df,
-                    x='Zone',
-                    y='Progress',
-                    color='Status',
-                    color_discrete_map=color_scale,
-                    text='Display',
-                    labels={'Progress': 'Completion %', 'Zone': 'Project Zone'},
-                    height=400
-                )
-                fig.update_layout(
-                    title="Project Progress by Zone",
-                    xaxis_title="",
-                    yaxis_title="Completion %",
-                    yaxis=dict(range=[0, 100]),
-                    legend_title="Progress Status",
-                    font=dict(size=12),
-                    plot_bgcolor='rgba(0,0,0,0.05)',
-                    margin=dict(l=40, r=40, t=60, b=40)
-                )
+
+                def build_zone_bar():
+                    zone_data = []
+                    for zone, progress in progress_by_zone.items():
+                        zone_data.append({
+                            'Zone': zone,
+                            'Progress': progress,
+                            'Status': 'High' if progress >= 50 else ('Medium' if progress >= 30 else 'Low'),
+                            'Display': f"{zone}: {progress:.1f}%"
+                        })
+                    zone_df = pd.DataFrame(zone_data)
+                    fig = px.bar(
+                        zone_df,
+                        x='Zone',
+                        y='Progress',
+                        color='Status',
+                        color_discrete_map=color_scale,
+                        text='Display',
+                        labels={'Progress': 'Completion %', 'Zone': 'Project Zone'},
+                        height=400
+                    )
+                    fig.update_layout(
+                        title="Project Progress by Zone",
+                        xaxis_title="",
+                        yaxis_title="Completion %",
+                        yaxis=dict(range=[0, 100]),
+                        legend_title="Progress Status",
+                        font=dict(size=12),
+                        plot_bgcolor='rgba(0,0,0,0.05)',
+                        margin=dict(l=40, r=40, t=60, b=40)
+                    )
+                    return fig
+
+                fig = cached_figure("zone_bar", (data_version, selected_project), build_zone_bar)
                 st.plotly_chart(fig, use_container_width=True)
                 st.caption("Simplified zone progress visualization")
 
@@ -1565,16 +1790,34 @@ def main():
                 </small>
                 """, unsafe_allow_html=True)
 
+            # Zone progress over time: all frames are precomputed; the slider
+            # and play button run in the browser
+            with st.expander("▶️ Zone progress over time"):
+                source_col, granularity_col = st.columns(2)
+                with source_col:
+                    zone_source = st.radio(
+                        "Source", list(ZONE_TIMELINE_SOURCES), horizontal=True, key="zone_timeline_source"
+                    )
+                with granularity_col:
+                    zone_granularity = st.selectbox(
+                        "Granularity", list(scurve.GRANULARITIES), index=1, key="zone_timeline_granularity"
+                    )
+                zone_map_html = load_zone_timeline_map(
+                    original_df, data_version, selected_project,
+                    ZONE_TIMELINE_SOURCES[zone_source], zone_granularity, date.today()
+                )
+                if zone_map_html is None:
+                    st.info("No progress recorded for this selection yet.")
+                else:
+                    components.html(zone_map_html, height=ZONE_TIMELINE_HEIGHT)
+                    if ZONE_TIMELINE_SOURCES[zone_source] == 'History':
+                        st.caption("One frame per recorded workbook snapshot.")
+
             st.markdown("<h4>Progress by Sub-Area Pekerjaan</h4>", unsafe_allow_html=True)
 
             if 'SUB AREA PEKERJAAN' in original_df.columns:
-                if 'BOBOT' in original_df.columns:
-                    sub_area_progress = original_df.groupby('SUB AREA PEKERJAAN').apply(
-                        lambda x: (x['% COMPLETE'] * x['BOBOT']).sum() / x['BOBOT'].sum()
-                        if x['BOBOT'].sum() > 0 else x['% COMPLETE'].mean()
-                    )
-                else:
-                    sub_area_progress = original_df.groupby('SUB AREA PEKERJAAN')['% COMPLETE'].mean()
+                sub_area_column = 'SUB AREA PEKERJAAN'
+                sub_area_progress = map_zones.weighted_rollup(original_df, sub_area_column)
 
                 sub_area_df = pd.DataFrame({
                     'Sub Area': sub_area_progress.index,
@@ -1585,13 +1828,8 @@ def main():
                 original_df['EXTRACTED_SUB_AREA'] = original_df['JENIS PEKERJAAN'].apply(
                     lambda x: str(x).split(' - ')[0] if ' - ' in str(x) else str(x)
                 )
-                if 'BOBOT' in original_df.columns:
-                    sub_area_progress = original_df.groupby('EXTRACTED_SUB_AREA').apply(
-                        lambda x: (x['% COMPLETE'] * x['BOBOT']).sum() / x['BOBOT'].sum()
-                        if x['BOBOT'].sum() > 0 else x['% COMPLETE'].mean()
-                    )
-                else:
-                    sub_area_progress = original_df.groupby('EXTRACTED_SUB_AREA')['% COMPLETE'].mean()
+                sub_area_column = 'EXTRACTED_SUB_AREA'
+                sub_area_progress = map_zones.weighted_rollup(original_df, sub_area_column)
                 sub_area_df = pd.DataFrame({
                     'Sub Area': sub_area_progress.index,
                     'Progress': sub_area_progress.values,
@@ -1600,317 +1838,17 @@ def main():
                 st.warning("No columns found for sub-area analysis. Please add 'SUB AREA PEKERJAAN' or similar to your data.")
                 raise StopIteration
 
-            # --- Assign status, size, and abbreviation ---
-            sub_area_df['Status'] = sub_area_df['Progress'].apply(
-                lambda x: 'High' if x >= 50 else ('Medium' if x >= 30 else 'Low')
-            )
-            sub_area_df = sub_area_df.sort_values('Progress', ascending=False)
-            sub_area_df['Size'] = sub_area_df['Progress'].apply(lambda p: max(p * 2, 12))  # set min bubble size = 5
-
-            import re
-
-            # Fungsi untuk bikin abbreviation bersih dari simbol
-            def generate_abbreviation(name):
-                # Hilangkan simbol (&, -, dll), hanya ambil huruf
-                cleaned = re.sub(r'[^A-Za-z\s]', '', name.upper())
-                words = cleaned.split()
-                if len(words) >= 2:
-                    return ''.join(w[0] for w in words[:3])  # ambil sampai 3 huruf kalau bisa
-                return cleaned[:3]  # fallback: ambil 3 huruf pertama
-
-            # Tambahkan angka pembeda jika abbrev duplikat
-            abbrev_counts = {}
-            abbrevs = []
-            for name in sub_area_df['Sub Area']:
-                base = generate_abbreviation(name)
-                if base not in abbrev_counts:
-                    abbrev_counts[base] = 1
-                    abbrevs.append(base)
-                else:
-                    abbrev_counts[base] += 1
-                    abbrevs.append(f"{base}{abbrev_counts[base]}")
-            sub_area_df['Abbrev'] = abbrevs
+            # --- Packed bubble chart (layout and HTML computed server-side once per data version) ---
+            html_code = load_bubble_chart(sub_area_df, data_version, selected_project, sub_area_column, color_scale)
 
-                    
-            # Drop baris yang progress-nya kosong
-            sub_area_df = sub_area_df.dropna(subset=['Progress'])
-            
-            # Set minimal size agar bubble tetap kelihatan
-            sub_area_df['Size'] = sub_area_df['Progress'].apply(lambda p: max(p * 2, 24))
-            
-            # Generate posisi X & Y kalau belum dihitung
-            if 'X' not in sub_area_df.columns or 'Y' not in sub_area_df.columns:
-                np.random.seed(42)
-                sub_area_df = sub_area_df.sort_values('Size', ascending=False).reset_index(drop=True)
-                ranks = np.linspace(0.1, 1.0, len(sub_area_df))
-                r = np.power(ranks, 1.5)
-                theta = np.random.uniform(0, 2 * np.pi, len(sub_area_df))
-                sub_area_df['X'] = r * np.cos(theta)
-                sub_area_df['Y'] = r * np.sin(theta)
-            
-            # Drop baris yang cacat (NaN di kolom penting)
-            sub_area_df = sub_area_df.dropna(subset=['X', 'Y', 'Size', 'Progress'])
-            
             # Stop kalau data sudah kosong
-            if sub_area_df.empty:
+            if html_code is None:
                 st.warning(f"Tidak ada data bubble yang bisa divisualisasikan untuk {selected_project}")
                 st.stop()
 
-
-            
-
-           
-            # --- Radial layout: bigger bubbles closer to center ---
-            np.random.seed(42)
-
-            # Sort descending by size so biggest bubbles get lowest radius
-            sub_area_df = sub_area_df.sort_values('Size', ascending=False).reset_index(drop=True)
-
-            # Rank from 0.1 to 1.0: smaller rank = closer to center
-            ranks = np.linspace(0.1, 1.0, len(sub_area_df))
-
-            # Optional: emphasize distance of small bubbles
-            r = np.power(ranks, 1.5)  # or np.sqrt(ranks) for tighter grouping
-
-            theta = np.random.uniform(0, 2 * np.pi, len(sub_area_df))
-
-            # Compute positions
-            sub_area_df['X'] = r * np.cos(theta)
-            sub_area_df['Y'] = r * np.sin(theta)
-
-
-
-
-
-           
-            # --- Force-directed bubble chart (HTML embed) ---
-            import streamlit.components.v1 as components
-
-            bubble_data = sub_area_df[['Abbrev', 'Progress', 'Status', 'Size']].copy()
-            bubble_data['Color'] = bubble_data['Status'].map(color_scale)
-            bubble_data['SubArea'] = sub_area_df['Sub Area']
-
-
-            # Generate JSON-like structure for JS
-            bubbles_json = bubble_data.to_dict(orient='records')
-
-            html_code = '''
-<html>
-<head>
-<script src="https://d3js.org/d3.v7.min.js"></script>
-</head>
-<body style="margin:0; background-color:#fff; font-family:Arial, sans-serif;">
-
-<div style="display: flex; flex-direction: row;">
-
-  <!-- BUBBLE CHART AREA -->
-  <div style="flex: 3; position: relative;">
-    <svg viewBox="0 0 1800 1200" width="100%" height="1000" preserveAspectRatio="xMidYMid meet"></svg>
-
-    <!-- Panel Info -->
-    <div id="info-panel"
-     style="position: absolute; top: 20px; right: 20px; background: #f9fafb; border: 1px solid #ddd; padding: 12px 16px; border-radius: 8px; font-size: 13px; color: #111; box-shadow: 0 2px 6px rgba(0,0,0,0.1); display: none; max-width: 240px; z-index: 99; word-wrap: break-word; white-space: normal; line-height: 1.4;">
-      <div style="display: flex; justify-content: space-between; align-items: center;">
-        <div id="info-title" style="font-weight: bold; margin-bottom: 6px;"></div>
-        <button onclick="hideInfo()" style="background: none; border: none; font-weight: bold; font-size: 14px; cursor: pointer; color: #888;">✕</button>
-      </div>
-      <div id="info-body"></div>
-    </div>
-  </div>
-
-  <!-- LEGEND TABLE -->
-  <div style="flex: 1; padding: 16px; overflow-y: auto; height: 1000px;">
-    <h3 style="margin-top: 0;">📘 Abbreviation Legend</h3>
-    <table style="border-collapse: collapse; width: 100%; font-size: 13px;">
-      <thead>
-        <tr>
-          <th style="text-align:left; padding: 8px; border-bottom: 2px solid #ccc;">Abbrev</th>
-          <th style="text-align:left; padding: 8px; border-bottom: 2px solid #ccc;">Full Name</th>
-        </tr>
-      </thead>
-      <tbody>
-''' + '\n'.join([
-    f"""<tr onclick="window.postMessage('{row['Abbrev']}', '*')" style="cursor:pointer;"
-         onmouseover="this.style.background='#f0f0f0';"
-         onmouseout="this.style.background='none';">
-          <td style="padding:6px 12px; border-bottom: 1px solid #eee;">{row['Abbrev']}</td>
-          <td style="padding:6px 12px; border-bottom: 1px solid #eee;">{row['Sub Area']}</td>
-        </tr>""" for _, row in sub_area_df.sort_values('Abbrev').iterrows()
-]) + '''
-      </tbody>
-    </table>
-  </div>
-</div>
-
-<script>
-const svgElem = d3.select("svg");
-const zoomLayer = svgElem.append("g");
-svgElem.call(d3.zoom().scaleExtent([1, 4]).on("zoom", event => zoomLayer.attr("transform", event.transform)));
-
-const data = ''' + str(bubbles_json) + ''';
-const width = 1800;
-const height = 1200;
-
-// --- Dynamic scaleSize based on max Size ---
-const maxSize = d3.max(data, d => d.Size);
-const scaleSize = size => size * (Math.min(width, height) * 0.15 / maxSize);
-
-const defs = svgElem.append("defs");
-data.forEach((d, i) => {
-  const grad = defs.append("radialGradient")
-    .attr("id", "grad" + i)
-    .attr("cx", "50%").attr("cy", "50%").attr("r", "50%");
-  grad.append("stop").attr("offset", "0%").attr("stop-color", d.Color).attr("stop-opacity", 0.3);
-  grad.append("stop").attr("offset", "100%").attr("stop-color", d.Color).attr("stop-opacity", 1);
-});
-
-const simulation = d3.forceSimulation(data)
-  .alpha(1)
-  .alphaDecay(0.03)
-  .velocityDecay(0.3)
-  .force("charge", d3.forceManyBody().strength(-80))
-  .force("collision", d3.forceCollide().radius(d => scaleSize(d.Size) + 12).strength(1.2))
-  .force("x", d3.forceX(width / 2).strength(0.05))
-  .force("y", d3.forceY(height / 2).strength(0.05))
-  .on("tick", ticked);
-
-let selectedNode = null;
-let selectedNodeElem = null;
-let originalRadius = null;
-
-const node = zoomLayer.selectAll("g")
-  .data(data)
-  .enter().append("g")
-  .style("cursor", "pointer")
-  .on("click", function(event, d) {
-    if (selectedNode === d) {
-      hideInfo();
-      resetFocus();
-      return;
-    }
-
-    if (selectedNode) {
-      selectedNode.fx = null;
-      selectedNode.fy = null;
-      d3.select(selectedNodeElem).select("circle").transition().duration(300).attr("r", originalRadius);
-    }
-
-    selectedNode = d;
-    selectedNodeElem = this;
-    originalRadius = scaleSize(d.Size);
-
-    d.fx = d.x;
-    d.fy = d.y;
-    d3.select(this).select("circle").transition().duration(300).attr("r", originalRadius * 1.2);
-
-    focusBubble(d);
-
-    d3.select("#info-title").text(d.SubArea);
-    d3.select("#info-body").html(`<strong>Progress:</strong> ${d.Progress.toFixed(1)}%<br/><strong>Status:</strong> ${d.Status}`);
-    d3.select("#info-panel").style("display", "block");
-  });
-
-node.append("circle")
-  .attr("r", d => scaleSize(d.Size))
-  .attr("fill", (d, i) => `url(#grad${i})`)
-  .attr("stroke", "#fff")
-  .attr("stroke-width", 1.5);
-
-node.append("text")
-  .text(d => d.Abbrev)
-  .attr("text-anchor", "middle")
-  .attr("dy", "-0.3em")
-  .attr("font-size", d => Math.max(8, scaleSize(d.Size) / 2.5) + "px")
-  .attr("fill", "#111")
-  .style("pointer-events", "none");
-
-node.append("text")
-  .text(d => `${d.Progress.toFixed(1)}%`)
-  .attr("text-anchor", "middle")
-  .attr("dy", "1em")
-  .attr("font-size", d => Math.max(6, scaleSize(d.Size) / 3.5) + "px")
-  .attr("fill", "#111")
-  .style("pointer-events", "none");
-
-function ticked() {
-  node.each(d => {
-    d.x = Math.max(scaleSize(d.Size), Math.min(width - scaleSize(d.Size), d.x));
-    d.y = Math.max(scaleSize(d.Size), Math.min(height - scaleSize(d.Size), d.y));
-  });
-  node.attr("transform", d => `translate(${d.x},${d.y})`);
-}
-
-function focusBubble(target) {
-  node.each(function(d) {
-    d3.select(this).select("circle").transition().duration(300).style("opacity", d === target ? 1.0 : 0.1);
-  });
-  simulation.stop();
-}
-
-function resetFocus() {
-  node.each(function(d) {
-    d3.select(this).select("circle").transition().duration(300).style("opacity", 1.0);
-  });
-  simulation.alpha(0.3).restart();
-}
-
-function hideInfo() {
-  d3.select("#info-panel").style("display", "none");
-  if (selectedNode) {
-    selectedNode.fx = null;
-    selectedNode.fy = null;
-    d3.select(selectedNodeElem).select("circle").transition().duration(300).attr("r", originalRadius);
-    selectedNode = null;
-    selectedNodeElem = null;
-  }
-  resetFocus();
-}
-
-window.addEventListener("message", function(event) {
-  const abbrev = event.data;
-  const target = data.find(d => d.Abbrev === abbrev);
-  if (!target) return;
-
-  const i = data.indexOf(target);
-  const targetNode = node._groups[0][i];
-  target.fx = target.x;
-  target.fy = target.y;
-
-  if (selectedNode && selectedNode !== target) {
-    selectedNode.fx = null;
-    selectedNode.fy = null;
-    d3.select(selectedNodeElem).select("circle").transition().duration(300).attr("r", originalRadius);
-  }
-
-  selectedNode = target;
-  selectedNodeElem = targetNode;
-  originalRadius = scaleSize(target.Size);
-
-  d3.select(targetNode).select("circle").transition().duration(300).attr("r", originalRadius * 1.2);
-
-  focusBubble(target);
-
-  d3.select("#info-title").text(target.SubArea);
-  d3.select("#info-body").html(`<strong>Progress:</strong> ${target.Progress.toFixed(1)}%<br/><strong>Status:</strong> ${target.Status}`);
-  d3.select("#info-panel").style("display", "block");
-});
-</script>
-</body>
-</html>
-'''
-
-
-
-
-
-
-
-
-
-            # Tampilkan 1 kolom penuh karena HTML sudah gabung chart + tabel
             # Tampilkan 1 kolom penuh karena HTML sudah gabung chart + tabel
             st.markdown("## 📊 Zone Bubble Chart")
-            
+
             components.html(html_code, height=820)
             st.caption("🧲 Click table or bubble")
 
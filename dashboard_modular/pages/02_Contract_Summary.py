@@ -12,7 +12,16 @@ import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from shared import get_file
+from shared import get_file, file_version
+import gantt
+import deadlines
+
+
+@st.cache_data
+def load_payment_deadlines(_df_plot, data_version):
+    """Payment terms sorted by due date (End), partitioned by STATUS, once per data version"""
+    return deadlines.build_index(_df_plot['End'], _df_plot['STATUS'].str.upper())
+
 # --- Config & Auth ---
 st.set_page_config(page_title="📁 Contract Summary Dashboard", layout="wide")
 from auth import require_login
@@ -158,16 +167,34 @@ if contract_file:
     with section_card("Contract Timelines"):
         df_sorted = df.sort_values('START')
         df_plot = df_sorted.dropna(subset=['START', 'END'])  # Only valid ones plotted
-        fig_gantt = px.timeline(
-            df_plot,
-            x_start='START',
-            x_end='END',
-            y='KONTRAK',
-            color='STATUS',
-            hover_data=['DURATION', 'PROGRESS', 'TIME_GONE'],
-            title="Contract Gantt Timeline"
-        )
-        fig_gantt.update_yaxes(autorange="reversed")
+        if gantt.use_webgl(len(df_plot)):
+            hover = (
+                "<b>" + df_plot['KONTRAK'].astype(str) + "</b>"
+                + "<br>DURATION=" + df_plot['DURATION'].astype(str)
+                + "<br>PROGRESS=" + df_plot['PROGRESS'].astype(str)
+                + "<br>TIME_GONE=" + df_plot['TIME_GONE'].round(1).astype(str)
+            )
+            fig_gantt = gantt.segment_timeline(
+                df_plot,
+                x_start='START',
+                x_end='END',
+                y='KONTRAK',
+                color='STATUS',
+                hovertext=hover,
+                line_width=gantt.segment_width(450, df_plot['KONTRAK'].nunique())
+            )
+            fig_gantt.update_layout(title="Contract Gantt Timeline")
+        else:
+            fig_gantt = px.timeline(
+                df_plot,
+                x_start='START',
+                x_end='END',
+                y='KONTRAK',
+                color='STATUS',
+                hover_data=['DURATION', 'PROGRESS', 'TIME_GONE'],
+                title="Contract Gantt Timeline"
+            )
+            fig_gantt.update_yaxes(autorange="reversed")
         st.plotly_chart(fig_gantt, use_container_width=True)
 
 
@@ -573,15 +600,35 @@ if payment_term_file:
     })
 
     # --- Buat chart ---
-    fig = px.timeline(
-        df_plot,
-        x_start="Start",
-        x_end="End",
-        y="Project",
-        color="COLOR",
-        color_discrete_map="identity",
-        hover_data=["TERM_NO", "AMOUNT", "STATUS", "PCT_LABEL"]
-    )
+    # Banyak termin: pakai WebGL supaya hover & zoom tetap ringan
+    if gantt.use_webgl(len(df_plot)):
+        hover = (
+            "<b>" + df_plot['Project'].astype(str) + "</b>"
+            + "<br>TERM_NO=" + df_plot['TERM_NO'].astype(str)
+            + "<br>AMOUNT=" + df_plot['AMOUNT'].astype(str)
+            + "<br>STATUS=" + df_plot['STATUS'].astype(str)
+            + "<br>PCT_LABEL=" + df_plot['PCT_LABEL'].astype(str)
+        )
+        fig = gantt.segment_timeline(
+            df_plot.dropna(subset=['Start', 'End']),
+            x_start="Start",
+            x_end="End",
+            y="Project",
+            color="COLOR",
+            color_map="identity",
+            hovertext=hover,
+            line_width=gantt.segment_width(800, df_plot['Project'].nunique())
+        )
+    else:
+        fig = px.timeline(
+            df_plot,
+            x_start="Start",
+            x_end="End",
+            y="Project",
+            color="COLOR",
+            color_discrete_map="identity",
+            hover_data=["TERM_NO", "AMOUNT", "STATUS", "PCT_LABEL"]
+        )
 
     # --- Garis hari ini ---
     today = datetime.today()
@@ -677,8 +724,6 @@ if payment_term_file:
 
     # --- Tabel Warning Termin Jatuh Tempo Bulan Ini ---
     today = datetime.today()
-    current_month = today.month
-    current_year = today.year
     
     # --- Format data: rupiah & tanggal ---
     def format_rupiah(x):
@@ -687,14 +732,13 @@ if payment_term_file:
     def format_date(x):
         return x.strftime('%d %b %Y') if pd.notna(x) else '-'
     
+    # Termin per tanggal jatuh tempo (urut), sekali per versi file
+    payment_deadlines = load_payment_deadlines(df_plot, file_version(payment_term_file))
+
     # --- TABEL 1: Warning Termin Pending yang Jatuh Tempo Bulan Ini ---
     st.subheader("⚠️ Termin Pending yang Jatuh Tempo Bulan Ini")
     
-    warning_due = df_plot[
-        (df_plot['End'].dt.month == current_month) &
-        (df_plot['End'].dt.year == current_year) &
-        (df_plot['STATUS'].str.upper() == 'PENDING')
-    ].copy()
+    warning_due = df_plot.iloc[deadlines.due_in_month(payment_deadlines, today, 'PENDING')].copy()
     
     if not warning_due.empty:
         # Bersihin dan konversi AMOUNT
@@ -705,9 +749,9 @@ if payment_term_file:
         warning_due['End'] = warning_due['End'].apply(format_date)
         warning_due['AMOUNT'] = warning_due['AMOUNT'].apply(format_rupiah)
     
+        # Sudah urut tanggal jatuh tempo dari index
         st.dataframe(
-            warning_due[['VENDOR', 'TERM_NO', 'AMOUNT', 'End', 'STATUS']]
-            .sort_values(by='End'),
+            warning_due[['VENDOR', 'TERM_NO', 'AMOUNT', 'End', 'STATUS']],
             use_container_width=True
         )
     else:
@@ -718,10 +762,7 @@ if payment_term_file:
     # --- TABEL 2: Late Payment (Pending Tapi Sudah Lewat Jatuh Tempo) ---
     st.subheader("❌ Termin Pending yang Lewat Jatuh Tempo")
     
-    late_payment = df_plot[
-        (df_plot['End'] < today) &
-        (df_plot['STATUS'].str.upper() == 'PENDING')
-    ].copy()
+    late_payment = df_plot.iloc[deadlines.overdue(payment_deadlines, today, 'PENDING')].copy()
     
     if not late_payment.empty:
         # Bersihin dan konversi AMOUNT
@@ -732,9 +773,9 @@ if payment_term_file:
         late_payment['End'] = late_payment['End'].apply(format_date)
         late_payment['AMOUNT'] = late_payment['AMOUNT'].apply(format_rupiah)
     
+        # Sudah urut tanggal jatuh tempo dari index
         st.dataframe(
-            late_payment[['VENDOR', 'TERM_NO', 'AMOUNT', 'End', 'STATUS']]
-            .sort_values(by='End'),
+            late_payment[['VENDOR', 'TERM_NO', 'AMOUNT', 'End', 'STATUS']],
             use_container_width=True
         )
     else:
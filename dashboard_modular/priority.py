@@ -0,0 +1,83 @@
+"""
+This module scores active tasks for the Task Recommendations panel.
+
+Every factor (deadline, weight, status, incompleteness) is computed as a
+column operation over the whole task frame, and the top tasks are taken
+with a partial sort (np.argpartition) instead of sorting every task.
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Share of each factor in the final score
+PRIORITY_WEIGHTS = {
+    'deadline': 0.4,
+    'weight': 0.3,
+    'status': 0.2,
+    'incomplete': 0.1,
+}
+
+# Status factor (0-100); other statuses get DEFAULT_STATUS_FACTOR
+STATUS_FACTORS = {
+    'TUNDA': 80,
+    'DALAM PROSES': 60,
+    'BELUM MULAI': 40,
+    'SELESAI': 0,
+}
+DEFAULT_STATUS_FACTOR = 30
+
+MISSING_DEADLINE_DAYS = 100  # Days left assumed for tasks without PLAN END
+MAX_SCORE = 100
+
+
+def priority_scores(df, as_of=None, weights=PRIORITY_WEIGHTS):
+    """
+    Priority score (0-100) of every task.
+
+    Factors:
+        deadline: 100 / days left until PLAN END (at least 1 day), capped at 100
+        weight: BOBOT x 10
+        status: STATUS_FACTORS
+        incomplete: 100 - % COMPLETE
+
+    Missing BOBOT counts as 0 and missing % COMPLETE as 0% complete.
+
+    Args:
+        df: Task DataFrame with PLAN END, BOBOT, STATUS and % COMPLETE
+        as_of: Reference time (defaults to now)
+        weights: Share of each factor, keyed like PRIORITY_WEIGHTS
+
+    Returns:
+        Series of scores aligned with df
+    """
+    as_of = pd.Timestamp(datetime.today() if as_of is None else as_of)
+
+    deadline = pd.to_datetime(df['PLAN END'], errors='coerce')
+    days_left = (deadline - as_of).dt.days.to_numpy(dtype=float)
+    days_left = np.where(np.isnan(days_left), MISSING_DEADLINE_DAYS, np.maximum(1, days_left))
+
+    factors = {
+        'deadline': np.minimum(100, 100 / days_left),
+        'weight': pd.to_numeric(df['BOBOT'], errors='coerce').fillna(0).to_numpy(dtype=float) * 10,
+        'status': df['STATUS'].map(STATUS_FACTORS).fillna(DEFAULT_STATUS_FACTOR).to_numpy(dtype=float),
+        'incomplete': 100 - pd.to_numeric(df['% COMPLETE'], errors='coerce').fillna(0).to_numpy(dtype=float),
+    }
+    score = sum(factors[name] * share for name, share in weights.items())
+    return pd.Series(np.minimum(MAX_SCORE, score), index=df.index, name='PRIORITY_SCORE')
+
+
+def top_k(scores, k):
+    """
+    Index labels of the k highest scores, highest first.
+
+    Only the k best are sorted: np.argpartition selects them in linear time.
+    """
+    values = scores.to_numpy(dtype=float)
+    k = min(k, len(values))
+    if k <= 0:
+        return scores.index[:0]
+    best = np.argpartition(-values, k - 1)[:k]
+    best = best[np.lexsort((best, -values[best]))]
+    return scores.index[best]
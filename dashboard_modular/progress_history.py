@@ -0,0 +1,257 @@
+"""
+This module keeps an append-only history of task progress in a local SQLite file.
+
+Every new workbook version (identified by its content hash) is recorded
+once as a snapshot: the as-of date plus each task's % COMPLETE, STATUS,
+BOBOT and START. The S-curve reads recorded actual progress per snapshot
+date through the (kontrak_code, as_of) index instead of reconstructing it.
+
+The file lives at HISTORY_PATH (override with the PROGRESS_HISTORY_PATH
+environment variable).
+"""
+
+import os
+import sqlite3
+from contextlib import closing
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+# SQLite file of the history: PROGRESS_HISTORY_PATH if set, else a per-user
+# data directory (kept out of the package source tree)
+HISTORY_PATH = os.environ.get(
+    "PROGRESS_HISTORY_PATH",
+    os.path.join(os.path.expanduser("~"), ".dashboard_modular", "progress_history.sqlite"),
+)
+
+# Columns that identify a task across workbook versions (TASK_ID is positional)
+TASK_KEY_COLUMNS = ['KONTRAK_CODE', 'AREA PEKERJAAN', 'SUB AREA PEKERJAAN', 'JENIS PEKERJAAN']
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    data_version TEXT PRIMARY KEY,
+    as_of        TEXT NOT NULL,
+    captured_at  TEXT NOT NULL,
+    tasks        INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS task_progress (
+    data_version TEXT NOT NULL REFERENCES snapshots(data_version),
+    as_of        TEXT NOT NULL,
+    task_key     TEXT NOT NULL,
+    kontrak_code TEXT,
+    area         TEXT,
+    start        TEXT,
+    bobot        REAL,
+    pct_complete REAL,
+    status       TEXT,
+    PRIMARY KEY (data_version, task_key)
+);
+CREATE INDEX IF NOT EXISTS idx_task_progress_time
+    ON task_progress (kontrak_code, as_of);
+CREATE INDEX IF NOT EXISTS idx_snapshots_as_of
+    ON snapshots (as_of);
+"""
+
+
+def connect(path=HISTORY_PATH):
+    """Open the history database, creating its directory and schema if needed."""
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    except OSError:
+        pass  # sqlite3.connect() reports the unusable location
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def task_keys(df):
+    """
+    Stable per-task key: KONTRAK / AREA / SUB AREA / JENIS PEKERJAAN,
+    numbered when the same combination appears more than once.
+    """
+    parts = [
+        df[col].fillna("").astype(str).str.strip() if col in df.columns else pd.Series("", index=df.index)
+        for col in TASK_KEY_COLUMNS
+    ]
+    key = parts[0].str.cat(parts[1:], sep=" | ")
+    occurrence = key.groupby(key).cumcount()
+    return key + " #" + occurrence.astype(str)
+
+
+def record_snapshot(df, data_version, as_of=None, path=HISTORY_PATH):
+    """
+    Append one snapshot of task progress for a workbook version.
+
+    Versions already recorded are left untouched (the store is append-only),
+    so calling this again for the same version is a single INSERT OR IGNORE.
+
+    Args:
+        df: Task DataFrame as returned by load_data()
+        data_version: Content hash of the workbook
+        as_of: Snapshot date (defaults to today)
+        path: SQLite file
+
+    Returns:
+        True if a new snapshot was written
+    """
+    if data_version is None:
+        return False
+    as_of = (as_of or date.today()).isoformat()
+
+    with closing(connect(path)) as conn, conn:
+        # Claim the version first: a version already recorded costs one statement
+        cursor = conn.execute(
+            "INSERT OR IGNORE INTO snapshots (data_version, as_of, captured_at, tasks) VALUES (?, ?, ?, ?)",
+            (data_version, as_of, datetime.now().isoformat(timespec='seconds'), len(df))
+        )
+        if cursor.rowcount == 0:
+            return False
+
+        # load_data() already scaled % COMPLETE to 0-100; stored as is
+        complete = pd.to_numeric(df['% COMPLETE'], errors='coerce') if '% COMPLETE' in df.columns else pd.Series(np.nan, index=df.index)
+        complete = complete.fillna(0)
+        bobot = pd.to_numeric(df['BOBOT'], errors='coerce') if 'BOBOT' in df.columns else pd.Series(np.nan, index=df.index)
+        start = pd.to_datetime(df['START'], errors='coerce') if 'START' in df.columns else pd.Series(pd.NaT, index=df.index)
+
+        rows = pd.DataFrame({
+            'data_version': data_version,
+            'as_of': as_of,
+            'task_key': task_keys(df),
+            'kontrak_code': df['KONTRAK_CODE'] if 'KONTRAK_CODE' in df.columns else None,
+            'area': df['AREA PEKERJAAN'] if 'AREA PEKERJAAN' in df.columns else None,
+            'start': start.dt.strftime('%Y-%m-%d'),
+            'bobot': bobot,
+            'pct_complete': complete,
+            'status': df['STATUS'] if 'STATUS' in df.columns else None,
+        })
+        rows = rows.astype(object).where(rows.notna(), None)
+        conn.executemany(
+            "INSERT INTO task_progress VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows.itertuples(index=False, name=None)
+        )
+    return True
+
+
+def actual_history(kontrak_codes=None, path=HISTORY_PATH):
+    """
+    Recorded weighted actual progress per snapshot date.
+
+    Uses the same rule as the S-curve: tasks with a positive BOBOT that
+    have started by the snapshot date, weighted by BOBOT. When several
+    versions were recorded on one day, the latest one is used.
+
+    Args:
+        kontrak_codes: KONTRAK_CODE or list of codes (None = all projects)
+        path: SQLite file
+
+    Returns:
+        DataFrame with Date and Actual (0-100), sorted by Date
+    """
+    if not os.path.exists(path):
+        return pd.DataFrame({'Date': pd.to_datetime([]), 'Actual': []})
+
+    where, params = _kontrak_filter(kontrak_codes)
+    query = f"""
+        WITH latest AS (
+            SELECT as_of, MAX(captured_at) AS captured_at FROM snapshots GROUP BY as_of
+        )
+        SELECT t.as_of AS as_of,
+               SUM(t.bobot * COALESCE(t.pct_complete, 0)) AS weighted,
+               SUM(t.bobot) AS weight
+        FROM task_progress t
+        JOIN snapshots s ON s.data_version = t.data_version
+        JOIN latest l ON l.as_of = s.as_of AND l.captured_at = s.captured_at
+        WHERE t.bobot > 0 AND t.start IS NOT NULL AND t.start <= t.as_of {where}
+        GROUP BY t.as_of
+        ORDER BY t.as_of
+    """
+    with closing(connect(path)) as conn:
+        history = pd.read_sql_query(query, conn, params=params)
+
+    history['Actual'] = np.where(history['weight'] > 0, history['weighted'] / history['weight'], 0.0)
+    history['Date'] = pd.to_datetime(history['as_of'])
+    return history[['Date', 'Actual']]
+
+
+def area_history(kontrak_codes=None, path=HISTORY_PATH):
+    """
+    Recorded BOBOT-weighted progress sums per snapshot date and AREA PEKERJAAN.
+
+    Same task rule and snapshot choice as actual_history(); the weighted
+    progress of an area is Weighted / Weight.
+
+    Args:
+        kontrak_codes: KONTRAK_CODE or list of codes (None = all projects)
+        path: SQLite file
+
+    Returns:
+        DataFrame with Date, AREA, Weighted and Weight, sorted by Date
+    """
+    if not os.path.exists(path):
+        return pd.DataFrame({'Date': pd.to_datetime([]), 'AREA': [], 'Weighted': [], 'Weight': []})
+
+    where, params = _kontrak_filter(kontrak_codes)
+    query = f"""
+        WITH latest AS (
+            SELECT as_of, MAX(captured_at) AS captured_at FROM snapshots GROUP BY as_of
+        )
+        SELECT t.as_of AS as_of,
+               COALESCE(t.area, '-') AS area,
+               SUM(t.bobot * COALESCE(t.pct_complete, 0)) AS weighted,
+               SUM(t.bobot) AS weight
+        FROM task_progress t
+        JOIN snapshots s ON s.data_version = t.data_version
+        JOIN latest l ON l.as_of = s.as_of AND l.captured_at = s.captured_at
+        WHERE t.bobot > 0 AND t.start IS NOT NULL AND t.start <= t.as_of {where}
+        GROUP BY t.as_of, COALESCE(t.area, '-')
+        ORDER BY t.as_of
+    """
+    with closing(connect(path)) as conn:
+        history = pd.read_sql_query(query, conn, params=params)
+
+    return pd.DataFrame({
+        'Date': pd.to_datetime(history['as_of']),
+        'AREA': history['area'],
+        'Weighted': history['weighted'].astype(float),
+        'Weight': history['weight'].astype(float),
+    })
+
+
+def _kontrak_filter(kontrak_codes):
+    # SQL condition and parameters restricting task_progress (alias t) to some projects
+    if kontrak_codes is None:
+        return "", []
+    codes = [kontrak_codes] if isinstance(kontrak_codes, str) else list(kontrak_codes)
+    return f"AND t.kontrak_code IN ({', '.join('?' * len(codes))})", codes
+
+
+def apply_recorded_actuals(progress_df, history):
+    """
+    Replace the synthesized Actual curve with recorded snapshots.
+
+    From the first snapshot on, each period takes the latest snapshot on
+    or before it. Earlier periods keep the synthesized values. The curve
+    stays monotonic (cumulative max).
+
+    Args:
+        progress_df: S-curve DataFrame (Date, Type, Progress)
+        history: DataFrame returned by actual_history()
+
+    Returns:
+        New S-curve DataFrame
+    """
+    if history.empty or progress_df.empty:
+        return progress_df
+
+    progress_df = progress_df.copy()
+    actual = progress_df['Type'] == 'Actual'
+    dates = progress_df.loc[actual, 'Date'].to_numpy(dtype='datetime64[ns]')
+    snapshot_dates = history['Date'].to_numpy(dtype='datetime64[ns]')
+
+    position = np.searchsorted(snapshot_dates, dates, side='right') - 1
+    recorded = position >= 0
+    values = progress_df.loc[actual, 'Progress'].to_numpy(dtype=float, copy=True)
+    values[recorded] = history['Actual'].to_numpy()[position[recorded]]
+    progress_df.loc[actual, 'Progress'] = np.maximum.accumulate(values)
+    return progress_df
@@ -0,0 +1,125 @@
+"""
+This module builds the per-project aggregate table used by the
+Project Monitoring KPI cards, weighted progress bars and sidebar filters.
+
+The table is materialized once per data version so the page can answer
+card and filter queries without rescanning the task frame.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Status groups used by the KPI cards
+COMPLETED_STATUSES = ['SELESAI']
+ONGOING_STATUSES = ['DALAM PROSES']
+PENDING_STATUSES = ['TUNDA', 'BELUM MULAI']
+
+# Deadline buckets (days left until PLAN END, relative to the as-of date)
+UPCOMING_DAYS = 7
+
+COUNT_COLUMNS = [
+    'TASKS',
+    'COMPLETED',
+    'ONGOING',
+    'PENDING',
+    'OVERDUE',
+    'DUE_7D',
+    'DUE_LATER',
+    'NO_DEADLINE',
+]
+SUM_COLUMNS = COUNT_COLUMNS + ['BOBOT_SUM', 'WEIGHTED_SUM']
+
+
+def build_project_aggregates(df, filter_columns, as_of):
+    """
+    Build the aggregate table keyed by KONTRAK_CODE x filter column value.
+
+    Args:
+        df: Task DataFrame as returned by load_data()
+        filter_columns: Columns offered by the sidebar "Filter Column" selectbox
+        as_of: Date the deadline buckets are computed against
+
+    Returns:
+        DataFrame with one row per (FILTER_COLUMN, KONTRAK_CODE, FILTER_VALUE)
+        holding status counts, deadline buckets, BOBOT sums and weighted progress
+    """
+    as_of = pd.Timestamp(as_of).normalize()
+    status = df['STATUS'] if 'STATUS' in df.columns else pd.Series('', index=df.index)
+    bobot = pd.to_numeric(df['BOBOT'], errors='coerce').fillna(0) if 'BOBOT' in df.columns else 0.0
+    complete = pd.to_numeric(df['% COMPLETE'], errors='coerce').fillna(0) if '% COMPLETE' in df.columns else 0.0
+
+    # Per-task flags are computed once and shared by every filter column
+    days_left = (pd.to_datetime(df['PLAN END'], errors='coerce').dt.normalize() - as_of).dt.days
+    is_completed = status.isin(COMPLETED_STATUSES)
+
+    flags = pd.DataFrame({
+        'KONTRAK_CODE': df['KONTRAK_CODE'],
+        'TASKS': 1,
+        'COMPLETED': is_completed.astype(int),
+        'ONGOING': status.isin(ONGOING_STATUSES).astype(int),
+        'PENDING': status.isin(PENDING_STATUSES).astype(int),
+        'OVERDUE': ((days_left < 0) & ~is_completed).astype(int),
+        'DUE_7D': days_left.between(0, UPCOMING_DAYS).astype(int),
+        'DUE_LATER': (days_left > UPCOMING_DAYS).astype(int),
+        'NO_DEADLINE': days_left.isna().astype(int),
+        'BOBOT_SUM': bobot,
+        'WEIGHTED_SUM': bobot * complete,
+    }, index=df.index)
+
+    tables = []
+    for col in filter_columns:
+        if col not in df.columns:
+            continue
+        grouped = (
+            flags.assign(FILTER_VALUE=df[col])
+            .groupby(['KONTRAK_CODE', 'FILTER_VALUE'], dropna=False)[SUM_COLUMNS]
+            .sum()
+            .reset_index()
+        )
+        grouped.insert(0, 'FILTER_COLUMN', col)
+        tables.append(grouped)
+
+    if not tables:
+        return pd.DataFrame(columns=['FILTER_COLUMN', 'KONTRAK_CODE', 'FILTER_VALUE'] + SUM_COLUMNS + ['WEIGHTED_PROGRESS'])
+
+    table = pd.concat(tables, ignore_index=True)
+    table['WEIGHTED_PROGRESS'] = _weighted_progress(table['WEIGHTED_SUM'], table['BOBOT_SUM'])
+    return table
+
+
+def filter_values(table, filter_column):
+    """Sorted distinct values of a filter column, as offered in the sidebar."""
+    values = table.loc[table['FILTER_COLUMN'] == filter_column, 'FILTER_VALUE'].dropna().unique()
+    return sorted(values)
+
+
+def lookup_aggregates(table, filter_column, kontrak='All', value='All'):
+    """
+    Sum the aggregate rows matching a KONTRAK / filter selection.
+
+    Args:
+        table: Table returned by build_project_aggregates()
+        filter_column: Filter column the selection refers to
+        kontrak: KONTRAK_CODE or 'All'
+        value: Filter column value or 'All'
+
+    Returns:
+        Dictionary with the summed counts, BOBOT sums and weighted progress
+    """
+    mask = table['FILTER_COLUMN'] == filter_column
+    if kontrak != 'All':
+        mask &= table['KONTRAK_CODE'] == kontrak
+    if value != 'All':
+        mask &= table['FILTER_VALUE'] == value
+
+    totals = table.loc[mask, SUM_COLUMNS].sum()
+    result = {col: float(totals[col]) for col in SUM_COLUMNS}
+    for col in COUNT_COLUMNS:
+        result[col] = int(result[col])
+    result['WEIGHTED_PROGRESS'] = float(_weighted_progress(result['WEIGHTED_SUM'], result['BOBOT_SUM']))
+    return result
+
+
+def _weighted_progress(weighted_sum, bobot_sum):
+    # Avoid division by zero for groups without BOBOT
+    return np.where(bobot_sum != 0, weighted_sum / np.where(bobot_sum != 0, bobot_sum, 1), 0.0)
@@ -0,0 +1,243 @@
+"""
+This module runs a Monte Carlo schedule-risk simulation over the task table.
+
+The remaining duration of every unfinished task is sampled from a
+triangular distribution around its planned remaining duration. Dates are
+then propagated through PREDECESSORS in topological order: a successor
+starts no earlier than its planned START shifted by its predecessor's
+slip, so each link keeps its planned lag (which may be negative).
+Unfinished work never starts before today.
+
+Iterations are rows of (iteration x task) matrices, so every level of the
+dependency graph is a handful of NumPy operations for all iterations at
+once. Iterations are split into fixed-size chunks with their own random
+streams, run one after the other in the calling process: the simulation
+runs inside the (multi-threaded) Streamlit server, which is not safe to
+fork, and spawned workers would re-import the page script as __main__.
+"""
+
+from datetime import date
+from graphlib import CycleError, TopologicalSorter
+
+import numpy as np
+import pandas as pd
+
+ITERATIONS = 5000
+DURATION_RANGE = (0.9, 1.5)  # Remaining duration multiplier: (optimistic, pessimistic), most likely = 1
+PERCENTILES = [50, 80, 90]
+CHUNK_ITERATIONS = 500  # Iterations per chunk (one random stream each)
+BLOCK_SIZE = 5_000_000  # Max (iteration x task) cells held per block
+
+
+def task_network(timeline_df, today=None):
+    """
+    Task arrays and dependency levels used by simulate().
+
+    Tasks without START / PLAN END are left out, and so are links to them.
+    Days are counted from today. Tasks are ordered by KONTRAK_CODE so each
+    project is a contiguous block of columns. PREDECESSORS that form a
+    cycle cannot be scheduled: the link closing each cycle is dropped and
+    listed in 'cycle_links'.
+
+    Args:
+        timeline_df: Timeline DataFrame with TASK_ID, KONTRAK_CODE, START,
+            PLAN END, % COMPLETE and PREDECESSORS
+        today: As-of date (defaults to date.today())
+
+    Returns:
+        Dictionary of arrays (see simulate()), plus 'cycle_links': list of
+        (successor TASK_ID, predecessor TASK_ID) links dropped to break cycles
+    """
+    today = pd.Timestamp(date.today() if today is None else today).normalize()
+
+    start = pd.to_datetime(timeline_df['START'], errors='coerce')
+    end = pd.to_datetime(timeline_df['PLAN END'], errors='coerce')
+    dated = start.notna() & end.notna()
+    tasks = timeline_df[dated].assign(_START=start[dated], _END=end[dated])
+    tasks = tasks.sort_values('KONTRAK_CODE', kind='stable').reset_index(drop=True)
+
+    start_day = ((tasks['_START'].dt.normalize() - today).dt.days).to_numpy(dtype=float)
+    end_day = ((tasks['_END'].dt.normalize() - today).dt.days).to_numpy(dtype=float)
+    end_day = np.maximum(end_day, start_day)
+
+    complete = pd.to_numeric(tasks['% COMPLETE'], errors='coerce').fillna(0).to_numpy(dtype=float) \
+        if '% COMPLETE' in tasks.columns else np.zeros(len(tasks))
+    if len(complete) and complete.max() > 1.5:
+        complete = complete / 100
+    complete = np.clip(complete, 0, 1)
+    done = complete >= 1
+
+    # Unfinished work is laid out from max(START, today)
+    own_start = np.where(done, start_day, np.maximum(start_day, 0))
+    remaining = (end_day - start_day) * (1 - complete)
+
+    codes, projects = pd.factorize(tasks['KONTRAK_CODE'].fillna("-").astype(str), sort=True)
+    boundaries = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]]) if len(codes) else np.array([], dtype=int)
+
+    succ, pred = _links(tasks)
+    keep = _acyclic_links(len(tasks), succ, pred)
+    task_ids = tasks['TASK_ID'].astype(str).to_numpy() if len(succ) else np.array([], dtype=str)
+    cycle_links = list(zip(task_ids[succ[~keep]], task_ids[pred[~keep]]))
+    succ, pred = succ[keep], pred[keep]
+    levels = _levels(len(tasks), succ, pred, start_day[succ] - end_day[pred])
+
+    return {
+        'projects': list(projects),
+        'boundaries': boundaries,
+        'planned_end': np.maximum.reduceat(end_day, boundaries) if len(boundaries) else np.array([]),
+        'today': today,
+        'own_start': own_start,
+        'end': end_day,
+        'remaining': remaining,
+        'done': done,
+        'levels': levels,
+        'cycle_links': cycle_links,
+    }
+
+
+def simulate(network, iterations=ITERATIONS, duration_range=DURATION_RANGE, seed=0):
+    """
+    Simulated completion day of every project.
+
+    Args:
+        network: Result of task_network()
+        iterations: Number of Monte Carlo iterations
+        duration_range: (optimistic, pessimistic) remaining-duration multipliers
+        seed: Random seed (same seed = same result)
+
+    Returns:
+        (iteration x project) array of completion days, counted from today
+    """
+    n_tasks = len(network['end'])
+    if not n_tasks or not network['projects']:
+        return np.zeros((iterations, len(network['projects'])))
+
+    sizes = [min(CHUNK_ITERATIONS, iterations - lo) for lo in range(0, iterations, CHUNK_ITERATIONS)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    return np.vstack([
+        _simulate_chunk(network, size, duration_range, chunk_seed) for size, chunk_seed in zip(sizes, seeds)
+    ])
+
+
+def completion_summary(network, finish):
+    """
+    Completion-date percentiles per project.
+
+    Returns:
+        DataFrame with KONTRAK_CODE, PLANNED END, one P<n> column per
+        PERCENTILES entry and ON_TIME (probability of finishing by PLANNED END)
+    """
+    today = network['today']
+    table = pd.DataFrame({
+        'KONTRAK_CODE': network['projects'],
+        'PLANNED END': today + pd.to_timedelta(network['planned_end'], unit='D'),
+    })
+    if not len(finish):
+        return table
+    quantiles = np.ceil(np.percentile(finish, PERCENTILES, axis=0))
+    for p, values in zip(PERCENTILES, quantiles):
+        table[f'P{p}'] = today + pd.to_timedelta(values, unit='D')
+    table['ON_TIME'] = (finish <= network['planned_end']).mean(axis=0)
+    return table
+
+
+def completion_dates(network, finish):
+    """
+    Long table of simulated completion dates (one row per iteration and project).
+
+    Returns:
+        DataFrame with KONTRAK_CODE and FINISH
+    """
+    n_iterations, n_projects = finish.shape
+    return pd.DataFrame({
+        'KONTRAK_CODE': np.tile(network['projects'], n_iterations),
+        'FINISH': network['today'] + pd.to_timedelta(np.ceil(finish.ravel()), unit='D'),
+    })
+
+
+def _links(tasks):
+    # (successor, predecessor) position pairs from comma-separated PREDECESSORS
+    if 'PREDECESSORS' not in tasks.columns or 'TASK_ID' not in tasks.columns:
+        return np.array([], dtype=int), np.array([], dtype=int)
+    position = pd.Series(np.arange(len(tasks)), index=tasks['TASK_ID'].astype(str))
+    position = position[~position.index.duplicated()]
+
+    preds = tasks['PREDECESSORS'].fillna("").astype(str).str.split(',').explode().str.strip()
+    preds = preds[preds != ""]
+    pred = position.reindex(preds.to_numpy()).to_numpy()
+    known = ~np.isnan(pred)
+    return preds.index.to_numpy()[known].astype(int), pred[known].astype(int)
+
+
+def _acyclic_links(n_tasks, succ, pred):
+    # Mask of the links kept once the link closing each cycle is dropped
+    keep = np.ones(len(succ), dtype=bool)
+    while True:
+        sorter = TopologicalSorter({i: () for i in range(n_tasks)})
+        for s, p in zip(succ[keep], pred[keep]):
+            sorter.add(s, p)
+        try:
+            sorter.prepare()
+            return keep
+        except CycleError as error:
+            # Each node of the cycle is a predecessor of the next one
+            cycle = error.args[1]
+            keep &= ~((pred == cycle[-2]) & (succ == cycle[-1]))
+
+
+def _levels(n_tasks, succ, pred, lag):
+    # Topological levels: (task positions, link successor columns within the
+    # level, link predecessors, link lags, one link per successor?) per level
+    sorter = TopologicalSorter({i: () for i in range(n_tasks)})
+    for s, p in zip(succ, pred):
+        sorter.add(s, p)
+    sorter.prepare()
+
+    level_of = np.zeros(n_tasks, dtype=int)
+    batches = []
+    while sorter.is_active():
+        ready = np.array(sorted(sorter.get_ready()), dtype=int)
+        level_of[ready] = len(batches)
+        batches.append(ready)
+        sorter.done(*ready)
+
+    levels = []
+    link_level = level_of[succ]
+    for i, tasks in enumerate(batches):
+        in_level = link_level == i
+        column = np.searchsorted(tasks, succ[in_level])
+        levels.append((tasks, column, pred[in_level], lag[in_level], len(np.unique(column)) == len(column)))
+    return levels
+
+
+def _simulate_chunk(network, iterations, duration_range, seed):
+    low, high = duration_range
+    rng = np.random.default_rng(seed)
+    n_tasks = len(network['end'])
+    block = max(1, BLOCK_SIZE // n_tasks)
+    return np.vstack([
+        _simulate_block(network, min(block, iterations - lo), low, high, rng)
+        for lo in range(0, iterations, block)
+    ])
+
+
+def _simulate_block(network, iterations, low, high, rng):
+    own_start, end, done = network['own_start'], network['end'], network['done']
+    duration = network['remaining'] * (
+        rng.triangular(low, 1.0, high, size=(iterations, len(end))) if high > low else high
+    )
+    finish = np.empty((iterations, len(end)))
+
+    for tasks, column, pred, lag, single in network['levels']:
+        begin = np.repeat(own_start[None, tasks], iterations, axis=0)
+        if len(column):
+            # Predecessor finish + planned lag = planned START shifted by the slip
+            shifted = finish[:, pred] + lag
+            if single:
+                begin[:, column] = np.maximum(begin[:, column], shifted)
+            else:
+                np.maximum.at(begin, (slice(None), column), shifted)
+        finish[:, tasks] = np.where(done[tasks], end[tasks], begin + duration[:, tasks])
+
+    # Project completion: latest finish of its (contiguous) tasks
+    return np.maximum.reduceat(finish, network['boundaries'], axis=1)
@@ -0,0 +1,368 @@
+"""
+This module computes the planned / actual S-curve of the Project Monitoring page.
+
+All periods are evaluated at once: every task contributes a row of
+per-period values built with NumPy broadcasting, and the weighted
+contributions are summed over tasks in chunks so memory stays bounded
+on large schedules.
+
+Coarser granularities are sampled from the daily curve (daily_curve()
+then resample_curve()), so the engine runs once per data version.
+
+grouped_daily_sums() evaluates the tasks once for several grouping
+columns at the same time. It returns (period x group) matrices of
+weighted sums, which group_curve() combines into the curve of any
+project, area or set of groups without recomputing.
+"""
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+PERIOD_DAYS = 7  # Weekly S-curve
+BLOCK_SIZE = 2_000_000  # Max (period x task) cells evaluated per broadcasting block
+CURVE_TYPES = ['Planned', 'Actual']
+
+# Grouped curves: one matrix column per value of each of these columns
+GROUP_COLUMNS = ['KONTRAK_CODE', 'AREA PEKERJAAN']
+
+# Selector label -> days between periods, or 'MS' for the first of each month
+GRANULARITIES = {
+    'Daily': 1,
+    'Weekly': PERIOD_DAYS,
+    'Monthly': 'MS',
+}
+
+
+def scurve_periods(timeline_df, step_days=PERIOD_DAYS):
+    """
+    Period dates of the S-curve: every step_days from the earliest START
+    up to and including the latest PLAN END.
+
+    Returns:
+        numpy datetime64[D] array (empty if the timeline has no dates)
+    """
+    start = pd.to_datetime(timeline_df['START'], errors='coerce').min()
+    end = pd.to_datetime(timeline_df['PLAN END'], errors='coerce').max()
+    if pd.isna(start) or pd.isna(end):
+        return np.array([], dtype='datetime64[D]')
+    first = np.datetime64(start.date(), 'D')
+    last = np.datetime64(end.date(), 'D')
+    return np.arange(first, last + 1, step_days, dtype='datetime64[D]')
+
+
+def compute_scurve(timeline_df, today=None, step_days=PERIOD_DAYS):
+    """
+    Cumulative planned and actual progress (BOBOT-weighted) per period.
+
+    A task counts from the period its START falls on. Tasks without a
+    positive BOBOT are ignored. Planned progress grows linearly from
+    START to PLAN END. Actual progress grows linearly from START to
+    today, up to the task's % COMPLETE. Each curve is made monotonic
+    (cumulative max).
+
+    Args:
+        timeline_df: Timeline DataFrame with START, PLAN END, % COMPLETE and BOBOT
+        today: As-of date (defaults to date.today())
+        step_days: Days between periods
+
+    Returns:
+        DataFrame with Date, Type ('Planned' / 'Actual') and Progress (0-100),
+        sorted by Type then Date
+    """
+    today = date.today() if today is None else today
+    periods = scurve_periods(timeline_df, step_days)
+    planned_pct, actual_pct = _curve_values(timeline_df, periods, today)
+    return _long_format(periods, planned_pct, actual_pct)
+
+
+def daily_curve(timeline_df, today=None):
+    """
+    Planned and actual progress (0-100) for every day of the schedule,
+    before the cumulative max. Input of resample_curve().
+
+    Returns:
+        DataFrame indexed by Date with 'Planned' and 'Actual' columns
+    """
+    today = date.today() if today is None else today
+    periods = scurve_periods(timeline_df, 1)
+    planned_pct, actual_pct = _curve_values(timeline_df, periods, today)
+    return pd.DataFrame(
+        {'Planned': planned_pct, 'Actual': actual_pct},
+        index=pd.DatetimeIndex(pd.to_datetime(periods), name='Date')
+    )
+
+
+def resample_curve(daily, granularity='Weekly'):
+    """
+    Sample the daily curve at a GRANULARITIES step and apply the cumulative max.
+
+    Weekly gives the periods (and values) of compute_scurve(), plus the
+    last day of the schedule when the weeks do not land on it. Monthly
+    keeps the first day of the schedule, the first of every following
+    month and the last day.
+
+    Returns:
+        DataFrame shaped like compute_scurve()
+    """
+    sampled = daily[_sample_mask(daily.index, granularity)]
+    return _long_format(
+        sampled.index.to_numpy(dtype='datetime64[D]'),
+        sampled['Planned'].to_numpy(),
+        sampled['Actual'].to_numpy()
+    )
+
+
+def sample_periods(daily_periods, granularity='Weekly'):
+    """
+    Periods of a daily axis kept at a GRANULARITIES step (same sampling as resample_curve()).
+
+    Args:
+        daily_periods: datetime64[D] array of consecutive days
+        granularity: Key of GRANULARITIES
+
+    Returns:
+        datetime64[D] array of the kept periods
+    """
+    return daily_periods[_sample_mask(pd.DatetimeIndex(daily_periods), granularity)]
+
+
+def _sample_mask(days, granularity):
+    # Days kept at the granularity's step; the first and last day are always kept
+    step = GRANULARITIES[granularity]
+    keep = np.zeros(len(days), dtype=bool)
+    if step == 'MS':
+        keep[days.day == 1] = True
+    else:
+        keep[::step] = True
+    if len(keep):
+        keep[0] = keep[-1] = True
+    return keep
+
+
+def grouped_daily_sums(timeline_df, today=None, group_columns=GROUP_COLUMNS):
+    """
+    Daily weighted sums for every group of every grouping column, in one pass.
+
+    Args:
+        timeline_df: Timeline DataFrame with START, PLAN END, % COMPLETE and BOBOT
+        today: As-of date (defaults to date.today())
+        group_columns: Columns to group by (missing columns are skipped)
+
+    Returns:
+        Dictionary with:
+            'periods': datetime64[D] array of every day of the schedule
+            'groups': DataFrame with one row per matrix column (GROUP_COLUMN,
+                GROUP, FIRST start date, LAST end date, TASKS)
+            'weight', 'planned', 'actual': (period x group) arrays of active
+                BOBOT, planned x BOBOT and actual x BOBOT
+    """
+    today = date.today() if today is None else today
+    periods = scurve_periods(timeline_df, 1)
+
+    start = pd.to_datetime(timeline_df['START'], errors='coerce')
+    end = pd.to_datetime(timeline_df['PLAN END'], errors='coerce')
+    dated = (start.notna() & end.notna()).to_numpy()
+
+    tables = []
+    codes = []
+    for col in group_columns:
+        if col not in timeline_df.columns:
+            continue
+        values = timeline_df[col].fillna("-").astype(str)
+        column_codes, uniques = pd.factorize(values)
+        codes.append(column_codes)
+
+        # Date range of each group, as scurve_periods() would see it on its own
+        spans = pd.DataFrame({'GROUP': values, 'START': start, 'PLAN END': end})[dated].groupby('GROUP').agg(
+            FIRST=('START', 'min'), LAST=('PLAN END', 'max'), TASKS=('START', 'size')
+        )
+        table = pd.DataFrame({'GROUP_COLUMN': col, 'GROUP': uniques})
+        tables.append(table.join(spans, on='GROUP'))
+
+    groups = pd.concat(tables, ignore_index=True) if tables else pd.DataFrame(
+        columns=['GROUP_COLUMN', 'GROUP', 'FIRST', 'LAST', 'TASKS']
+    )
+    group_codes = np.column_stack(codes) if codes else np.zeros((len(timeline_df), 0), dtype=np.intp)
+    group_sizes = [len(table) for table in tables]
+    weight, planned, actual = _weighted_sums(timeline_df, periods, today, group_codes, group_sizes)
+
+    return {
+        'periods': periods,
+        'groups': groups,
+        'weight': weight,
+        'planned': planned,
+        'actual': actual,
+    }
+
+
+def group_curve(grouped, group_column, groups=None):
+    """
+    Daily curve of one or more groups, sliced from grouped_daily_sums().
+
+    The curve covers the selected groups' own date range, so it equals
+    daily_curve() run on just their tasks.
+
+    Args:
+        grouped: Result of grouped_daily_sums()
+        group_column: Grouping column the groups belong to
+        groups: Group value or list of values (None = all groups of the column)
+
+    Returns:
+        DataFrame shaped like daily_curve() (empty if nothing matches)
+    """
+    table = grouped['groups']
+    selected = (table['GROUP_COLUMN'] == group_column).to_numpy().copy()
+    if groups is not None:
+        groups = [groups] if isinstance(groups, str) else list(groups)
+        selected &= table['GROUP'].isin(groups).to_numpy()
+    selected &= table['FIRST'].notna().to_numpy()
+
+    columns = np.flatnonzero(selected)
+    if not len(columns):
+        return pd.DataFrame({'Planned': [], 'Actual': []}, index=pd.DatetimeIndex([], name='Date'))
+
+    first = np.datetime64(table.loc[selected, 'FIRST'].min().date(), 'D')
+    last = np.datetime64(table.loc[selected, 'LAST'].max().date(), 'D')
+    periods = grouped['periods']
+    rows = (periods >= first) & (periods <= last)
+
+    weight = grouped['weight'][rows][:, columns].sum(axis=1)
+    planned = grouped['planned'][rows][:, columns].sum(axis=1)
+    actual = grouped['actual'][rows][:, columns].sum(axis=1)
+    planned_pct, actual_pct = _percentages(weight, planned, actual)
+    return pd.DataFrame(
+        {'Planned': planned_pct, 'Actual': actual_pct},
+        index=pd.DatetimeIndex(pd.to_datetime(periods[rows]), name='Date')
+    )
+
+
+def _curve_values(timeline_df, periods, today):
+    # Weighted planned / actual percentages per period (0 when nothing has started)
+    return _percentages(*_weighted_sums(timeline_df, periods, today))
+
+
+def _percentages(weight, planned, actual):
+    has_weight = weight > 0
+    safe_weight = np.where(has_weight, weight, 1)
+    planned_pct = np.where(has_weight, planned / safe_weight * 100, 0.0)
+    actual_pct = np.where(has_weight, actual / safe_weight * 100, 0.0)
+    return planned_pct, actual_pct
+
+
+def _long_format(periods, planned_pct, actual_pct):
+    n = len(periods)
+    progress_df = pd.DataFrame({
+        'Date': np.repeat(pd.to_datetime(periods), 2),
+        'Type': np.tile(CURVE_TYPES, n),
+        'Progress': np.column_stack([planned_pct, actual_pct]).ravel(),
+    })
+    progress_df = progress_df.sort_values(by=["Type", "Date"])
+
+    # Ensure cumulative max
+    progress_df['Progress'] = progress_df.groupby('Type')['Progress'].cummax()
+    return progress_df
+
+
+def _task_arrays(timeline_df):
+    # Day numbers, weights and completion (0-1) of every task that can contribute
+    start = pd.to_datetime(timeline_df['START'], errors='coerce')
+    end = pd.to_datetime(timeline_df['PLAN END'], errors='coerce')
+
+    if 'BOBOT' in timeline_df.columns:
+        weight = pd.to_numeric(timeline_df['BOBOT'], errors='coerce').to_numpy(dtype=float)
+    else:
+        weight = np.zeros(len(timeline_df))
+
+    if '% COMPLETE' in timeline_df.columns:
+        complete = pd.to_numeric(timeline_df['% COMPLETE'], errors='coerce').fillna(0).to_numpy(dtype=float)
+        # Normalize % COMPLETE to 0–1 scale if needed
+        if len(complete) and complete.max() > 1.5:
+            complete = complete / 100
+    else:
+        complete = np.zeros(len(timeline_df))
+
+    valid = start.notna().to_numpy() & end.notna().to_numpy() & (weight > 0)
+    start, end = start[valid], end[valid]
+
+    start_day = start.dt.normalize().to_numpy(dtype='datetime64[D]')
+    end_day = end.dt.normalize().to_numpy(dtype='datetime64[D]')
+    # Whole days between the timestamps, like timedelta.days
+    plan_days = (end - start).dt.days.to_numpy()
+    return start_day, end_day, plan_days, weight[valid], complete[valid], valid
+
+
+def _weighted_sums(timeline_df, periods, today, group_codes=None, group_sizes=()):
+    """
+    Sum active weight, planned x weight and actual x weight per period.
+
+    Tasks are processed as (period x task) blocks of at most BLOCK_SIZE cells.
+    With group_codes (timeline rows x grouping columns of factorized codes,
+    group_sizes groups per column), the sums are (period x group) matrices
+    instead of totals over all tasks. The tasks are sorted by their codes
+    once, so each block is summed per run of tasks with the same codes
+    (np.add.reduceat over contiguous columns), and only those few run sums
+    are then added to the groups of every grouping column.
+    """
+    start_day, end_day, plan_days, weight, complete, valid = _task_arrays(timeline_df)
+    if group_codes is not None:
+        group_codes = group_codes[valid]
+        order = np.lexsort(group_codes.T[::-1]) if group_codes.shape[1] else np.arange(len(weight))
+        start_day, end_day, plan_days = start_day[order], end_day[order], plan_days[order]
+        weight, complete, group_codes = weight[order], complete[order], group_codes[order]
+        offsets = np.concatenate([[0], np.cumsum(group_sizes, dtype=int)])
+        shape = (len(periods), int(offsets[-1]))
+    else:
+        shape = len(periods)
+
+    weight_sum = np.zeros(shape)
+    planned_sum = np.zeros(shape)
+    actual_sum = np.zeros(shape)
+
+    today = np.datetime64(pd.Timestamp(today).date(), 'D')
+    p = periods[:, None]
+    after_today = (periods >= today)[:, None]
+
+    chunk = max(1, BLOCK_SIZE // max(1, len(periods)))
+    for lo in range(0, len(weight), chunk):
+        hi = lo + chunk
+        s, e = start_day[None, lo:hi], end_day[None, lo:hi]
+        w, c = weight[lo:hi], complete[None, lo:hi]
+
+        started = s <= p
+        days_passed = (p - s).astype(np.int64)
+
+        # Planned (0–1): done after PLAN END, linear between START and PLAN END
+        total = plan_days[None, lo:hi]
+        planned = np.where(
+            p >= e, 1.0,
+            np.where(total > 0, days_passed / np.where(total > 0, total, 1), 1.0)
+        )
+
+        # Actual (0–1): % COMPLETE from today on, linear ramp up to it before
+        since_start = (today - s).astype(np.int64)
+        ramp = np.where(since_start > 0, days_passed / np.where(since_start > 0, since_start, 1) * c, 0.0)
+        actual = np.where(after_today, c, np.minimum(c, ramp))
+
+        active = np.where(started, w, 0.0)
+        if group_codes is None:
+            weight_sum += active.sum(axis=1)
+            planned_sum += (active * planned).sum(axis=1)
+            actual_sum += (active * actual).sum(axis=1)
+        else:
+            # Runs of consecutive tasks with the same codes in every grouping column
+            codes = group_codes[lo:hi]
+            runs = np.flatnonzero(np.r_[True, (codes[1:] != codes[:-1]).any(axis=1)])
+            folds = []
+            for col in range(codes.shape[1]):
+                run_order = np.argsort(codes[runs, col], kind='stable')
+                present, starts = np.unique(codes[runs[run_order], col], return_index=True)
+                folds.append((run_order, starts, offsets[col] + present))
+
+            for total_sum, values in [(weight_sum, active), (planned_sum, active * planned), (actual_sum, active * actual)]:
+                run_sums = np.add.reduceat(values, runs, axis=1)
+                for run_order, starts, columns in folds:
+                    total_sum[:, columns] += np.add.reduceat(run_sums[:, run_order], starts, axis=1)
+
+    return weight_sum, planned_sum, actual_sum
@@ -0,0 +1,126 @@
+"""
+This module keeps an inverted text index over the task table for the
+task search box.
+
+Task text is split into lowercase word tokens. Each distinct token maps
+to the sorted row positions it appears in (its posting list), and the
+tokens are kept sorted, so the tokens starting with a prefix form one
+contiguous range found with bisect. A query matches the tasks containing,
+for every query word, some token starting with that word; the last word
+can be typed partially (typeahead).
+
+The index is built once per data version; a search only touches the
+postings of the matching token ranges.
+"""
+
+import re
+from bisect import bisect_left
+
+import numpy as np
+import pandas as pd
+
+SEARCH_COLUMNS = ['JENIS PEKERJAAN', 'AREA PEKERJAAN', 'SUB AREA PEKERJAAN']
+TOKEN_PATTERN = re.compile(r"\w+")
+SUGGESTIONS = 8
+
+
+def tokenize(text):
+    """Lowercase word tokens of a string."""
+    return TOKEN_PATTERN.findall(str(text).lower())
+
+
+def build_index(df, columns=SEARCH_COLUMNS, id_column='TASK_ID'):
+    """
+    Inverted index of the task table.
+
+    Distinct values of each column are tokenized once, so the cost depends
+    on the number of distinct texts rather than the number of tasks.
+
+    Args:
+        df: Task DataFrame
+        columns: Text columns to index (missing columns are skipped)
+        id_column: Column holding the task ids returned by search()
+
+    Returns:
+        Dictionary with:
+            'terms': sorted list of distinct tokens
+            'postings': list of sorted row-position arrays, one per term
+            'ids': task id of every row position
+    """
+    rows = []
+    tokens = []
+    for col in columns:
+        if col not in df.columns:
+            continue
+        codes, uniques = pd.factorize(df[col], use_na_sentinel=True)
+        for code, value in enumerate(uniques):
+            value_tokens = set(tokenize(value))
+            if not value_tokens:
+                continue
+            positions = np.flatnonzero(codes == code)
+            for token in value_tokens:
+                rows.append(positions)
+                tokens.append(np.full(len(positions), token, dtype=object))
+
+    if rows:
+        pairs = pd.DataFrame({'term': np.concatenate(tokens), 'row': np.concatenate(rows)})
+        pairs = pairs.drop_duplicates().sort_values(['term', 'row'], kind='stable')
+        term = pairs['term'].to_numpy()
+        starts = np.flatnonzero(np.r_[True, term[1:] != term[:-1]])
+        terms = term[starts].tolist()
+        postings = np.split(pairs['row'].to_numpy(), starts[1:])
+    else:
+        terms, postings = [], []
+
+    ids = df[id_column].to_numpy() if id_column in df.columns else df.index.to_numpy()
+    return {'terms': terms, 'postings': postings, 'ids': ids}
+
+
+def prefix_range(index, prefix):
+    """Positions [lo, hi) in index['terms'] of the tokens starting with prefix."""
+    terms = index['terms']
+    lo = bisect_left(terms, prefix)
+    hi = bisect_left(terms, prefix + "\U0010ffff", lo)
+    return lo, hi
+
+
+def search_rows(index, query):
+    """
+    Row positions matching every word of the query (as a token prefix).
+
+    Returns:
+        Sorted numpy array of row positions (all rows for an empty query)
+    """
+    words = tokenize(query)
+    if not words:
+        return np.arange(len(index['ids']))
+
+    n_rows = len(index['ids'])
+    matches = np.ones(n_rows, dtype=bool)
+    for word in set(words):
+        lo, hi = prefix_range(index, word)
+        if lo == hi:
+            return np.array([], dtype=int)
+        # Rows having some token in the range (boolean marks avoid sorting)
+        found = np.zeros(n_rows, dtype=bool)
+        found[np.concatenate(index['postings'][lo:hi])] = True
+        matches &= found
+    return np.flatnonzero(matches)
+
+
+def search(index, query):
+    """Task ids matching the query, in table order."""
+    return index['ids'][search_rows(index, query)]
+
+
+def suggest(index, prefix, limit=SUGGESTIONS):
+    """
+    Typeahead: the most frequent tokens starting with the last word of prefix.
+    """
+    words = tokenize(prefix)
+    if not words:
+        return []
+    lo, hi = prefix_range(index, words[-1])
+    counts = np.array([len(p) for p in index['postings'][lo:hi]], dtype=int)
+    best = np.argsort(-counts, kind='stable')[:limit]
+    return [index['terms'][lo + i] for i in best]
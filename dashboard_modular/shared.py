@@ -1,4 +1,5 @@
 import streamlit as st
+import plotly.graph_objects as go
 import requests
 import base64
 import hashlib
@@ -33,6 +34,70 @@ def fetch_github_file(repo_path, branch="main"):
     return content, file_hash, sha
 
 
+# ================================
+# Data version of a loaded file
+# ================================
+def file_version(bio):
+    """
+    Content hash of a BytesIO returned by get_file().
+    Used as the cache key for everything derived from that file.
+    """
+    if bio is None:
+        return None
+    return hashlib.md5(bio.getvalue()).hexdigest()
+
+
+# ================================
+# Figure cache
+# ================================
+@st.cache_data(show_spinner=False, max_entries=64)
+def _figure_dict(chart_id, key, _build):
+    return _build().to_dict()
+
+
+def cached_figure(chart_id, key, build):
+    """
+    Return the Plotly figure for chart_id, building it only when key changes.
+
+    key must capture every input of the chart (data version, filter state,
+    as-of date, ...). build is a zero-argument callable returning the figure;
+    on a cache hit it is not called and the stored figure dict is wrapped
+    back into a Figure without re-validation.
+    """
+    return go.Figure(_figure_dict(chart_id, key, build), _validate=False)
+
+
+# ================================
+# Read-only GitHub file (no upload widgets)
+# ================================
+GITHUB_READ_TTL = 600  # Seconds a fetched file is reused before asking GitHub again
+
+
+@st.cache_data(show_spinner=False, ttl=GITHUB_READ_TTL)
+def _github_content(repo_path, branch):
+    content, file_hash, _ = fetch_github_file(repo_path, branch)
+    return content, file_hash
+
+
+def read_github_file(repo_path, branch="main"):
+    """
+    Fresh BytesIO of a GitHub file and its content hash, for pages that
+    only read the file (no sidebar uploader).
+
+    The download is cached for GITHUB_READ_TTL seconds (and cleared with
+    the other caches when get_file() uploads a replacement), so reruns do
+    not call the GitHub API. The hash is the same as file_version() of
+    the returned BytesIO.
+
+    Returns:
+        (BytesIO, hash), or (None, None) when the file cannot be fetched
+    """
+    content, file_hash = _github_content(repo_path, branch)
+    if content is None:
+        return None, None
+    return BytesIO(content), file_hash
+
+
 # ================================
 # Upload to GitHub (PUT)
 # ================================
@@ -0,0 +1,136 @@
+"""
+This module computes zone progress over time for the animated site map.
+
+Progress is summed per AREA PEKERJAAN and period first: from the planned
+dates (see scurve.grouped_daily_sums()) or from the recorded snapshots
+(see progress_history.area_history()). Areas are then folded into the
+site-layout zones with one (area x zone) membership matrix product, so the
+whole (period x zone) matrix comes out of a single vectorized pass.
+
+A zone follows the same area as on the static site map
+(map_zones.generate_colored_map()): the first area, in name order, whose
+name matches it (see map_zones.zone_slots()). Zones without a matching
+area or without weight show 0.
+"""
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+import map_zones
+import scurve
+
+AREA_COLUMN = 'AREA PEKERJAAN'
+
+
+def zone_membership(areas, layout_path=map_zones.SITE_LAYOUT_PATH):
+    """
+    (area x zone) matrix with 1 where a zone takes its progress from an area.
+
+    Like generate_colored_map() over a weighted_rollup() result, each zone
+    takes the first area, in name order, whose name matches it.
+
+    Args:
+        areas: Sequence of area names
+        layout_path: Site layout file
+
+    Returns:
+        Float array of shape (len(areas), number of layout zones)
+    """
+    n_zones = len(map_zones.load_site_layout(layout_path)['zones'])
+    membership = np.zeros((len(areas), n_zones))
+    taken = set()
+    for i in sorted(range(len(areas)), key=lambda i: areas[i]):
+        slots = [slot for slot in map_zones.zone_slots(areas[i], layout_path) if slot not in taken]
+        membership[i, slots] = 1.0
+        taken.update(slots)
+    return membership
+
+
+def schedule_progress(grouped, granularity='Weekly', curve='Actual', layout_path=map_zones.SITE_LAYOUT_PATH,
+                      today=None, current=None):
+    """
+    Zone progress per S-curve period, from the grouped S-curve sums.
+
+    When today is past the schedule's last day it is appended as a final
+    period, as in evm.earned_value(). The planned curve holds its last
+    value there; the actual curve only ramps up to % COMPLETE by today, so
+    its today frame is taken from current when given (the area progress
+    shown on the static site map), else it holds its last value too.
+
+    Args:
+        grouped: Result of scurve.grouped_daily_sums() with AREA PEKERJAAN
+            among its group columns
+        granularity: Key of scurve.GRANULARITIES
+        curve: 'Planned' or 'Actual'
+        layout_path: Site layout file
+        today: As-of date (defaults to date.today())
+        current: Optional Series of current progress (0-100) per area, e.g.
+            map_zones.weighted_rollup(df, AREA_COLUMN)
+
+    Returns:
+        Dictionary with 'periods' (datetime64[D] array), 'zones' (zone
+        names) and 'progress' ((period x zone) array, 0-100)
+    """
+    groups = grouped['groups']
+    areas = groups[groups['GROUP_COLUMN'] == AREA_COLUMN]
+    columns = areas.index.to_numpy()
+
+    periods = scurve.sample_periods(grouped['periods'], granularity)
+    rows = np.searchsorted(grouped['periods'], periods)
+    membership = zone_membership(areas['GROUP'].tolist(), layout_path)
+
+    # S-curve sums are fractions (0-1) x BOBOT
+    weighted = grouped[curve.lower()][rows][:, columns] @ membership * 100
+    weight = grouped['weight'][rows][:, columns] @ membership
+
+    today = np.datetime64(pd.Timestamp(date.today() if today is None else today).date(), 'D')
+    if len(periods) and today > periods[-1]:
+        periods = np.append(periods, today)
+        if curve == 'Actual' and current is not None:
+            # Every zone follows at most one area: weight 1 where it has one
+            now = zone_membership(current.index.tolist(), layout_path)
+            weighted = np.vstack([weighted, np.nan_to_num(current.to_numpy(dtype=float)) @ now])
+            weight = np.vstack([weight, now.sum(axis=0)])
+        else:
+            weighted = np.vstack([weighted, weighted[-1]])
+            weight = np.vstack([weight, weight[-1]])
+    return _zone_timeline(periods, weighted, weight, layout_path)
+
+
+def history_progress(history, layout_path=map_zones.SITE_LAYOUT_PATH):
+    """
+    Zone progress per recorded snapshot date.
+
+    Args:
+        history: Result of progress_history.area_history()
+        layout_path: Site layout file
+
+    Returns:
+        Dictionary shaped like schedule_progress() (one period per snapshot date)
+    """
+    dates, date_codes = np.unique(history['Date'].to_numpy(dtype='datetime64[D]'), return_inverse=True)
+    area_codes, areas = pd.factorize(history['AREA'])
+
+    # (date x area) sums, then folded into zones
+    weighted = np.zeros((len(dates), len(areas)))
+    weight = np.zeros((len(dates), len(areas)))
+    np.add.at(weighted, (date_codes, area_codes), history['Weighted'].to_numpy(dtype=float))
+    np.add.at(weight, (date_codes, area_codes), history['Weight'].to_numpy(dtype=float))
+
+    membership = zone_membership(list(areas), layout_path)
+    return _zone_timeline(dates, weighted @ membership, weight @ membership, layout_path)
+
+
+def _zone_timeline(periods, weighted, weight, layout_path):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        progress = np.where(weight > 0, weighted / weight, 0.0)
+    # Monotonic over time, like the S-curve
+    if len(periods):
+        progress = np.maximum.accumulate(progress, axis=0)
+    return {
+        'periods': periods,
+        'zones': map_zones.zone_names(layout_path),
+        'progress': progress,
+    }